@@ -0,0 +1,122 @@
+"""
+Classes and objects exported:
+1. AssetCache: Size-bounded LRU registry that builds each asset once and hands out the shared result.
+2. images: Module-level AssetCache of converted, colorkeyed game images.
+3. load_image: Loader used by the images cache to decode a file from the images directory.
+4. fonts: Module-level AssetCache of resolved system fonts.
+5. load_font: Loader used by the fonts cache to resolve a system font.
+6. masks: Module-level AssetCache of pixel masks, keyed by the image surface they were built from.
+"""
+
+import os
+from collections import OrderedDict
+from variables import *
+
+IMAGE_DIR = 'images'
+
+
+def load_image(name):
+    """
+    Decode an image from the images directory, convert it to the display format and set its colorkey.
+
+    Paths are joined with os.path so the same asset names work on every platform. Images loaded before the
+    display is opened (e.g. by tests) cannot be converted and are kept in their file format.
+
+    :param str name: File name of the image, relative to the images directory
+    :return: A new pygame.Surface with BLACK set as the transparent colorkey
+    """
+    image = pygame.image.load(os.path.join(IMAGE_DIR, name))
+    if pygame.display.get_surface() is not None:
+        image = image.convert()
+    image.set_colorkey(BLACK)
+    return image
+
+
+def load_font(key):
+    """
+    Resolve a system font by name and style and load it at a size.
+
+    Resolving a system font searches the fonts installed on the machine, so fonts are requested through the
+    fonts cache and resolved once per name, size and style.
+
+    :param tuple key: (name, size, bold, italic), as passed to pygame.font.SysFont
+    :return: A new pygame.font.Font. pygame's default font is used if the name is not installed
+    """
+    name, size, bold, italic = key
+    if not pygame.font.get_init():
+        pygame.font.init()
+    return pygame.font.SysFont(name, size, bold, italic)
+
+
+class AssetCache(object):
+    """
+    Least-recently-used cache of built assets, keyed by name.
+
+    An asset is built by the loader the first time it is requested and the same object is returned for
+    every later request, so callers must treat cached surfaces as read-only and copy them before drawing
+    on them. When more than max_size assets are held, the least recently requested one is dropped and
+    will be rebuilt on its next request. Hit and miss counters are kept to verify that nothing is
+    being decoded on the frame path.
+
+    Methods defined:
+    """
+
+    def __init__(self, loader=load_image, max_size=32):
+        """
+        :param loader: Callable that builds an asset from its key on a cache miss
+        :param int max_size: Maximum number of assets held before the least recently used is evicted
+        """
+        self.loader = loader
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, loader=None):
+        """
+        Return the cached asset for key, building it with the loader on a miss.
+
+        :param key: Hashable asset key. For the images cache this is the image file name
+        :param loader: Optional callable used instead of the cache's default loader for this miss
+        :return: The shared asset object
+        """
+        try:
+            asset = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            asset = (loader or self.loader)(key)
+            self.entries[key] = asset
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            return asset
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return asset
+
+    def preload(self, *keys):
+        """Build every given key ahead of time, e.g. before the main loop starts."""
+        for key in keys:
+            self.get(key)
+
+    def clear(self):
+        """Drop every cached asset. Counters are kept."""
+        self.entries.clear()
+
+    def stats(self):
+        """
+        :return: dict with the number of live entries, hits, misses and evictions
+        """
+        return {'size': len(self.entries), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+
+images = AssetCache()
+fonts = AssetCache(load_font, max_size=8)
+masks = AssetCache(pygame.mask.from_surface, max_size=64)  # colorkeyed pixels are left out of the mask
@@ -3,92 +3,99 @@ Classes and objects exported:
 1. Background: Class that generates and updates the parallax starfield.
 """
 
-import random
+import numpy
+import rng
 from variables import *
 
-star_spawn_rate = [0, 0, 0, 0, 0, 0, 1]
+star_density = 1 / 7  # average number of stars per row of screen pixels
 star_speeds = [1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 3]
 
 
-class Star(pygame.sprite.Sprite):
-    """
-    Simple pygame.Sprite class that generates single pixel stars
-
-    Instances of this class are used by the Background class as individual stars. The stars are
-    randomly given a vertical speed in pixels/frame. Star uses the rect.center attribute to track
-    its location. As such, all star speeds must be integer values.
-    """
-
-    def __init__(self, y_pos=None):
-        """
-        :param y_pos: This should only be passed in on initial starfield population. It sets the
-        vertical value of where the star will be draw initially. All new stars after startup should
-        spawn at the top pixel.
-        """
-        super().__init__()
-        self.image = pygame.Surface([1, 1])
-        self.image.fill(WHITE)
-        self.rect = self.image.get_rect()
-        if not y_pos:
-            self.rect.center = (random.randint(0, size[0] - 1), 0)
-        else:
-            self.rect.center = (random.randint(0, size[0] - 1), y_pos)
-        self.y_speed = random.choice(star_speeds)
-
-
 class Background(object):
     """
     Class for creating and displaying a parallax starfield
 
-    This class spawns instances of the Star class to populate a blank background with single pixel stars
-    moving at various rates for a parallax effect. Each new frame of the game shifts the stars down and
-    there is a 1/7 chance that a new star will spawn. That rate is applied to all vertical pixels on
-    initialization to populate the background at the same density and distribution as when the game
-    is running.
+    The starfield is a fixed number of single pixel stars moving down the screen at various rates for a
+    parallax effect. Stars are not individual objects: their horizontal positions, vertical positions and
+    speeds are held in three contiguous numpy arrays. Each frame moves every star with one array operation,
+    and the stars that fell off the bottom of the screen are found with a mask and respawned at the top pixel
+    with a new horizontal position and speed. Stars are then written to the screen pixels in bulk.
+
+    The number of stars is the screen height times the density, so the default density keeps the same
+    number of stars on screen as a 1/7 chance of a new star per frame. Speeds are drawn from the given list,
+    so passing more (or fractional) speeds gives a denser or multi-layer starfield at the same cost per star.
 
     Methods defined:
     """
 
-    def __init__(self):
+    def __init__(self, density=star_density, speeds=star_speeds, color=WHITE):
         """
         Set the surface image at the size of the screen and run the populate method
+
+        :param float density: Average number of stars per row of screen pixels
+        :param speeds: Sequence of vertical star speeds, in pixels/frame, that new stars are chosen from
+        :param color: RGB tuple of the star color
         """
         self.image = pygame.Surface((size[0], size[1]))
         self.image.fill(BLACK)
-        self.stars = pygame.sprite.Group()
+        self.color = color
+        self.speeds = numpy.array(speeds, dtype=float)
+        self.generator = numpy.random.default_rng(rng.starfield.getrandbits(64))
+        count = max(int(round(size[1] * density)), 1)
+        self.x = numpy.zeros(count, dtype=numpy.intp)
+        self.y = numpy.zeros(count, dtype=float)
+        self.y_speed = numpy.zeros(count, dtype=float)
+        self.pixel_y = numpy.zeros(count, dtype=numpy.intp)  # integer pixel rows, reused every frame
         self.populate()
 
-    def spawn_star(self, y_pos=None):
-        """Create a new star and add it to the stars sprite group"""
-        new_star = Star(y_pos)
-        self.stars.add(new_star)
+    def __len__(self):
+        return len(self.x)
 
     def populate(self):
         """
         Fill the new, blank screen with a uniform distribution of stars.
 
-        This method, meant to be called only once, iterates through the vertical screen pixels,
-        spawning a star 1/7th of the time. The y-value of that pixel is then passed to Star for placement.
+        This method, meant to be called only once, spreads every star over the whole height of the screen
+        to populate the background at the same density as when the game is running.
         """
-        for pixel in range(size[1]):
-            if random.choice(star_spawn_rate):
-                self.spawn_star(pixel)
+        count = len(self.x)
+        self.x[:] = self.generator.integers(0, size[0], count)
+        self.y[:] = self.generator.integers(0, size[1], count)
+        self.y_speed[:] = self.generator.choice(self.speeds, count)
 
-    def update(self):
+    def advance(self):
         """
-        Choose if a star will spawn and kill any stars that fall off the screen. Draw all stars.
-
-        This is called on each frame of the game loop to see if a new star will spawn. It is also
-        responsible for moving the stars at their given speeds across the screen.
+        Move every star down by its speed and respawn the stars that fall off the bottom of the screen.
         """
-        will_spawn = random.choice(star_spawn_rate)
-
-        if will_spawn:
-            self.spawn_star()
+        self.y += self.y_speed
+        fallen = self.y >= size[1]
+        count = numpy.count_nonzero(fallen)
+        if count:
+            self.x[fallen] = self.generator.integers(0, size[0], count)
+            self.y[fallen] = 0
+            self.y_speed[fallen] = self.generator.choice(self.speeds, count)
+
+    def draw(self, surface=None, dirty=None, alpha=1.0):
+        """
+        Write every star to the surface pixels in one indexed assignment.
 
-        for star in self.stars:
-            star.rect.center = (star.rect.center[0], (star.rect.center[1] + star.y_speed))
-            # Kill the stars that fall off the bottom of the screen
-            if star.rect.center[1] > size[1]:
-                star.kill()
-        self.stars.draw(screen)
+        :param surface: Surface to draw the stars on. Defaults to the main screen
+        :param dirty: List that a 1x1 rect per star is appended to, for dirty rectangle rendering. Ignored if None
+        :param float alpha: Fraction of the last step to draw the stars at. Stars respawned on the last step are
+            drawn on the top row
+        """
+        if surface is None:
+            surface = get_screen()
+        y = self.y
+        if alpha < 1:
+            y = numpy.maximum(y - self.y_speed * (1 - alpha), 0)
+        numpy.copyto(self.pixel_y, y, casting='unsafe')  # truncates to whole pixels without allocating
+        if surface.get_bytesize() == 3:
+            pixels = pygame.surfarray.pixels3d(surface)  # 24 bit surfaces have no 2d pixel view
+            pixels[self.x, self.pixel_y] = self.color
+        else:
+            pixels = pygame.surfarray.pixels2d(surface)
+            pixels[self.x, self.pixel_y] = surface.map_rgb(self.color)
+        del pixels  # unlocks the surface
+        if dirty is not None:
+            dirty.extend(pygame.Rect(x, y, 1, 1) for x, y in zip(self.x.tolist(), self.pixel_y.tolist()))
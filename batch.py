@@ -0,0 +1,214 @@
+"""
+Play batches of seeded headless games across a process pool and report balance and load statistics.
+
+Each game runs a Simulation without drawing, for up to a number of frames, flown by a pilot: a RandomWalkPilot
+seeded with the game's seed, a scripted input file, or no input at all. Games are independent, so they are
+handed out to worker processes in chunks and only a small summary of each game travels back: survival frames,
+hits and damage taken, peak entity counts and a histogram of frame costs per phase. Throughput grows with the
+number of workers until every core is busy.
+
+Functions exported:
+1. play_game: Play one game and summarize it. Runs in a worker process.
+2. run_batch: Play a batch of games, one per seed, and aggregate their summaries.
+3. aggregate: Combine game summaries into one report.
+
+Usage: python batch.py [--games N] [--seed N] [--frames N] [--pilot random|script|idle] [--script FILE]
+                       [--stage NAME] [--workers N] [--save FILE]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import headless
+
+COST_BIN = 1e-6  # seconds per bin of the frame cost histograms
+PILOTS = ('random', 'script', 'idle')
+
+
+def make_pilot(pilot, seed, script=None):
+    """
+    :param str pilot: 'random' for a RandomWalkPilot, 'script' for a scripted input file, 'idle' for no input
+    :param int seed: Seed of the random walk
+    :param str script: Scripted input file, see headless.load_script. Required by the 'script' pilot
+    :return: Input source with a get(frame) method
+    """
+    from inputs import ScriptedInput, RandomWalkPilot
+
+    if pilot == 'random':
+        return RandomWalkPilot(seed)
+    if pilot == 'script':
+        return headless.load_script(script)
+    if pilot == 'idle':
+        return ScriptedInput()
+    raise ValueError('Unknown pilot {0!r}, expected one of {1}'.format(pilot, ', '.join(PILOTS)))
+
+
+def play_game(task):
+    """
+    Play one game headlessly, without drawing, until the ship is destroyed or the frame limit is reached.
+
+    :param tuple task: (seed, frames, pilot, script, stage), see run_batch
+    :return: dict of seed, frames survived, destroyed, hits, damage taken, peak count of each kind of entity,
+        and for each phase and 'total' a Counter of frame costs in COST_BIN units
+    """
+    seed, frames, pilot, script, stage = task
+    headless.enable()
+    from simulation import Simulation
+    from profiler import FrameProfiler
+
+    profiler = FrameProfiler(history=frames)
+    simulation = Simulation(seed, profiler=profiler, stage=stage)
+    inputs = make_pilot(pilot, seed, script)
+    peaks = {}
+    while not simulation.done and simulation.frame <= frames:
+        profiler.begin_frame(simulation.frame)
+        for event in inputs.get(simulation.frame):
+            simulation.handle_event(event)
+        profiler.lap('events')
+        simulation.step()
+        for name, count in simulation.entity_counts().items():
+            if count > peaks.get(name, 0):
+                peaks[name] = count
+        profiler.end_frame()
+
+    costs = {'total': Counter()}
+    for frame, total, phases, counts in profiler.records:
+        costs['total'][int(total / COST_BIN)] += 1
+        for phase, seconds in phases.items():
+            costs.setdefault(phase, Counter())[int(seconds / COST_BIN)] += 1
+    return {'seed': seed, 'frames': simulation.frame - 1, 'destroyed': simulation.destroyed,
+            'hits': simulation.hits, 'damage': simulation.damage_taken, 'peaks': peaks, 'costs': costs}
+
+
+def histogram_percentile(histogram, fraction):
+    """
+    Nearest-rank percentile of a histogram.
+
+    :param histogram: Counter of bin number to count
+    :param float fraction: Percentile as a fraction, e.g. 0.95
+    :return: Middle of the bin holding the percentile, in milliseconds. 0.0 for an empty histogram
+    """
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    rank = min(int(fraction * total), total - 1)
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen > rank:
+            return (value + 0.5) * COST_BIN * 1000
+
+
+def aggregate(games):
+    """
+    Combine the summaries of a batch of games.
+
+    :param games: list of dicts returned by play_game
+    :return: dict with the number of games and frames played, and survival, hits, damage, peaks and frame_ms
+        statistics. Survival frames, hits and damage get percentiles over games; peaks get the mean and maximum
+        over games of each entity count's peak; frame_ms gets the p50, p95 and p99 cost of every frame of every
+        game, per phase
+    """
+    from profiler import percentile
+
+    def spread(values):
+        values = sorted(values)
+        return {'mean': sum(values) / len(values) if values else 0.0, 'min': values[0] if values else 0,
+                'p10': percentile(values, 0.1), 'p50': percentile(values, 0.5), 'p90': percentile(values, 0.9),
+                'p95': percentile(values, 0.95), 'max': values[-1] if values else 0}
+
+    costs = {}
+    for game in games:
+        for phase, histogram in game['costs'].items():
+            costs.setdefault(phase, Counter()).update(histogram)
+    names = sorted(set(name for game in games for name in game['peaks']))
+    survival = spread(game['frames'] for game in games)
+    survival['rate'] = sum(not game['destroyed'] for game in games) / len(games) if games else 0.0
+    return {'games': len(games), 'frames': sum(game['frames'] for game in games),
+            'survival': survival,
+            'hits': spread(game['hits'] for game in games),
+            'damage': spread(game['damage'] for game in games),
+            'peaks': {name: spread(game['peaks'].get(name, 0) for game in games) for name in names},
+            'frame_ms': {phase: {'p50': histogram_percentile(histogram, 0.5),
+                                 'p95': histogram_percentile(histogram, 0.95),
+                                 'p99': histogram_percentile(histogram, 0.99)}
+                         for phase, histogram in costs.items()}}
+
+
+def run_batch(games=100, seed=1, frames=3600, pilot='random', script=None, stage='default', workers=None):
+    """
+    Play a batch of games, one per seed from seed to seed + games - 1, and aggregate them.
+
+    :param int games: Number of games
+    :param int seed: Master seed of the first game
+    :param int frames: Frame limit of every game
+    :param str pilot: 'random', 'script' or 'idle', see make_pilot
+    :param str script: Scripted input file for the 'script' pilot
+    :param str stage: Name of the stage in the definitions file
+    :param int workers: Number of worker processes. One per core if None; 1 plays every game in this process
+    :return: dict from aggregate, plus the number of workers, the wall-clock seconds, games and frames per
+        second, and a per-game list of seed, frames, destroyed, hits and damage under 'results'
+    """
+    if pilot == 'script' and script is None:
+        raise ValueError('The script pilot needs a script file')
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tasks = [(game_seed, frames, pilot, script, stage) for game_seed in range(seed, seed + games)]
+    start = time.perf_counter()
+    if workers == 1:
+        results = [play_game(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(play_game, tasks, chunksize=max(1, games // (workers * 4))))
+    seconds = time.perf_counter() - start
+    report = aggregate(results)
+    report.update({'workers': workers, 'seconds': seconds,
+                   'games_per_second': games / seconds if seconds else 0.0,
+                   'frames_per_second': report['frames'] / seconds if seconds else 0.0,
+                   'results': [{key: game[key] for key in ('seed', 'frames', 'destroyed', 'hits', 'damage')}
+                               for game in results]})
+    return report
+
+
+def print_report(report):
+    """Print the aggregated statistics of a batch."""
+    print('{games} games, {frames} frames in {seconds:.2f} s on {workers} workers: {games_per_second:.1f} games, '
+          '{frames_per_second:.0f} frames per second'.format(**report))
+    print('Survived {0:.0%} of games'.format(report['survival']['rate']))
+    for name in ('survival', 'hits', 'damage'):
+        print('{0:<11} mean {mean:9.1f}  p10 {p10:7}  p50 {p50:7}  p90 {p90:7}  max {max:7}'.format(
+            name, **report[name]))
+    print('Peak entities ' + ', '.join('{0} {mean:.1f} (max {max})'.format(name, **values)
+                                       for name, values in report['peaks'].items()))
+    for phase, values in report['frame_ms'].items():
+        print('{0:<11} p50 {p50:7.3f}  p95 {p95:7.3f}  p99 {p99:7.3f} ms'.format(phase, **values))
+
+
+def command_line(argv=None):
+    """Parse command line arguments, play the batch and print or save the report."""
+    parser = argparse.ArgumentParser(description='Play batches of seeded Escape from Starsector games headlessly.')
+    parser.add_argument('--games', type=int, default=100, help='number of games, one per seed')
+    parser.add_argument('--seed', type=int, default=1, help='master seed of the first game')
+    parser.add_argument('--frames', type=int, default=3600, help='frame limit of every game')
+    parser.add_argument('--pilot', choices=PILOTS, default='random', help='who flies the ship, default random')
+    parser.add_argument('--script', help='scripted input file for the script pilot')
+    parser.add_argument('--stage', default='default', help='stage from the definitions file')
+    parser.add_argument('--workers', type=int, help='worker processes, one per core by default')
+    parser.add_argument('--save', help='write the report, with every game\'s results, to this JSON file')
+    args = parser.parse_args(argv)
+
+    report = run_batch(args.games, args.seed, args.frames, args.pilot, args.script, args.stage, args.workers)
+    print_report(report)
+    if args.save:
+        with open(args.save, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    command_line(sys.argv[1:])
@@ -0,0 +1,252 @@
+"""
+Scenario benchmarks for the game engine.
+
+Each scenario runs the real Background, Ship, enemy and attack code headlessly through a Simulation for a fixed
+number of frames, drawing to the offscreen screen surface, and measures frames per second, per-frame latency
+percentiles and peak Python memory. The player ship is made invulnerable so that every scenario runs to the end.
+
+Functions exported:
+1. run_scenario: Measure one named scenario.
+2. run_all: Measure several scenarios.
+3. compare: List the regressions of a set of results against a baseline.
+
+Usage: python benchmarks.py [--scenario NAME ...] [--frames N] [--save FILE] [--compare FILE] [--threshold 0.10]
+Run with --list to see the scenarios. With --compare, the exit status is 1 if any scenario regressed.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import headless
+
+
+def idle(simulation, load):
+    """Starfield and player ship only."""
+
+
+def enemy_swarm(count):
+    """
+    :param int count: Number of enemies kept alive
+    :return: Scenario that keeps count enemies, half of them Fighters, on the field. Enemies fire as usual
+    """
+    def setup(simulation, load):
+        from enemies import enemies, BasicEnemy, Fighter
+
+        def tick():
+            while len(enemies) < count:
+                (Fighter if load.random() < 0.5 else BasicEnemy)()
+        tick()
+        return tick
+    setup.__doc__ = '{0} enemies, replaced as they leave the screen.'.format(count)
+    return setup
+
+
+def barrage(count):
+    """
+    :param int count: Number of enemy shots kept on screen
+    :return: Scenario that keeps count straight, angled and power laser shots falling over the screen
+    """
+    def setup(simulation, load):
+        import enemies
+        import definitions
+
+        attacks = definitions.tables.get(definitions.DEFINITIONS).attacks
+        kinds = [attacks['basic'], attacks['angled_right'], attacks['power_laser']]
+
+        def fire(top, bottom):
+            spec = kinds[load.randrange(len(kinds))]
+            enemies.projectiles.launch(spec, (load.randrange(0, 800), load.randrange(top, bottom)))
+
+        for shot in range(count):
+            fire(-20, 600)
+
+        def tick():
+            for shot in range(count - enemies.projectiles.stats()['live']):
+                fire(-20, 0)
+        return tick
+    setup.__doc__ = '{0} enemy shots on screen, replaced as they leave it.'.format(count)
+    return setup
+
+
+def explosion_storm(per_frame):
+    """
+    :param int per_frame: Number of explosions started every frame
+    :return: Scenario that starts per_frame explosions at random positions every frame
+    """
+    def setup(simulation, load):
+        from enemies import explosions
+
+        def tick():
+            for explosion in range(per_frame):
+                explosions.spawn((load.randrange(0, 760), load.randrange(0, 560)))
+        return tick
+    setup.__doc__ = '{0} new explosions every frame, {1} on screen.'.format(per_frame, per_frame * 20)
+    return setup
+
+
+# name: (scenario setup function, Simulation options)
+scenarios = {
+    'idle': (idle, {}),
+    'enemies_50': (enemy_swarm(50), {}),
+    'enemies_500': (enemy_swarm(500), {}),
+    'barrage_5000': (barrage(5000), {}),
+    'barrage_5000_arrays': (barrage(5000), {'projectile_arrays': True}),
+    'barrage_5000_grid': (barrage(5000), {'spatial_hash': True}),
+    'explosion_storm': (explosion_storm(25), {}),
+}
+
+
+def play(name, frames, seed, measure_memory):
+    """
+    Build a simulation for a scenario and play it for a number of frames.
+
+    Memory is traced from before the simulation is built, so the peak includes the scenario's sprites.
+    :return: list of frame times in seconds, and the peak traced memory in bytes if measure_memory is True
+    """
+    from variables import init_display, BLACK
+    from simulation import Simulation
+
+    screen = init_display()
+    setup, options = scenarios[name]
+    if measure_memory:
+        tracemalloc.start()
+    simulation = Simulation(seed, spawning=False, **options)
+    simulation.ship.shield_level = 10 ** 9  # invulnerable, so the scenario is never cut short
+    tick = setup(simulation, random.Random(seed))
+    frame_times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        if tick is not None:
+            tick()
+        screen.fill(BLACK)
+        simulation.step()
+        simulation.draw(screen)
+        frame_times.append(time.perf_counter() - start)
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if simulation.projectile_arrays is not None:
+        simulation.projectile_arrays.clear()
+    return frame_times, peak
+
+
+def run_scenario(name, frames=600, seed=1, memory=True):
+    """
+    Measure a scenario.
+
+    Timing and memory are measured in two separate runs, since tracing memory allocations slows the game down.
+    :param str name: Key of the scenarios dict
+    :param int frames: Number of frames to play
+    :param int seed: Master seed for the game and for the scenario's own random placements
+    :param bool memory: Also measure peak Python memory use
+    :return: dict of frames, seconds, fps, p50_ms, p95_ms, p99_ms, max_ms and peak_memory_kb
+    """
+    from profiler import percentile
+
+    headless.enable()
+    frame_times, peak = play(name, frames, seed, False)
+    seconds = sum(frame_times)
+    ordered = sorted(frame_times)
+    result = {'frames': frames, 'seconds': seconds, 'fps': frames / seconds if seconds else 0.0,
+              'p50_ms': percentile(ordered, 0.5) * 1000, 'p95_ms': percentile(ordered, 0.95) * 1000,
+              'p99_ms': percentile(ordered, 0.99) * 1000, 'max_ms': ordered[-1] * 1000, 'peak_memory_kb': None}
+    if memory:
+        result['peak_memory_kb'] = play(name, frames, seed, True)[1] / 1024
+    return result
+
+
+def run_all(names=None, frames=600, seed=1, memory=True, report=None):
+    """
+    Measure several scenarios.
+
+    :param names: Scenario names, all scenarios if None
+    :param report: Optional callable, called with the name and result of each scenario as it finishes
+    :return: dict with run information under 'meta' and a result per scenario under 'scenarios'
+    """
+    import pygame
+
+    results = {'meta': {'frames': frames, 'seed': seed, 'python': platform.python_version(),
+                        'pygame': pygame.version.ver, 'platform': platform.platform()},
+               'scenarios': {}}
+    for name in names or scenarios:
+        results['scenarios'][name] = run_scenario(name, frames, seed, memory)
+        if report:
+            report(name, results['scenarios'][name])
+    return results
+
+
+def compare(results, baseline, threshold=0.10):
+    """
+    Find the scenarios that got slower or use more memory than in a baseline.
+
+    A scenario regressed if its fps dropped, or its p95 latency or peak memory grew, by more than the threshold.
+    Scenarios missing from either set of results are skipped.
+    :param dict results: Results from run_all
+    :param dict baseline: Earlier results from run_all, e.g. loaded from a saved JSON baseline
+    :param float threshold: Allowed relative change, e.g. 0.10 for 10%
+    :return: list of messages, one per regression
+    """
+    regressions = []
+    for name, result in results['scenarios'].items():
+        base = baseline['scenarios'].get(name)
+        if base is None:
+            continue
+        if result['fps'] < base['fps'] * (1 - threshold):
+            regressions.append('{0}: fps {1:.1f} -> {2:.1f}'.format(name, base['fps'], result['fps']))
+        if result['p95_ms'] > base['p95_ms'] * (1 + threshold):
+            regressions.append('{0}: p95 {1:.3f} -> {2:.3f} ms'.format(name, base['p95_ms'], result['p95_ms']))
+        if result['peak_memory_kb'] and base['peak_memory_kb'] and \
+                result['peak_memory_kb'] > base['peak_memory_kb'] * (1 + threshold):
+            regressions.append('{0}: peak memory {1:.0f} -> {2:.0f} KiB'.format(
+                name, base['peak_memory_kb'], result['peak_memory_kb']))
+    return regressions
+
+
+def print_result(name, result):
+    """Print one line per scenario result."""
+    memory = '' if result['peak_memory_kb'] is None else '  peak {0:8.0f} KiB'.format(result['peak_memory_kb'])
+    print('{0:<20} {fps:9.1f} fps  p50 {p50_ms:7.3f}  p95 {p95_ms:7.3f}  p99 {p99_ms:7.3f} ms{1}'.format(
+        name, memory, **result))
+
+
+def command_line(argv=None):
+    """Parse command line arguments, run the scenarios, and save or compare the results."""
+    parser = argparse.ArgumentParser(description='Benchmark Escape from Starsector scenarios headlessly.')
+    parser.add_argument('--scenario', action='append', choices=sorted(scenarios), help='scenario to run, repeatable')
+    parser.add_argument('--frames', type=int, default=600, help='frames played per scenario')
+    parser.add_argument('--seed', type=int, default=1, help='master seed for every scenario')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='skip the peak memory run')
+    parser.add_argument('--save', help='write the results to this JSON baseline file')
+    parser.add_argument('--compare', help='compare the results against this JSON baseline file')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed relative regression, default 0.10')
+    parser.add_argument('--list', action='store_true', help='list the scenarios and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (setup, options) in scenarios.items():
+            print('{0:<20} {1} {2}'.format(name, (setup.__doc__ or '').strip(), options or ''))
+        return 0
+
+    results = run_all(args.scenario, args.frames, args.seed, args.memory, print_result)
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        if regressions:
+            return 1
+        print('No regressions beyond {0:.0%}'.format(args.threshold))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(command_line(sys.argv[1:]))
@@ -0,0 +1,231 @@
+"""
+Classes and functions exported:
+1. SpatialHash: Incrementally updated uniform grid of sprites used as the broad phase of collision detection.
+2. masks_overlap: Pixel-exact narrow phase for a pair of sprites whose rectangles already collide.
+"""
+
+from math import ceil
+from variables import *
+
+
+def steps_in_cell(x, y, velocity, left, top, size):
+    """
+    :param x, y: Position of a point moving in a straight line
+    :param velocity: Velocity of the point in pixels per step, not zero
+    :param left, top: Top left corner of the grid cell holding the point
+    :param int size: Width and height of the grid cell
+    :return: Number of whole steps after which the point has left the cell, at least 1
+    """
+    x_speed, y_speed = velocity
+    steps = None
+    if x_speed > 0:
+        steps = (left + size - x) / x_speed
+    elif x_speed < 0:
+        steps = (x - left + 1) / -x_speed
+    if y_speed > 0:
+        y_steps = (top + size - y) / y_speed
+    elif y_speed < 0:
+        y_steps = (y - top + 1) / -y_speed
+    else:
+        return max(ceil(steps), 1)
+    return max(ceil(y_steps if steps is None or y_steps < steps else steps), 1)
+
+
+class SpatialHash(pygame.sprite.AbstractGroup):
+    """
+    Uniform grid of square cells, kept up to date incrementally, used as the broad phase of collision detection.
+
+    This replaces testing a ship hitbox against every sprite of a group (pygame.sprite.spritecollide) with
+    testing it only against the sprites in nearby cells. The grid is a sprite group: a sprite is filed in the
+    cell holding its rect center when it is added, and leaves its cell when it is killed or removed. Sprites are
+    not re-filed every frame. Attacks move in straight lines, so when a sprite is filed the number of steps
+    until its center can reach a cell border is worked out from its velocity (or its parent's, for a hitbox),
+    and advance only looks at the sprites whose time has come. With 128 pixel cells and shots of a few pixels per
+    frame, that is a small fraction of the shots on any frame. A query widens the searched area by the largest
+    sprite half-width and half-height filed so far, so sprites that overlap a cell border are still found.
+
+    Sprites without a velocity are never re-filed; re-add them (or call rebuild) after moving them.
+
+    Methods defined:
+    """
+
+    def __init__(self, cell_size=128):
+        """
+        Attributes defined here:
+        cells: dict of cell key to a dict of the sprites filed in that cell, in the order they were filed
+        where: dict of sprite to the key of its cell
+        due, schedule: dict of sprite to the step its cell is next checked on, and of step to those sprites
+        velocities: dict of moving sprite to the velocity vector it moves by
+        steps: Number of times advance was called
+        refiled: Number of sprites looked at by the last advance
+
+        :param int cell_size: Width and height of a grid cell in pixels. Should be larger than most sprites
+        """
+        super().__init__()
+        self.cell_size = cell_size
+        self.cells = {}
+        self.where = {}
+        self.due = {}
+        self.schedule = {}
+        self.velocities = {}
+        self.extent = [0, 0]  # largest sprite half-width and half-height in the grid
+        self.slack = 0  # pixels a filed sprite can be past its cell, one step of the fastest sprite filed
+        self.steps = 0
+        self.refiled = 0
+
+    def add_internal(self, sprite, layer=None):
+        """File a sprite added to the group in its cell. Called by pygame's sprite group machinery."""
+        super().add_internal(sprite)
+        self.file(sprite)
+        rect = sprite.rect
+        if rect.width > self.extent[0] * 2:
+            self.extent[0] = (rect.width + 1) // 2
+        if rect.height > self.extent[1] * 2:
+            self.extent[1] = (rect.height + 1) // 2
+
+    def remove_internal(self, sprite):
+        """Take a killed or removed sprite out of its cell. Called by pygame's sprite group machinery."""
+        super().remove_internal(sprite)
+        key = self.where.pop(sprite)
+        cell = self.cells[key]
+        del cell[sprite]
+        if not cell:
+            del self.cells[key]
+        self.due.pop(sprite, None)
+        self.velocities.pop(sprite, None)
+
+    def file(self, sprite):
+        """
+        Put a sprite in the cell holding its rect center and plan the next check of its cell.
+
+        The check is planned for the step on which the center has crossed the nearest cell border in the direction
+        of motion, so a sprite is at most one step of movement past the border of the cell it is filed in. Queries
+        are widened by that much, the slack, as well as by the extent.
+        :param sprite: Sprite with a rect, and a velocity or a parent with one if it moves
+        """
+        size = self.cell_size
+        x, y = sprite.rect.center
+        column, row = x // size, y // size
+        key = (column << 16) + row
+        cell = self.cells.get(key)
+        if cell is None:
+            self.cells[key] = {sprite: None}
+        else:
+            cell[sprite] = None
+        self.where[sprite] = key
+
+        velocity = getattr(getattr(sprite, 'parent', None) or sprite, 'velocity', None)
+        if velocity is None or not (velocity[0] or velocity[1]):
+            return
+        self.velocities[sprite] = velocity
+        speed = max(abs(velocity[0]), abs(velocity[1])) + 1  # a pixel more for the rounding of rect positions
+        if speed > self.slack:
+            self.slack = int(speed) + 1
+        self.plan(sprite, self.steps + steps_in_cell(x, y, velocity, column * size, row * size, size))
+
+    def plan(self, sprite, step):
+        """Plan the next check of a sprite's cell for a step."""
+        self.due[sprite] = step
+        planned = self.schedule.get(step)
+        if planned is None:
+            self.schedule[step] = [sprite]
+        else:
+            planned.append(sprite)
+
+    def advance(self):
+        """
+        Account for one step of movement: re-file the sprites whose planned check is on this step.
+
+        Call once per simulation step, after the sprites in the grid have moved. This is the per-frame path, so
+        the cell change of file is repeated inline here.
+        """
+        self.steps = step = self.steps + 1
+        planned = self.schedule.pop(step, ())
+        due, where, cells, velocities = self.due, self.where, self.cells, self.velocities
+        size = self.cell_size
+        for sprite in planned:
+            if due.get(sprite) != step:
+                continue  # killed, or re-added and planned again, since this check was planned
+            x, y = sprite.rect.center
+            column, row = x // size, y // size
+            key = (column << 16) + row
+            old = where[sprite]
+            if key != old:
+                cell = cells[old]
+                del cell[sprite]
+                if not cell:
+                    del cells[old]
+                cell = cells.get(key)
+                if cell is None:
+                    cells[key] = {sprite: None}
+                else:
+                    cell[sprite] = None
+                where[sprite] = key
+            self.plan(sprite, step + steps_in_cell(x, y, velocities[sprite], column * size, row * size, size))
+        self.refiled = len(planned)
+
+    def rebuild(self, *groups):
+        """
+        Empty the grid and add every sprite of the given groups.
+
+        :param groups: pygame sprite groups (or other iterables of sprites with a rect attribute)
+        """
+        self.empty()
+        self.schedule.clear()
+        self.velocities.clear()
+        self.extent[0] = self.extent[1] = 0
+        self.slack = 0
+        for group in groups:
+            self.add(*group)
+
+    def query(self, rect):
+        """
+        Find the sprites whose rects overlap rect, looking only at the cells around it.
+
+        :param rect: pygame.Rect to test
+        :return: list of sprites colliding with rect, in grid order
+        """
+        size = self.cell_size
+        cells = self.cells
+        found = []
+        width, height = self.extent[0] + self.slack, self.extent[1] + self.slack
+        for column in range((rect.left - width) // size, (rect.right + width) // size + 1):
+            base = column << 16
+            for row in range((rect.top - height) // size, (rect.bottom + height) // size + 1):
+                cell = cells.get(base + row)
+                if cell:
+                    for sprite in cell:
+                        if rect.colliderect(sprite.rect):
+                            found.append(sprite)
+        return found
+
+    def collide(self, sprite, dokill):
+        """
+        Grid equivalent of pygame.sprite.spritecollide for the sprites held in this grid.
+
+        :param sprite: Sprite whose rect is tested, e.g. one of the player ship hitboxes
+        :param bool dokill: Kill every sprite that was hit, which also takes it out of the grid
+        :return: list of sprites hit
+        """
+        hits = self.query(sprite.rect)
+        if dokill:
+            for hit in hits:
+                hit.kill()
+        return hits
+
+
+def masks_overlap(first, second):
+    """
+    Test whether the opaque pixels of two sprites overlap where the sprites are drawn.
+
+    Each sprite gives its image's mask and the screen position of the image's top left corner with its
+    placed_mask method. Masks come from the masks cache, built once per image, so this costs one
+    pygame.mask.Mask.overlap call. It is only meant for the few pairs that passed a rectangle test.
+
+    :param first: Sprite with a placed_mask method, e.g. the player Ship
+    :param second: Sprite with a placed_mask method, e.g. an enemy or an attack
+    :return: True if at least one pixel overlaps
+    """
+    mask, (x, y) = first.placed_mask()
+    other, (other_x, other_y) = second.placed_mask()
+    return mask.overlap(other, (other_x - x, other_y - y)) is not None
@@ -0,0 +1,77 @@
+"""
+Classes exported:
+1. Culler: Off-screen culling pass over every enemy and attack, run once per frame by the Simulation.
+"""
+
+from variables import *
+from enemies import attacks, enemies
+
+
+class Culler(object):
+    """
+    One despawn and visibility rule for every moving entity.
+
+    Each frame, after everything has moved and collided, update looks at where the image of every enemy, attack
+    sprite and array attack is drawn. An entity whose image lies wholly outside the retire bounds (the screen
+    grown by retire_margin), on the side it is moving away from, can never come back on screen and is retired:
+    killed, so attack sprites return to their pool. Of the rest, only those whose image overlaps the view (the
+    screen grown by draw_margin) are listed for drawing, so enemies still above the screen in their
+    introduction, or shots that have not yet left the bounds, are updated but not drawn. The number of entities
+    retired and skipped by drawing on the last pass are kept for the per-frame entity counts.
+
+    Methods defined:
+    """
+
+    def __init__(self, draw_margin=0, retire_margin=0):
+        """
+        Attributes defined here:
+        view: Rect of the screen grown by draw_margin. Entities whose image lies outside it are not drawn
+        bounds: Rect of the screen grown by retire_margin. Entities outside it and moving away are retired
+        enemies, attacks: Lists of the enemy and attack sprites to draw, from the last pass
+        culled, retired: Number of entities skipped by drawing, and retired, on the last pass
+
+        :param int draw_margin: Pixels around the screen in which entities are still drawn
+        :param int retire_margin: Pixels around the screen that entities must leave before they are retired
+        """
+        self.view = pygame.Rect((0, 0), size).inflate(2 * draw_margin, 2 * draw_margin)
+        self.bounds = pygame.Rect((0, 0), size).inflate(2 * retire_margin, 2 * retire_margin)
+        self.enemies = []
+        self.attacks = []
+        self.culled = 0
+        self.retired = 0
+
+    def update(self, projectile_arrays=None):
+        """
+        Retire the enemies and attacks that can never come back on screen and list the visible ones for drawing.
+
+        This runs over every entity each frame, so the bounds and view tests are written out inline.
+        :param projectile_arrays: ProjectileArrays engine whose attacks are culled as well, if not None
+        :return: Number of entities retired
+        """
+        view_left, view_top, view_right, view_bottom = self.view.left, self.view.top, self.view.right, self.view.bottom
+        left_limit, top_limit = self.bounds.topleft
+        right_limit, bottom_limit = self.bounds.bottomright
+        retired = culled = 0
+        # attacks are drawn with their top left corner at the rect center, enemies by their sprite group at the
+        # rect's top left corner. Iterating a group goes over a copy, so sprites can be killed on the way
+        for group, visible, corner in ((attacks, self.attacks, 'center'), (enemies, self.enemies, 'topleft')):
+            visible.clear()
+            for sprite in group:
+                left, top = getattr(sprite.rect, corner)
+                width, height = sprite.image.get_size()
+                x_speed, y_speed = sprite.velocity
+                if ((top >= bottom_limit and y_speed >= 0) or (top + height <= top_limit and y_speed <= 0) or
+                        (left >= right_limit and x_speed >= 0) or (left + width <= left_limit and x_speed <= 0)):
+                    sprite.kill()
+                    retired += 1
+                elif left < view_right and left + width > view_left and top < view_bottom and top + height > view_top:
+                    visible.append(sprite)
+                else:
+                    culled += 1
+        if projectile_arrays is not None:
+            array_retired, array_culled = projectile_arrays.cull(self.view, self.bounds)
+            retired += array_retired
+            culled += array_culled
+        self.retired = retired
+        self.culled = culled
+        return retired
@@ -0,0 +1,140 @@
+"""
+Classes and objects exported:
+1. EnemySpec: Compiled definition of an enemy type.
+2. Pattern: Compiled attack pattern of an enemy type: the rolls that trigger it, the shots fired and the cooldown.
+3. StageSpec: Compiled stage: its spawn waves, enemy cap and planning parameters.
+4. Wave: Compiled spawn wave of a stage.
+5. Tables: Compiled attack, enemy and stage definitions, keyed by name.
+6. tables: Module-level AssetCache of compiled definition files.
+7. enemy_spec: Look up an enemy type in the default definitions file.
+8. stage_spec: Look up a stage in the default definitions file.
+9. attack_hitbox: Look up the hitbox of an attack fired from separate arguments in the default definitions file.
+
+Enemy and attack types are declared in a JSON file in the data directory rather than in code. Attacks give
+their sprite class, line offset, angle in degrees, speed, damage, line size, color name and hitbox (width,
+height, and horizontal and vertical offset from the attack rect center). Enemies give their image, mass,
+attack cooldown, lifetime, explosion offset, optionally a collision rect smaller than their image, the range
+of their per-frame attack roll, and the attack patterns fired when the roll lands in a pattern's range.
+Stages give the waves of enemies spawned by the stages.StageScheduler, the most enemies allowed on screen at
+once, how many frames a spawn is put off by when that cap is reached, and how far ahead spawns are planned.
+A wave spawns groups of count enemies of one kind, spacing frames apart, from its start frame until its end
+frame (forever if it has none). Groups come once, or every repeat frames. Random waves space their groups
+out with a geometric distribution of mean repeat instead, like a dice roll every frame.
+A file is read and compiled once, on first use, into tuples holding everything precomputed, so spawning an
+enemy or firing an attack is a table lookup. A new enemy type is a new entry, spawned with BasicEnemy(kind).
+"""
+
+import json
+import os
+from collections import namedtuple
+import variables
+from assets import AssetCache
+
+DATA_DIR = 'data'
+DEFINITIONS = 'definitions.json'
+
+EnemySpec = namedtuple('EnemySpec', 'kind image_name mass attack_cooldown lifetime explosion_offset rect roll patterns '
+                                     'roll_span fire_floor')
+Pattern = namedtuple('Pattern', 'low high volley cooldown')  # volley: tuple of (AttackSpec, (x, y) muzzle offset)
+StageSpec = namedtuple('StageSpec', 'name max_enemies deferral lookahead waves')
+Wave = namedtuple('Wave', 'kind start end count spacing repeat random')
+Tables = namedtuple('Tables', 'attacks enemies stages')
+
+
+def read_definitions(name):
+    """
+    :param str name: File name of the definitions, relative to the data directory
+    :return: dict decoded from the JSON file
+    """
+    with open(os.path.join(DATA_DIR, name)) as definitions_file:
+        return json.load(definitions_file)
+
+
+def compile_definitions(data):
+    """
+    Compile decoded definitions into lookup tables.
+
+    Attack angles are converted to radians, colors are looked up in the variables module, and every attack
+    gets its image, velocity vector and hitbox from enemies.attack_spec. Enemy attack patterns refer to the
+    compiled attacks directly. Each enemy also gets the size of its roll range and its fire floor: the fraction
+    of that range below the lowest roll that fires, used by enemies.FireControl to test uniform draws.
+
+    :param dict data: Definitions with 'attacks' and 'enemies' entries, as read by read_definitions
+    :return: Tables of AttackSpec, EnemySpec and StageSpec tuples, keyed by name
+    :raises KeyError: If a definition names an unknown attack, attack class, color or enemy kind
+    """
+    import math
+    import enemies
+
+    attacks = {}
+    for name, attack in data['attacks'].items():
+        attacks[name] = enemies.attack_spec(
+            getattr(enemies, attack['class']), attack['offset'], math.radians(attack['angle']), attack['speed'],
+            attack['damage'], attack['line_length'], attack['line_width'], getattr(variables, attack['color']),
+            tuple(attack['hitbox']))
+
+    enemy_specs = {}
+    for kind, enemy in data['enemies'].items():
+        patterns = tuple(Pattern(pattern['rolls'][0], pattern['rolls'][1],
+                                 tuple((attacks[attack], tuple(muzzle)) for attack, muzzle in pattern['volley']),
+                                 pattern.get('cooldown', enemy['attack_cooldown']))
+                         for pattern in enemy['patterns'])
+        low, high = enemy['roll']
+        span = high - low + 1
+        fire_floor = min((pattern.low - low) / span for pattern in patterns) if patterns else 1.0
+        enemy_specs[kind] = EnemySpec(kind, enemy['image'], enemy['mass'], enemy['attack_cooldown'],
+                                      enemy['lifetime'], tuple(enemy['explosion_offset']),
+                                      tuple(enemy['rect']) if 'rect' in enemy else None, (low, high), patterns,
+                                      span, fire_floor)
+
+    stages = {}
+    for name, stage in data.get('stages', {}).items():
+        waves = tuple(Wave(wave['kind'], wave.get('start', 0), wave.get('end'), wave.get('count', 1),
+                           wave.get('spacing', 0), wave.get('repeat'), wave.get('random', False))
+                      for wave in stage['waves'])
+        for wave in waves:
+            enemy_specs[wave.kind]  # fail at load time on unknown kinds, not at spawn time
+        stages[name] = StageSpec(name, stage.get('max_enemies'), stage.get('deferral', 30),
+                                 stage.get('lookahead', 600), waves)
+    return Tables(attacks, enemy_specs, stages)
+
+
+def load_definitions(name):
+    """Read and compile a definitions file. Loader of the tables cache."""
+    return compile_definitions(read_definitions(name))
+
+
+tables = AssetCache(load_definitions, max_size=4)
+
+
+def enemy_spec(kind):
+    """
+    :param str kind: Name of an enemy type in the default definitions file
+    :return: Its EnemySpec
+    """
+    return tables.get(DEFINITIONS).enemies[kind]
+
+
+def stage_spec(name):
+    """
+    :param str name: Name of a stage in the default definitions file
+    :return: Its StageSpec
+    """
+    return tables.get(DEFINITIONS).stages[name]
+
+
+def attack_hitbox(attack_class, angle):
+    """
+    Hitbox geometry for an attack that is not fired from a definition, but from separate arguments.
+
+    The geometry is that of the attack of the same class in the default definitions file whose angle is
+    nearest, so e.g. AngledAttacks to the left and right get the hitboxes of angled_left and angled_right.
+    :param attack_class: BasicAttack or a subclass
+    :param float angle: Angle of the attack in radians
+    :return: tuple of hitbox width, height, and horizontal and vertical offset from the attack rect center
+    :raises KeyError: If no attack of that class is defined
+    """
+    specs = [spec for spec in tables.get(DEFINITIONS).attacks.values() if spec.attack_class is attack_class]
+    if not specs:
+        raise KeyError(attack_class.__name__)
+    return min(specs, key=lambda spec: abs(spec.shape[0] - angle)).hitbox
@@ -1,18 +1,76 @@
 """
 Classes and objects exported:
 Hitbox: Class used for collision detection on enemy attacks and ships.
+AttackSpec: Compiled attack, see attack_spec and the definitions module.
 enemies: Sprite group containing the images and hitboxes of enemies.
 attacks: Sprite group that includes only the drawn images of enemy attacks.
 shots: Sprite group that holds hitboxes for various attacks.
+attack_pool: ProjectilePool that recycles attack sprites.
+projectiles: Projectile engine that enemies fire their attacks through. attack_pool unless replaced.
+set_projectile_engine: Function that replaces the projectile engine.
+set_shot_index: Function that adds a spatial index to the groups every attack hitbox joins.
+attack_shapes: AssetCache of attack images and velocity factors, keyed by attack shape.
+explosions: ExplosionPool holding the explosion animations currently on screen.
+FireControl: Class that makes the attack decisions of every enemy in one batch per frame.
 Note: attacks and shots are maintained as separate groups to allow for hitbox calibration during testing. Attacks are drawn on screen, shots should not be.
 """
 
-import random
 import math
+from collections import namedtuple
+import numpy
+import rng
+import definitions
 from variables import *
+from assets import AssetCache, images, masks
+from kinematics import Kinematic, Vector2
+from rendering import EXPLOSIONS
 
+# Compiled attack: everything needed to launch it without recomputing its image, direction or hitbox
+AttackSpec = namedtuple('AttackSpec', 'attack_class shape image line_terminus velocity hitbox damage')
 
-class Hitbox(pygame.sprite.Sprite):
+
+def draw_attack_shape(shape):
+    """
+    Draw the image of an attack line and calculate its direction. Loader for the attack_shapes cache.
+
+    Simple trig calculations give the velocity factors that change the direction (while keeping magnitude)
+    of an attack, and the endpoint of the attack line drawn on a 30x60 attack surface.
+
+    :param tuple shape: (angle, color, line_length, line_width, offset), as passed to BasicAttack
+    :return: tuple of the attack image, horizontal and vertical velocity factors, and line terminus
+    """
+    angle, color, line_length, line_width, offset = shape
+    x_factor = math.sin(angle)
+    y_factor = math.cos(angle)
+    line_terminus = (offset[0] + x_factor * line_length, offset[1] + y_factor * line_length)
+    image = pygame.Surface((30, 60))
+    image.set_colorkey(BLACK)
+    pygame.draw.line(image, color, offset, line_terminus, line_width)
+    return image, x_factor * 1.1, y_factor * 1.1, line_terminus
+
+
+def attack_spec(attack_class, offset, angle, velocity, damage, line_length, line_width, color=RED, hitbox=None):
+    """
+    Compile the arguments of an attack into an AttackSpec.
+
+    The image and line terminus come from the attack_shapes cache, the speed is turned into a velocity vector
+    along the attack angle, and the hitbox geometry is fixed.
+
+    :param attack_class: BasicAttack or a subclass
+    :param hitbox: tuple of hitbox width, height, and horizontal and vertical offset from the attack rect center.
+        If None, that of the nearest defined attack is used, see definitions.attack_hitbox
+    :return: AttackSpec. The other arguments are the same as for BasicAttack
+    :raises KeyError: If hitbox is None and no attack of attack_class is defined
+    """
+    shape = (angle, color, line_length, line_width, tuple(offset))
+    image, x_factor, y_factor, line_terminus = attack_shapes.get(shape)
+    if hitbox is None:
+        hitbox = definitions.attack_hitbox(attack_class, angle)
+    return AttackSpec(attack_class, shape, image, line_terminus, (velocity * x_factor, velocity * y_factor),
+                      hitbox, damage)
+
+
+class Hitbox(pygame.sprite.Sprite, Kinematic):
     """
     Hitbox sprite class using pygame.rect attributes for use in collision testing
 
@@ -21,7 +79,7 @@ class Hitbox(pygame.sprite.Sprite):
     that must be added to the enemies or shots sprite groups for collision detection to occur.
     A separate hitbox is necessary when a ship's image contains even small amounts of blank space at the edges
     of the rectangle defining the image of the ship. Some large ships, or ships of a complex shape, may
-    require multiple hitboxes.
+    require multiple hitboxes. A hitbox attached to a ship or attack (see Kinematic.attach) follows it by offset.
     """
 
     def __init__(self, width, height, x_pos, y_pos, damage):
@@ -35,21 +93,33 @@ class Hitbox(pygame.sprite.Sprite):
         :param damage: Integer value of damage done to player ship when collisions occur
         """
         super().__init__()
-        self.image = pygame.Surface((width, height))
-        self.image.fill(GREEN)  # To allow for tracking during collision testing
-        self.rect = self.image.get_rect()
-        self.position = [x_pos, y_pos]
-        self.rect.center = self.position[:]
+        self.image = None
+        self.reset(width, height, x_pos, y_pos, damage)
+
+    def reset(self, width, height, x_pos, y_pos, damage):
+        """
+        Move and resize the hitbox for reuse. The image surface is only replaced if the size changed.
+
+        Takes the same arguments as instantiation.
+        """
+        if self.image is None or self.image.get_size() != (width, height):
+            self.image = pygame.Surface((width, height))
+            self.image.fill(GREEN)  # To allow for tracking during collision testing
+            self.rect = self.image.get_rect()
+        self.place(x_pos, y_pos)
         self.damage = damage
 
 
-class BasicAttack(pygame.sprite.Sprite):
+class BasicAttack(pygame.sprite.Sprite, Kinematic):
     """
     Super class for all straight line attacks.
 
     This class defines a standard, non-accelerating, single-image attack. It contains all methods
     required to produce a functional attack, calibrated to the BasicEnemy class. It is meant to be
-    subclassed by specific types of attacks that require different parameters.
+    subclassed by specific types of attacks, whose hitbox calibration is declared together with their
+    attacks in the definitions file.
+    Attacks are recycled: an attack and its hitbox are returned to the attack pool when the attack
+    is killed, and reset with new arguments the next time an enemy fires the same class of attack.
     Methods defined:
     """
 
@@ -58,9 +128,8 @@ class BasicAttack(pygame.sprite.Sprite):
         Create an attack object.
 
         The default values for this attack object are calibrated to the BasicEnemy class. The surfaces,
-        lines, and hitbox offsets are aligned to that class. As detailed in the player's Ship class,
-        integer rounding in pygame.rect necessitates a separate floating point attribute (position) to
-        accurately update the object's position on the screen.
+        lines, and hitbox offsets are aligned to that class. As for every Kinematic sprite, the true
+        position is a float vector, and the hitbox is attached to the attack and follows it by offset.
 
         :param source: Enemy surface image where the attack originates
         :param offset: Pixel offset that defines the origin of the attack line to be drawn
@@ -71,107 +140,197 @@ class BasicAttack(pygame.sprite.Sprite):
         :param line_width: Width of attack line
         :param color: Keyword arg defaulting to RED (from variables module). RGB values as tuples should be passed. Eg RED = (255, 0, 0)
         """
-        super().__init__()
-        self.image = pygame.Surface((30, 60))
-        self.image.set_colorkey((0, 0, 0))
-        self.rect = self.image.get_rect()
-        self.rect.center = [source[0] - 15, source[1] - 7]
-        self.position = self.rect.center[:]  # use separate position attribute to avoid rect.center int rounding
-        self.angle = angle
-        self.velocity = [0, velocity]
-        self.color = color
-        self.line_length = line_length
-        self.line_width = line_width
-        self.line_origin = offset
-        self.line_terminus = self.line_origin[:]
-        self.calc_and_draw()
-        self.damage = damage
-        #  Standard hitbox offset is for BasicEnemy class. Overwrite this for other classes of enemies
-        self.hitbox = Hitbox(2, 8, self.rect.center[0] + 15, self.rect.center[1] + 30, self.damage)
-        attacks.add(self)
-        shots.add(self.hitbox)
+        self.prepare()
+        self.reset(source, offset, angle, velocity, damage, line_length, line_width, color)
+
+    def prepare(self):
+        """
+        Set up a new, unplaced attack sprite: its rect, its velocity vector and no hitbox yet.
+
+        Shared by instantiation and from_spec. launch then places the attack and creates its hitbox.
+        """
+        pygame.sprite.Sprite.__init__(self)
+        self.rect = pygame.Rect(0, 0, 30, 60)
+        self.velocity = Vector2()
+        self.hitbox = None
 
-    def calc_and_draw(self):
+    def reset(self, source, offset, angle, velocity, damage, line_length, line_width, color=RED):
         """
-        Adjust velocity based on angle of firing. Calculate line terminus from line origin, angle, and length.
+        (Re)initialize the attack for a new shot and add it and its hitbox to the attacks and shots groups.
 
-        This method uses simple trig calculations to change the velocity (while keeping magnitude) of an attack.
-        Those calculations are also used to determine where the endpoint of an attack line should be drawn. Finally,
-        it draws the calculated line on the attack surface.
+        Takes the same arguments as instantiation. The hitbox is reused.
         """
-        x_factor = math.sin(self.angle)
-        y_factor = math.cos(self.angle)
-        self.velocity[0] = self.velocity[1] * x_factor * 1.1
-        self.velocity[1] *= y_factor * 1.1
-        self.line_terminus[0] += (x_factor * self.line_length)
-        self.line_terminus[1] += (y_factor * self.line_length)
+        self.launch(attack_spec(type(self), offset, angle, velocity, damage, line_length, line_width, color), source)
 
-        pygame.draw.line(self.image, self.color, self.line_origin, self.line_terminus, self.line_width)
+    @classmethod
+    def from_spec(cls, spec, source):
+        """
+        Create an attack from a compiled AttackSpec instead of separate arguments.
+
+        The separate arguments of instantiation are not needed, so the attack is set up with prepare alone.
+        :param spec: AttackSpec, e.g. from the definitions tables
+        :param source: Position the attack is fired from, as for instantiation
+        :return: The new attack, already added to the attacks and shots groups
+        """
+        attack = cls.__new__(cls)
+        attack.prepare()
+        attack.launch(spec, source)
+        return attack
+
+    def launch(self, spec, source):
+        """
+        (Re)initialize the attack from a compiled AttackSpec and add it and its hitbox to the attacks and shots groups.
+
+        The image, velocity vector and hitbox geometry were all worked out when the spec was compiled, so this
+        only places the attack and its hitbox. The hitbox and the position and velocity vectors are reused.
+        :param spec: AttackSpec, from attack_spec or the definitions tables
+        :param source: Position the attack is fired from
+        """
+        x, y = source[0] - 15, source[1] - 7
+        self.place(x, y)
+        self.angle, self.color, self.line_length, self.line_width, self.line_origin = spec.shape
+        self.image = spec.image
+        self.line_terminus = spec.line_terminus
+        self.velocity.update(spec.velocity)
+        self.damage = spec.damage
+        width, height, x_offset, y_offset = spec.hitbox
+        if self.hitbox is None:
+            self.hitbox = Hitbox(width, height, x + x_offset, y + y_offset, self.damage)
+            self.attach(self.hitbox)
+        else:
+            self.hitbox.reset(width, height, x + x_offset, y + y_offset, self.damage)
+            self.hitbox.offset.update(x_offset, y_offset)
+        self.released = False
+        attacks.add(self)
+        self.hitbox.add(shot_groups)
 
     def update(self):
         """
-        Update the position of the sprite, then draw it on screen. Determine if attack has run off the screen.
+        Update the position of the sprite. Kill it if its hitbox was hit.
 
-        Again, position is used here to avoid integer rounding. Hitboxes are updated at the same time to
-        avoid disconnects between the hitbox and the image of the sprite on screen. The sprite is killed
-        (removed from all sprite groups, thus garbage collected) if it runs far enough off screen. It is
-        also killed if its corresponding hitbox is not in the shots sprite group due to a collision with
-        the player ship.
+        The position vector is moved in place, and the hitbox is placed at its offset from it, so the hitbox
+        never drifts from the image of the sprite on screen. The sprite is killed (removed from all sprite
+        groups and returned to the attack pool) if its corresponding hitbox is not in the shots sprite group
+        due to a collision with the player ship. Attacks that leave the screen are retired by culling.Culler.
         """
-        self.position = [self.position[0] + self.velocity[0],
-                         self.position[1] + self.velocity[1]]
-        self.rect.center = self.position[:]
-        self.hitbox.position = [self.hitbox.position[0] + self.velocity[0],
-                                self.hitbox.position[1] + self.velocity[1]]
-        self.hitbox.rect.center = self.hitbox.position[:]
-        screen.blit(self.image, self.rect.center)
+        self.move(self.velocity)
+        if self.hitbox not in shots:
+            self.kill()
+
+    def placed_mask(self):
+        """:return: Pixel mask of the attack line and the screen position it is drawn at"""
+        return masks.get(self.image), self.rect.center
 
-        if self.rect.center[1] > 1000 or self.hitbox not in shots:
-            self.kill()  # removes attack from all sprite groups (inherited from superclass)
+    def kill(self):
+        """
+        Remove the attack and its hitbox from all sprite groups and return them to the attack pool.
+        """
+        super().kill()
+        self.hitbox.kill()
+        if not self.released:
+            self.released = True
+            attack_pool.release(self)
 
 
 class AngledAttack(BasicAttack):
-    """Simple subclass of BasicAttack. Hitboxes were recalibrated to line up with attack image."""
+    """Simple subclass of BasicAttack. Its hitboxes, in the definitions file, line up with the angled image."""
 
-    def __init__(self, *args):
-        super().__init__(*args)
-        self.hitbox.kill()  # Hitbox was added to shots group at init, must kill to avoid errors
-        if self.angle > 0:
-            self.hitbox = Hitbox(3, 6, self.rect.center[0] + 19, self.rect.center[1] + 22, self.damage)
+
+class PowerLaser(BasicAttack):
+    """Subclass of BasicAttack. Only hitbox calibration, in the definitions file, changed."""
+
+
+class ProjectilePool(object):
+    """
+    Pool of attack objects, kept per attack class, that are reused across firings.
+
+    Enemies fire through the pool instead of instantiating attacks directly. A killed attack is returned
+    here together with its hitbox, and the next firing of that class resets it in place, so steady-state
+    combat does not allocate new sprites or surfaces.
+
+    Methods defined:
+    """
+
+    def __init__(self):
+        self.free = {}
+        self.created = 0
+        self.reused = 0
+
+    def fire(self, attack_class, *args, **kwargs):
+        """
+        Fire an attack of the given class, reusing a released one when available.
+
+        :param attack_class: BasicAttack or a subclass
+        :param args: Arguments of the attack class, see BasicAttack
+        :return: The attack, already added to the attacks and shots groups
+        """
+        free = self.free.get(attack_class)
+        if free:
+            attack = free.pop()
+            attack.reset(*args, **kwargs)
+            self.reused += 1
         else:
-            self.hitbox = Hitbox(3, 6, self.rect.center[0] + 10, self.rect.center[1] + 22, self.damage)
-        shots.add(self.hitbox)
+            attack = attack_class(*args, **kwargs)
+            self.created += 1
+        return attack
 
+    def launch(self, spec, source):
+        """
+        Fire a compiled attack, reusing a released one of its class when available.
 
-class PowerLaser(BasicAttack):
-    """Subclass of BasicAttack. Only hitbox calibration changed."""
+        :param spec: AttackSpec, e.g. from the definitions tables
+        :param source: Position the attack is fired from
+        :return: The attack, already added to the attacks and shots groups
+        """
+        free = self.free.get(spec.attack_class)
+        if free:
+            attack = free.pop()
+            attack.launch(spec, source)
+            self.reused += 1
+        else:
+            attack = spec.attack_class.from_spec(spec, source)
+            self.created += 1
+        return attack
 
-    def __init__(self, *args):
-        super().__init__(*args)
-        self.hitbox.kill()
-        self.hitbox = Hitbox(2, 17, self.rect.center[0] + 16, self.rect.center[1] + 28, self.damage)
-        shots.add(self.hitbox)
+    def release(self, attack):
+        """Return a killed attack to the pool."""
+        self.free.setdefault(type(attack), []).append(attack)
 
+    def clear(self):
+        """Drop every pooled attack."""
+        self.free.clear()
 
-class BasicEnemy(pygame.sprite.Sprite):
+    def stats(self):
+        """
+        :return: dict with the number of attacks created, reused, waiting in the pool and live on screen
+        """
+        return {'created': self.created, 'reused': self.reused,
+                'free': sum(len(free) for free in self.free.values()), 'live': len(attacks)}
+
+
+class BasicEnemy(pygame.sprite.Sprite, Kinematic):
     """
     Super class defining a functioning enemy.
 
-    This class contains everything necessary to instantiate a standard enemy on the game screen. It
-    is meant to be subclassed by overwritting the image, mass, cooldowns, lifetimes, and explosion_offset
-    attributes, as well as the attack method.
+    This class contains everything necessary to instantiate a standard enemy on the game screen. The
+    image, mass, cooldowns, lifetime, explosion_offset, collision rect and attacks of each type of enemy
+    come from its EnemySpec in the definitions tables, so a new type of enemy is a new entry in the
+    definitions file, spawned with BasicEnemy(kind), rather than a subclass.
     Behaviorally, instances of this class spawn just above the screen at a random horizontal location,
     slowly moving down until they are two image-widths on screen. They then slow down and attack at
     random intervals until their lifetime (in frames drawn) expires, at which point they accelerate and
     move off the bottom of the screen. Subclasses of enemies with specific movements should overwrite
-    the intro and outro methods as well.
+    the intro and outro methods as well. The kind class attribute names the definition used when no kind
+    is given.
 
     Methods defined:
     """
 
-    def __init__(self):
+    kind = 'basic'
+
+    def __init__(self, kind=None):
         """
-        Instantiate a basic enemy using the first_enemy image
+        Instantiate an enemy from its definition. Defaults to the basic enemy, using the first_enemy image
 
         See instantiation of the Ship class for explanations of many of these attributes. Others include:
         position: a random choice horizontally, and above the screen a number of pixels equal to the images height.
@@ -182,32 +341,39 @@ class BasicEnemy(pygame.sprite.Sprite):
         lifetime: number of frames the enemy advances and attacks as normal.
         explosion_offset: value to be passed to DrawExplosion instances to calibrate placement
             of explosion animation.
+        spec: the EnemySpec this enemy was built from.
 
         Note: This class does NOT use separate hitbox instances. By default, the entire enemy image is
         used for collision detection. You must either redefine the image's rect attribute (for simple cases)
-        or define a series of hitbox instances if the entire image is unsuitable for collisions.
+        or define a series of hitbox instances if the entire image is unsuitable for collisions. A definition
+        with a rect uses that rect instead of the image's.
+
+        :param str kind: Name of the enemy type in the definitions tables. The class's kind if None
         """
         super().__init__()
-        self.image = pygame.image.load('images\\first_enemy.png').convert()
-        self.image.set_colorkey((0, 0, 0))
+        if kind is not None:
+            self.kind = kind
+        spec = self.spec = definitions.enemy_spec(self.kind)
+        self.image = images.get(spec.image_name)
         self.rect = self.image.get_rect()
-        self.position = (random.randint(10, 790), -(self.image.get_height()))
-        self.rect.center = self.position[:]
-        self.velocity = [0, .5]
-        self.mass = 1
+        self.place(rng.placement.randint(10, 790), -(self.image.get_height()))
+        if spec.rect is not None:
+            self.rect = pygame.Rect(spec.rect)  # smaller rectangle to avoid excessive black-space 'collisions'
+        self.velocity = Vector2(0, .5)
+        self.mass = spec.mass
         self.introduction = True
         self.current_cooldown = 1000
-        self.attack_cooldown = 50
-        self.lifetime = 310
-        self.explosion_offset = [15, 12]
+        self.attack_cooldown = spec.attack_cooldown
+        self.lifetime = spec.lifetime
+        self.explosion_offset = list(spec.explosion_offset)
         enemies.add(self)
 
     def intro(self):
         """
         Move the enemy forward until it is just inside the screen. Allow attacks when introduction is over.
         """
-        self.update_position((0, 1))
-        if self.rect.center[1] > (self.image.get_height() * 1.8):
+        self.move((0, 1))
+        if self.rect.centery > (self.image.get_height() * 1.8):
             self.introduction = False
             self.current_cooldown = 0
 
@@ -221,12 +387,13 @@ class BasicEnemy(pygame.sprite.Sprite):
 
     def update(self):
         """
-        Countdown the lifetime of the enemy, update its position, and make attacks.
+        Countdown the lifetime of the enemy and update its position.
 
         This method counts down the main lifetime of an enemy ship and updates its position. If the
         ship is still in its introduction sequence, most of the method is skipped. In main phase, the
-        ship calls attack every frame and has its position updated via the update_position method.
-        If the ship moves off the bottom of the screen, it is deleted.
+        ship is moved by its velocity. Its attacks are decided by a FireControl together with those of
+        every other enemy.
+        Once the ship has moved off the bottom of the screen, it is retired by culling.Culler.
 
         :return: None if the ship is still in its introduction
         """
@@ -236,119 +403,238 @@ class BasicEnemy(pygame.sprite.Sprite):
             return None
         if self.lifetime < 0:
             self.outro()
-        self.update_position(self.velocity)
-        if self.rect.center[1] > size[1] + (self.image.get_height() * 2):
-            self.kill()  # Kill the enemy sprite if it runs off the bottom of the screen
-        self.attack()
+        self.move(self.velocity)
 
-    def update_position(self, velocity):
-        """
-        Update the position of the image and copy that float to the image's rect attribute.
-        :param list velocity: Integer or float that defines movement in pixels/frame
-        """
-        self.position = [(self.position[0] + velocity[0]), (self.position[1] + velocity[1])]
-        self.rect.center = self.position[:]
+    def placed_mask(self):
+        """:return: Pixel mask of the enemy image and the screen position it is drawn at by its sprite group"""
+        return masks.get(self.image), self.rect.topleft
 
-    def attack(self):
+    def fire(self, roll):
         """
-        Reduce the attack cooldown and try to fire a shot. If fired, restart the cooldown.
+        Fire the attack pattern selected by a roll, if any, and restart the cooldown at its cooldown.
+
+        :param int roll: Attack roll, in the roll range of the enemy's definition
+        :return: True if a pattern was fired
         """
-        self.current_cooldown -= 1
-        if random.randint(0, 100) > 99 and self.current_cooldown < 0:
-            BasicAttack(self.rect.center, [15, 14], 0, 7, damage=1, line_length=15, line_width=1)
-            self.current_cooldown = self.attack_cooldown
+        for pattern in self.spec.patterns:
+            if pattern.low <= roll <= pattern.high:
+                x, y = self.rect.center
+                for attack, muzzle in pattern.volley:
+                    projectiles.launch(attack, (x + muzzle[0], y + muzzle[1]))
+                self.current_cooldown = pattern.cooldown
+                return True
+        return False
 
 
 class Fighter(BasicEnemy):
     """
-    Subclass of BasicEnemy with altered attacks and a custom hitbox.
+    BasicEnemy of the fighter kind, kept as a class for existing code and tests.
+
+    Its definition alters the hitboxes and attacks of the basic enemy. Number of attacks increased from
+    one to three, with both angled and straight attacks: either two angled shots on regular cooldown or one
+    powerful shot on shorter cooldown. The collision rect was reduced from the full image size due to large
+    unfilled areas on the source image, and mass increased to do more collision damage.
+    """
+
+    kind = 'fighter'
 
-    This class alters the hitboxes and attacks of the BasicEnemy class. Number of attacks increased from
-    one to three, with both angled and straight attacks. The hitbox size was reduced from the full image
-    size due to large unfilled areas on the source image.
 
-    Methods overwritten:
-        1. attack
+class FireControl(object):
     """
+    Batched attack decisions for a group of enemies.
 
-    def __init__(self):
+    Every enemy past its introduction counts its cooldown down by one each frame, as in BasicEnemy.attack.
+    The enemies that are off cooldown then all get their attack roll from a single numpy draw of uniform
+    numbers, one per enemy. A uniform u stands for the roll low + int(u * span) of the enemy's roll range, so
+    each roll, and so each attack pattern, keeps the probability it has with a random.randint roll. Only draws
+    at or above the enemy's fire floor can select a pattern; those are picked out in one vectorized comparison,
+    and only their enemies go on to find their pattern and fire.
+
+    Methods defined:
+    """
+
+    def __init__(self, seed=None):
         """
-        Rect attribute redefined as smaller than image. Mass increased to do more collision damage.
+        :param int seed: Seed of the numpy generator the rolls are drawn from
         """
-        super().__init__()
-        self.image = pygame.image.load('images\\second_enemy.png').convert()
-        self.image.set_colorkey((0, 0, 0))
-        self.rect = pygame.Rect(2, 0, 27, 31)  # smaller rectangle to avoid excessive black-space 'collisions'
-        self.mass = 2
+        self.generator = numpy.random.default_rng(seed)
+        self.drawn = 0
+        self.fired = 0
 
-    def attack(self):
+    def update(self, group=None):
         """
-        Similar to attack method of super class. Fires either two angled shots on regular cooldown or one powerful
-        shot on shorter cooldown.
-        """
-        self.current_cooldown -= 1
-        attack_select = random.randint(1, 1000)
-        if 965 <= attack_select <= 985 and self.current_cooldown < 0:
-            AngledAttack((self.rect.center[0] + 9, self.rect.center[1] - 4), [15, 14], math.radians(30), 6, 1, 15, 1)
-            AngledAttack((self.rect.center[0] - 3, self.rect.center[1] - 4), [15, 14], -math.radians(30), 6, 1, 15, 1)
-            self.current_cooldown = self.attack_cooldown
+        Count down the cooldowns of a group of enemies and fire the attacks of those whose rolls succeed.
 
-        if 986 <= attack_select <= 1000 and self.current_cooldown < 0:
-            PowerLaser((self.rect.center[0] + 3, self.rect.center[1] - 8), [15, 14], 0, 5, 2, 23, 3, BLUE)
-            self.current_cooldown = self.attack_cooldown - 20
+        :param group: Iterable of enemies, in the order their attacks are fired. Defaults to the enemies group
+        :return: Number of enemies that fired
+        """
+        ready = []
+        for enemy in enemies if group is None else group:
+            if not enemy.introduction:
+                enemy.current_cooldown -= 1
+                if enemy.current_cooldown < 0:
+                    ready.append(enemy)
+        if not ready:
+            return 0
+        count = len(ready)
+        draws = self.generator.random(count)
+        floors = numpy.fromiter([enemy.spec.fire_floor for enemy in ready], float, count)
+        fired = 0
+        for index in numpy.flatnonzero(draws >= floors).tolist():
+            enemy = ready[index]
+            spec = enemy.spec
+            if enemy.fire(spec.roll[0] + int(draws[index] * spec.roll_span)):
+                fired += 1
+        self.drawn += count
+        self.fired += fired
+        return fired
 
 
 class DrawExplosions(object):
     """
-    Animation class for small-scale explosion instances drawn directly on screen.
+    Animation record for a small-scale explosion.
 
-    This class uses a sliding 'window' frame over a larger image to simulate an explosion centered on an
-    enemy that has just collided with the player's ship. On instantiation, the entire explosion image array
-    is loaded. A small frame surface is defined and centered over the first explosion image. The 'window' frame
-    is then moved across the array every in-game loop frame, resulting in a 20-frame explosion animation.
+    The 300x320 explosion image holds 20 segments of an explosion in 5 rows of 4. The first instance
+    slices that image into an immutable tuple of 40x40 frame surfaces shared by every explosion, so an
+    explosion itself is only a screen position and an index into that tuple. Records are meant to be
+    created and recycled by an ExplosionPool rather than instantiated for every collision.
 
     Methods defined:
     """
 
+    __slots__ = ('position', 'frame')
+    frames = None  # tuple of sliced animation frames, shared by all explosions
+
     def __init__(self, position):
         """
         Attributes defined here:
-        explosion_array: 300x320 image of 20 segments of an explosion
-        destruction timer: Counter that determines when a vertical frame shift needs to occur
-        frame_offset: Calibration to get the first frame over the initial explosion image
+        frame: Index into the frames tuple of the next animation frame to draw
         :param list position: Position on screen where the explosion is to be placed
         """
         super().__init__()
+        if DrawExplosions.frames is None:
+            self.slice_frames()
         self.position = position
-        self.explosion_array = pygame.image.load('images\\enemy_explosion.png').convert()
-        self.explosion_array.set_colorkey(BLACK)
-        self.frame = pygame.Surface((40, 40))
-        self.frame.set_colorkey(BLACK)
-        self.destruction_timer = 20
-        self.frame_offset = [-20, -10]  # sets the viewing frame over the first explosion in the array
-        self.draw()
+        self.frame = 0
 
-    def draw(self):
+    @classmethod
+    def slice_frames(cls):
         """
-        Draw the explosion image to the window frame, then draw the window to the main screen. Advance the frame.
+        Cut the explosion image into its 20 animation frames, in playing order, and cache them on the class.
+
+        Each frame is a 40x40 window starting 20 pixels into an 80 pixel column and 10 pixels into a 60 pixel row.
+        :return: tuple of frame surfaces
         """
-        self.destruction_timer -= 1
-        self.frame.blit(self.explosion_array, self.frame_offset)
-        screen.blit(self.frame, self.position)
-        self.calculate_frame_offset()
+        explosion_array = images.get('enemy_explosion.png')
+        frames = []
+        for row in range(5):
+            for column in range(4):
+                frame = explosion_array.subsurface((20 + column * 80, 10 + row * 60, 40, 40)).copy()
+                frame.set_colorkey(BLACK)
+                frames.append(frame)
+        cls.frames = tuple(frames)
+        return cls.frames
+
+
+class ExplosionPool(object):
+    """
+    Pool of DrawExplosions records.
+
+    Active explosions are kept in a single list that is compacted in place as animations finish, and
+    finished records are kept on a free list to be reused by the next collision. Drawing every live
+    explosion therefore costs one small blit each and allocates nothing once the pool has warmed up.
 
-    def calculate_frame_offset(self):
+    Methods defined:
+    """
+
+    def __init__(self):
+        self.active = []
+        self.free = []
+
+    def spawn(self, position):
         """
-        Translate the window frame 80 pixels until frame 4, then reset to the left and move the frame down 1 row.
+        Start an explosion animation at position, reusing a finished record when one is available.
+
+        :param position: Position on screen where the explosion is to be placed
+        :return: The DrawExplosions record that was started
         """
-        self.frame_offset[0] -= 80
-        if self.frame_offset[0] < -320:
-            self.frame_offset[0] = -20
-        if not self.destruction_timer % 4:
-            self.frame_offset[1] -= 60
+        if self.free:
+            explosion = self.free.pop()
+            explosion.position = position
+            explosion.frame = 0
+        else:
+            explosion = DrawExplosions(position)
+        self.active.append(explosion)
+        return explosion
+
+    def submit(self, queue):
+        """
+        Queue the current frame of every active explosion on the explosion layer of a rendering.RenderQueue.
+
+        This does not advance the animations, so a frame can be drawn any number of times; advance moves them
+        on once per simulation step.
+        :param queue: RenderQueue of the frame
+        """
+        frames = DrawExplosions.frames
+        queue.extend(EXPLOSIONS, [(frames[explosion.frame], explosion.position) for explosion in self.active])
+
+    def advance(self):
+        """Move every active explosion to its next animation frame, moving finished ones to the free list."""
+        active = self.active
+        if not active:
+            return
+        last = len(DrawExplosions.frames) - 1
+        keep = 0
+        for explosion in active:
+            if explosion.frame < last:
+                explosion.frame += 1
+                active[keep] = explosion
+                keep += 1
+            else:
+                self.free.append(explosion)
+        del active[keep:]
+
+    def clear(self):
+        """Stop every active explosion and return the records to the free list."""
+        self.free.extend(self.active)
+        del self.active[:]
+
+    def __len__(self):
+        return len(self.active)
+
+
+def set_projectile_engine(engine=None):
+    """
+    Choose the projectile engine that enemies fire their attacks through.
+
+    :param engine: Object with a fire(attack_class, *args) method, such as a ProjectileArrays instance.
+        The attack_pool of sprites is used if None
+    :return: The engine now in use
+    """
+    global projectiles
+    projectiles = attack_pool if engine is None else engine
+    return projectiles
+
+
+def set_shot_index(index=None):
+    """
+    Choose a sprite group that every attack hitbox joins together with the shots group, such as a SpatialHash.
+
+    Hitboxes leave it again when they are killed, like any sprite group.
+    :param index: pygame sprite group, or None for the shots group alone
+    :return: tuple of the groups attack hitboxes are added to
+    """
+    global shot_groups
+    shot_groups = (shots,) if index is None else (shots, index)
+    return shot_groups
 
 
 # sprite group creation for collisions and updating in main loop
 enemies = pygame.sprite.Group()
 shots = pygame.sprite.Group()
+shot_groups = (shots,)  # groups every attack hitbox is added to, see set_shot_index
 attacks = pygame.sprite.Group()
+explosions = ExplosionPool()
+attack_pool = ProjectilePool()
+projectiles = attack_pool  # engine used by enemies to fire, see set_projectile_engine
+attack_shapes = AssetCache(draw_attack_shape, max_size=64)
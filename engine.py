@@ -0,0 +1,131 @@
+"""
+Classes exported:
+1. Game: Engine object that builds the display, assets and game state on demand and times the startup.
+"""
+
+import time
+
+
+class Game(object):
+    """
+    Explicitly initialized game.
+
+    Importing the game modules opens no window and loads nothing. A Game does all of that in start, in four
+    timed phases: importing the game modules, initializing pygame and opening the display, preloading every
+    image, font, pre-rendered surface and compiled definition table the game uses, and building the game
+    state (simulation, renderer and HUD). The first frame is timed as well once the game loop reports it with
+    frame_done, so cold start can be measured with startup_report and kept short.
+
+    Methods defined:
+    """
+
+    images = ('ship1.png', 'first_enemy.png', 'second_enemy.png', 'enemy_explosion.png')  # preloaded by start
+
+    def __init__(self, seed=None, verbose=False, dirty_rects=False, profiler=None, pixel_masks=False):
+        """
+        Attributes defined here:
+        screen, simulation, renderer, hud: Display surface and game objects, None until start is called
+        startup: dict of startup phase name to seconds, in the order the phases ran
+
+        :param int seed: Master seed for the simulation. A random seed is used if None
+        :param bool verbose: Print hits and collisions as they happen
+        :param bool dirty_rects: Clear and update the display by dirty rectangles instead of whole frames
+        :param profiler: FrameProfiler to time the phases of every frame with. Phases are not timed if None
+        :param bool pixel_masks: Confirm collisions with pixel masks, which are then built with the other assets
+        """
+        self.seed = seed
+        self.verbose = verbose
+        self.dirty_rects = dirty_rects
+        self.profiler = profiler
+        self.pixel_masks = pixel_masks
+        self.screen = self.simulation = self.renderer = self.hud = None
+        self.startup = {}
+        self.last = None
+
+    def lap(self, phase):
+        """Charge the time since the previous startup phase to a phase."""
+        now = time.perf_counter()
+        self.startup[phase] = now - self.last
+        self.last = now
+
+    def start(self):
+        """
+        Import the game modules, open the display, preload the assets and build the game state.
+
+        :return: The game itself, so it can be created and started in one expression
+        """
+        self.last = time.perf_counter()
+        import variables
+        from assets import images, fonts, masks
+        import definitions
+        from ship import Ship
+        from enemies import DrawExplosions
+        from simulation import Simulation
+        from rendering import Renderer
+        from hud import HUD, HUD_FONT
+        self.lap('import')
+
+        variables.pygame.init()
+        self.screen = variables.init_display()
+        self.lap('display')
+
+        images.preload(*self.images)
+        fonts.preload(HUD_FONT)
+        definitions.tables.preload(definitions.DEFINITIONS)
+        if self.pixel_masks:
+            tables = definitions.tables.get(definitions.DEFINITIONS)
+            masks.preload(images.get('ship1.png'), *[images.get(spec.image_name) for spec in tables.enemies.values()])
+            masks.preload(*[spec.image for spec in tables.attacks.values()])
+        if Ship.shield_levels is None:
+            Ship.render_shield_levels()
+        if DrawExplosions.frames is None:
+            DrawExplosions.slice_frames()
+        self.lap('assets')
+
+        self.simulation = Simulation(self.seed, verbose=self.verbose, profiler=self.profiler,
+                                     pixel_masks=self.pixel_masks)
+        self.renderer = Renderer(self.screen, self.dirty_rects)
+        self.hud = HUD()
+        self.lap('state')
+        return self
+
+    def stop(self):
+        """
+        Quit pygame and drop everything that was tied to its display and font module.
+
+        pygame.quit invalidates every loaded font, and the cached images were converted to the pixel format of the
+        display that is being closed. So the shared fonts, images and masks caches are cleared, together with every
+        surface built from them: the shield images of the Ship class, the explosion frames, the attack images of
+        the attack_shapes cache and the compiled definition tables holding them. A later Game then builds all of
+        them again for its own display.
+        """
+        import variables
+        import definitions
+        import enemies
+        from assets import images, fonts, masks
+        from ship import Ship
+
+        variables.pygame.quit()
+        variables.screen = None  # the display surface died with the display
+        fonts.clear()
+        images.clear()
+        masks.clear()
+        Ship.shield_levels = None
+        enemies.DrawExplosions.frames = None
+        enemies.attack_shapes.clear()
+        definitions.tables.clear()
+
+    def frame_done(self):
+        """Record the time of the first frame. Called by the game loop after every frame; later calls are ignored."""
+        if 'first_frame' not in self.startup:
+            self.lap('first_frame')
+
+    def startup_report(self):
+        """
+        :return: dict of startup phase name to milliseconds: import, display, assets, state, init (display, assets
+            and state together), first_frame once a frame was run, and total
+        """
+        report = {phase: seconds * 1000 for phase, seconds in self.startup.items()}
+        report['init'] = sum(report.get(phase, 0.0) for phase in ('display', 'assets', 'state'))
+        report['total'] = sum(self.startup.values()) * 1000
+        return report
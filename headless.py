@@ -0,0 +1,104 @@
+"""
+Run the game without a window, as fast as possible.
+
+Functions exported:
+1. enable: Select the dummy video driver. Must be called before the variables module is imported.
+2. run: Play a number of frames headlessly and report the simulated frames per second.
+
+Usage: python headless.py [--frames N] [--seed N] [--no-render] [--script FILE] [--profile FILE] [--record FILE]
+                          [--dirty-rects] [--pixel-masks]
+The optional script file holds one scripted event per line as: frame KEYDOWN|KEYUP key_name, e.g. "30 KEYDOWN left".
+"""
+
+import argparse
+import os
+import sys
+
+
+def enable():
+    """
+    Select the dummy SDL video driver so the display is an offscreen surface and no window is opened.
+
+    The display is opened by engine.Game.start, so this has no effect on a game that has already started.
+    """
+    os.environ['STARSECTOR_HEADLESS'] = '1'
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+
+def load_script(path):
+    """
+    Read a scripted input file into a ScriptedInput.
+
+    :param str path: Path of a file with lines of 'frame KEYDOWN|KEYUP key_name'. Blank lines and '#' comments are skipped
+    :return: ScriptedInput instance
+    """
+    from variables import pygame
+    from inputs import ScriptedInput
+
+    scripted = ScriptedInput()
+    with open(path) as script:
+        for line in script:
+            line = line.split('#')[0].strip()
+            if not line:
+                continue
+            frame, event_type, key_name = line.split()
+            scripted.add(int(frame), (getattr(pygame, event_type), pygame.key.key_code(key_name)))
+    return scripted
+
+
+def run(frames=3600, inputs=None, render=True, seed=None, profile=None, dirty_rects=False, record=None,
+        pixel_masks=False):
+    """
+    Run the main game loop headlessly for a number of frames, without a frame cap.
+
+    :param int frames: Number of frames to simulate. The run ends early if the ship is destroyed
+    :param inputs: Input source for the game loop, usually a ScriptedInput. No input is given if None
+    :param bool render: Draw to the offscreen screen surface as well as updating the game
+    :param int seed: Master seed for the game's random streams. The same seed and inputs give the same game
+    :param str profile: Write the per-phase frame timings to this .csv or .ndjson file
+    :param bool dirty_rects: Clear and measure the display update by dirty rectangles instead of whole frames
+    :param str record: Save a replay of the run to this file, see the replay module
+    :param bool pixel_masks: Confirm collisions with the ship by pixel mask overlap
+    :return: dict report from main.main, including frames per second
+    """
+    enable()
+    from inputs import ScriptedInput
+    import main
+
+    if inputs is None:
+        inputs = ScriptedInput()
+    return main.main(inputs=inputs, frames=frames, headless=True, render=render, seed=seed, profile=profile,
+                     dirty_rects=dirty_rects, record=record, pixel_masks=pixel_masks)
+
+
+def command_line(argv=None):
+    """Parse command line arguments, run headlessly and print the report."""
+    parser = argparse.ArgumentParser(description='Run Escape from Starsector headlessly and report throughput.')
+    parser.add_argument('--frames', type=int, default=3600, help='number of frames to simulate')
+    parser.add_argument('--seed', type=int, help='master seed for the random streams, random if not given')
+    parser.add_argument('--no-render', dest='render', action='store_false', help='skip drawing to the offscreen surface')
+    parser.add_argument('--profile', help='write per-phase frame timings to this .csv or .ndjson file')
+    parser.add_argument('--dirty-rects', action='store_true', help='clear and update by dirty rectangles')
+    parser.add_argument('--pixel-masks', action='store_true', help='confirm collisions by pixel mask overlap')
+    parser.add_argument('--record', help='save a replay of the run to this file')
+    parser.add_argument('--script', help='scripted input file, one "frame KEYDOWN|KEYUP key_name" event per line')
+    args = parser.parse_args(argv)
+
+    enable()
+    inputs = load_script(args.script) if args.script else None
+    report = run(args.frames, inputs, args.render, args.seed, args.profile, args.dirty_rects, args.record,
+                 args.pixel_masks)
+    print('{frames} frames in {seconds:.3f} s: {fps:.1f} simulated frames per second'.format(**report))
+    print('Seed {seed}, final state {state}'.format(**report))
+    print('Startup ' + ', '.join('{0} {1:.1f} ms'.format(phase, ms) for phase, ms in report['startup'].items()))
+    for phase, values in report['phases'].items():
+        print('{0:<11} p50 {p50:7.3f}  p95 {p95:7.3f}  p99 {p99:7.3f} ms'.format(phase, **values))
+    if args.render:
+        print('Display update: {0:.0f} px per frame on average'.format(report['dirty_px']))
+    if report['destroyed']:
+        print('Ship destroyed on frame', report['frames'])
+    return report
+
+
+if __name__ == '__main__':
+    command_line(sys.argv[1:])
@@ -0,0 +1,102 @@
+"""
+Classes exported:
+1. HUD: Energy, shield level and overdrive readout at the bottom of the screen, rendered only when it changes.
+"""
+
+from variables import *
+from assets import AssetCache, fonts
+
+HUD_FONT = ('Calibri', 18, True, False)  # name, size, bold, italic
+
+
+class HUD(object):
+    """
+    Player status readout.
+
+    Each piece of text is rendered once per displayed value and kept in a cache of text surfaces, and the
+    three pieces are composited onto a single transparent strip. The strip is only rebuilt when one of the
+    displayed values changes, which happens a few times per second at most, so drawing the HUD is normally
+    a single blit.
+
+    Methods defined:
+    """
+
+    # x position of each piece of text on the strip
+    columns = (18, 130, 315)
+
+    def __init__(self, position=(0, 570), width=size[0], font=HUD_FONT, color=WHITE):
+        """
+        Attributes defined here:
+        texts: AssetCache of rendered text surfaces, keyed by the text
+        values: Text currently on the strip, None before the first draw
+        strip: Transparent surface holding the composited HUD
+        renders: Number of times the strip was rebuilt
+        area: Part of the strip covered by text, the only part that is drawn
+
+        :param position: Top left corner of the HUD on the screen
+        :param int width: Width of the HUD strip
+        :param tuple font: (name, size, bold, italic) key of the font in the fonts cache
+        :param color: RGB tuple of the text
+        """
+        self.position = position
+        self.font = fonts.get(font)
+        self.color = color
+        self.texts = AssetCache(self.render_text, max_size=64)
+        self.values = None
+        self.strip = pygame.Surface((width, self.font.get_linesize()), pygame.SRCALPHA)
+        self.renders = 0
+        self.area = pygame.Rect(0, 0, 0, 0)
+
+    @staticmethod
+    def format(energy, shield, boost):
+        """
+        Turn the ship status into the text shown on the HUD.
+
+        :arg energy: integer from ship.energy. Changed to 'MAX' if at or above 100
+        :arg shield: integer from ship.shield_level. Changed to 'MAX' if at or above 5
+        :arg boost: integer from ship.boost. A value of 1 means no boost, any other value
+            is assumed to be a boost multiplier. This must be changed if future enemy attacks
+            have the possibility of slowing the player's ship.
+        :return: tuple of the energy, shield level and overdrive text
+        """
+        if shield >= 5:
+            shield = 'MAX'
+        if energy >= 100:
+            energy = 'MAX'
+        if boost == 1:
+            boost = 'Disabled'
+        else:
+            boost = 'Enabled'
+        return ('Energy: {0}'.format(energy), 'Shield Level: {0}'.format(shield),
+                'Overdrive:  {0}'.format(boost))
+
+    def render_text(self, text):
+        """:return: Antialiased text surface with per-pixel alpha. Loader of the texts cache"""
+        return self.font.render(text, True, self.color)
+
+    def render(self, values):
+        """
+        Rebuild the strip from the cached text surfaces.
+
+        The pieces of text never overlap, so each is copied onto the cleared strip with BLEND_RGBA_MAX, which
+        keeps its colors and alpha exactly as rendered.
+        """
+        self.strip.fill((0, 0, 0, 0))
+        self.area = pygame.Rect(self.columns[0], 0, 0, 0)
+        for text, column in zip(values, self.columns):
+            drawn = self.strip.blit(self.texts.get(text), (column, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.area.union_ip(drawn)
+        self.values = values
+        self.renders += 1
+
+    def draw(self, surface, energy, shield, boost):
+        """
+        Draw the HUD, rebuilding the strip first if the displayed values changed.
+
+        :param surface: Surface to draw on, normally the main screen
+        :return: pygame.Rect of the area drawn
+        """
+        values = self.format(energy, shield, boost)
+        if values != self.values:
+            self.render(values)
+        return surface.blit(self.strip, (self.position[0] + self.area.x, self.position[1]), self.area)
@@ -0,0 +1,119 @@
+"""
+Classes exported:
+1. KeyboardInput: Input source that reads the real pygame event queue.
+2. ScriptedInput: Input source that replays a fixed script of key events by frame number.
+3. RandomWalkPilot: Input source that flies the ship in a seeded random walk, for batches of unattended games.
+"""
+
+import random
+from variables import *
+
+
+class KeyboardInput(object):
+    """Input source for normal play. Returns whatever is waiting on the pygame event queue."""
+
+    def get(self, frame):
+        """
+        :param int frame: Current frame number of the game loop. Unused, the event queue is live input
+        :return: list of pygame events to be handled this frame
+        """
+        return pygame.event.get()
+
+
+class ScriptedInput(object):
+    """
+    Input source that feeds a pre-written script of events to the game loop.
+
+    This allows the game to be driven without a keyboard, e.g. in headless runs on a server or in tests.
+    The script maps a frame number to the events handled on that frame. Events are built once when the
+    script is loaded, so reading the script costs a single dictionary lookup per frame.
+
+    Methods defined:
+    """
+
+    def __init__(self, script=None):
+        """
+        :param script: dict of frame number to a list of events, or an iterable of (frame, event) pairs.
+            An event is either a pygame event or a (type, key) tuple such as (pygame.KEYDOWN, pygame.K_LEFT).
+        """
+        self.script = {}
+        if script is None:
+            script = {}
+        if isinstance(script, dict):
+            script = ((frame, event) for frame, events in script.items() for event in events)
+        for frame, event in script:
+            self.add(frame, event)
+
+    def add(self, frame, event):
+        """
+        Append an event to the script on the given frame.
+
+        :param int frame: Frame number of the game loop on which the event is handled
+        :param event: pygame event, or a (type, key) tuple. A key of None creates an event with no key
+        """
+        if not isinstance(event, pygame.event.EventType):
+            event_type, key = event
+            if key is None:
+                event = pygame.event.Event(event_type)
+            else:
+                event = pygame.event.Event(event_type, key=key)
+        self.script.setdefault(frame, []).append(event)
+
+    def get(self, frame):
+        """
+        :param int frame: Current frame number of the game loop
+        :return: list of scripted events for this frame, empty if there are none
+        """
+        return self.script.get(frame, ())
+
+    def last_frame(self):
+        """:return: The last frame number that has a scripted event, 0 for an empty script"""
+        return max(self.script, default=0)
+
+
+class RandomWalkPilot(object):
+    """
+    Input source that steers the ship like a restless player, without a keyboard or a script.
+
+    Every few frames the pilot lets go of the arrow keys it holds and presses a new random horizontal and
+    vertical direction (or none), and now and then presses a shield or overdrive key. How long each choice
+    is held is random too, averaging hold frames. The pilot has its own random generator, so the same seed
+    flies the same course without drawing from the game's rng streams.
+
+    Methods defined:
+    """
+
+    directions = ((pygame.K_LEFT, pygame.K_RIGHT, None), (pygame.K_UP, pygame.K_DOWN, None))
+    actions = (pygame.K_d, pygame.K_a, pygame.K_w)
+
+    def __init__(self, seed=None, hold=30, action_chance=0.2):
+        """
+        Attributes defined here:
+        held: Arrow keys currently held down
+        next_change: Frame on which the pilot picks a new direction
+
+        :param int seed: Seed of the pilot's random generator. Random if None
+        :param int hold: Average number of frames a direction is held
+        :param float action_chance: Chance of pressing a shield or overdrive key with each change of direction
+        """
+        self.random = random.Random(seed)
+        self.hold = hold
+        self.action_chance = action_chance
+        self.held = []
+        self.next_change = 1
+
+    def get(self, frame):
+        """
+        :param int frame: Current frame number of the game loop
+        :return: list of pygame events for this frame, empty between changes of direction
+        """
+        if frame < self.next_change:
+            return ()
+        choose = self.random.choice
+        events = [pygame.event.Event(pygame.KEYUP, key=key) for key in self.held]
+        self.held = [key for key in (choose(keys) for keys in self.directions) if key is not None]
+        events.extend(pygame.event.Event(pygame.KEYDOWN, key=key) for key in self.held)
+        if self.random.random() < self.action_chance:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=choose(self.actions)))
+        self.next_change = frame + self.random.randint(1, 2 * self.hold - 1)
+        return events
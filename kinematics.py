@@ -0,0 +1,99 @@
+"""
+Classes exported:
+1. Kinematic: Mixin for sprites that move, keeping a float position updated in place with the rect and child
+    hitboxes following it.
+"""
+
+from variables import pygame
+
+Vector2 = pygame.math.Vector2
+
+
+class Kinematic(object):
+    """
+    Float position and movement shared by every moving sprite: the player ship, hitboxes, enemies and attacks.
+
+    pygame.Rect positions are integers, so each sprite keeps its true position in a Vector2 and copies it to
+    rect.center after every move, where it is rounded the way pygame rounds. The position, the velocity and the
+    offsets are all Vector2s that are changed in place, so moving a sprite builds no new lists or tuples.
+    Child sprites, such as the hitboxes of the player ship or of an attack, are attached at an offset from
+    their parent's position and placed from it exactly after every move of the parent, rather than being moved
+    by the same velocity or from their own rounded rect.
+
+    The position before the last move is kept as well, so a renderer drawing between two simulation steps can
+    place the sprite between its previous and current position with interpolate. Placing a sprite moves both, so
+    a sprite that was just spawned or reused is never drawn sliding in from where it was before.
+
+    A subclass must set the rect attribute and call place (or set position to a Vector2) before moving.
+
+    Methods defined:
+    """
+
+    position = None  # Vector2 of the true position, copied to rect.center
+    previous = None  # Vector2 of the position before the last move
+    offset = None  # Vector2 from the parent's position to this sprite's, for an attached child
+    parent = None  # sprite this one is attached to
+    children = ()  # attached child sprites that follow this one
+
+    def place(self, x, y):
+        """
+        Move the sprite to a position, reusing its position vector, and place its children from there.
+
+        :param float x: Horizontal position
+        :param float y: Vertical position
+        """
+        if self.position is None:
+            self.position = Vector2(x, y)
+            self.previous = Vector2(x, y)
+        else:
+            self.position.update(x, y)
+            self.previous.update(x, y)
+        self.sync()
+
+    def move(self, velocity):
+        """
+        Add a velocity to the position in place and place the rect and children from the result.
+
+        :param velocity: Vector2 or pair of numbers, in pixels per frame
+        """
+        self.previous.update(self.position)
+        self.position += velocity
+        self.sync()
+
+    def sync(self):
+        """Copy the position to rect.center and place every child at its offset from the position."""
+        self.rect.center = self.position
+        for child in self.children:
+            child.follow(self)
+
+    def attach(self, *children):
+        """
+        Attach child sprites at their current offset from this sprite. They follow every later move.
+
+        :param children: Kinematic sprites, already placed
+        """
+        for child in children:
+            if child.offset is None:
+                child.offset = Vector2()
+            child.offset.update(child.position)
+            child.offset -= self.position
+            child.parent = self
+        self.children = self.children + children
+
+    def follow(self, parent):
+        """Place this sprite at its offset from a parent's position."""
+        position = self.position
+        position.update(parent.position)
+        position += self.offset
+        self.rect.center = position
+
+    def interpolate(self, alpha):
+        """
+        Place a copy of the rect between the previous and the current position, rounded the way the rect is.
+
+        :param float alpha: Fraction of the last move, from 0 (previous position) to 1 (current position)
+        :return: pygame.Rect
+        """
+        rect = self.rect.copy()
+        rect.center = self.previous.lerp(self.position, alpha)
+        return rect
@@ -1,140 +1,129 @@
-def main():
+def main(inputs=None, frames=None, headless=False, render=True, seed=None, profile=None, dirty_rects=False,
+         record=None, pixel_masks=False, max_fps=120):
     """
-    Primary gameplay function. Initializes the pygame package and runs the main game loop.
-
-    This function sets the variables for the main loop, gets the user keyboard inputs, and calls the
-    functions and methods required to progress the game. The function iterates through the imported sprite
-    groups to update each sprite across the screen. It tests collisions between the player ship hitboxes
-    and enemy attacks/ships. Finally, it draws the background, sprites, enemies, and player ship to the
-    screen.
-
+    Primary gameplay function. Starts a Game, which initializes the pygame package, and runs the main game loop.
+
+    Nothing is imported, opened or loaded before this function runs. The Game times its startup phases and the
+    first frame, see engine.Game.startup_report.
+
+    This function sets the variables for the main loop, gets the user keyboard inputs, and passes them to a
+    Simulation, which updates every sprite and tests collisions between the player ship hitboxes and enemy
+    attacks/ships one fixed timestep at a time. Finally, it draws the background, sprites, enemies, and player
+    ship to the screen.
+
+    The simulation steps at a fixed 60 steps per second of wall-clock time, whatever the render rate: a
+    FixedTimestep decides how many steps to run before each drawn frame. When drawing is slow, several steps run
+    per frame and the frames in between are skipped, so the game keeps its speed. When drawing is fast, frames
+    are drawn up to max_fps per second, between the last two steps, so motion is smooth above 60 frames per
+    second. Inputs are still read and recorded per step, so replays and scripted inputs are not affected.
+
+    In headless mode every loop runs exactly one step, is not capped and never flips the display, so the
+    game runs as fast as the update and collision pipeline allows. The screen is still drawn to (the dummy video
+    driver turns it into an offscreen surface) unless render is False. See the headless module for running it.
+
+    With dirty_rects, only the areas drawn on this frame or the previous one are cleared and pushed to the
+    display, instead of every pixel. The number of pixels pushed is recorded with each frame's entity counts
+    as dirty_px.
+
+    With record, every handled key event is recorded and saved at exit, with the seed and final state, to a
+    replay file that the replay module plays back headlessly and verifies.
+
+    :param inputs: Input source with a get(frame) method returning that frame's events. Defaults to the keyboard
+    :param int frames: Stop after this many frames. Runs until the player quits or is destroyed if None
+    :param bool headless: Run without a frame cap and without updating the display
+    :param bool render: Draw the screen fill, sprites and HUD. Only meaningful to turn off when headless
+    :param int seed: Master seed for the game's random streams. A random seed is used if None
+    :param str profile: Write the per-phase frame timings of the last frames to this .csv or .ndjson file at exit
+    :param bool dirty_rects: Clear and update the display by dirty rectangles instead of whole frames
+    :param str record: Save a replay of the session to this file at exit
+    :param bool pixel_masks: Confirm collisions with the ship by pixel mask overlap, see Simulation.collide
+    :param int max_fps: Most frames drawn per second, 0 for no cap. Ignored when headless
+    :return: dict with the number of frames run, elapsed seconds, frames per second, frames drawn and the number
+        of steps that were not drawn on their own frame, if the ship was destroyed,
+        the seed used, a hash of the final game state, the per-phase frame time percentiles and the average
+        number of pixels pushed to the display per frame, and the startup phase times in milliseconds
+    :var game: the Game that opened the display and built the simulation, renderer and HUD.
     :var clock: a pygame class instance used to set the maximum framerate of the game.
-    :var font: the system font used when rendering HUD information.
-    :var bool done: responsible for ending the game. Game terminates on True
-    :var bool starting: must be True before enemies are spawned.
-    :var float x_speed: the horizontal movement speed of the ship.
-    :var float y_speed: vertical movement speed of the player ship.
-    :var int distance_traveled: number of frames elapsed in the game. Tempo variable for game progress.
-    :var list deaths: list of sprites 'killed' in collisions with player ship, deleted after their explosion animation.
+    :var timestep: FixedTimestep deciding the steps run for each drawn frame, None when headless.
+    :var hud: HUD showing the ship's energy, shield level and overdrive, re-rendered only when they change.
+    :var simulation: the Simulation holding the game state. Its frame attribute is the distance traveled.
+    :var profiler: FrameProfiler timing every phase of the loop. F3 toggles its on-screen overlay.
+    :var renderer: Renderer clearing the screen and updating the display, whole or by dirty rectangles.
     """
+    import time
+    from engine import Game
+    from profiler import FrameProfiler
+    from inputs import KeyboardInput
+    from timing import FixedTimestep
+
+    profiler = FrameProfiler()
+    game = Game(seed, verbose=not headless, dirty_rects=dirty_rects, profiler=profiler,
+                pixel_masks=pixel_masks).start()
     import variables
-    from background_generator import Background
-    from ship import ship, ship_hitbox
-    from enemies import attacks, enemies, shots, DrawExplosions
-    from stages import game_manager
-
-    variables.pygame.init()
+    screen, simulation, renderer, hud = game.screen, game.simulation, game.renderer, game.hud
     clock = variables.pygame.time.Clock()
-    background = Background()
-    font = variables.pygame.font.SysFont('Calibri', 18, True, False)
-    done = False
-    starting = False
-    x_speed, y_speed = 0, 0
-    distance_traveled = 1
-    deaths = []
-
-    def render_hud(energy, shield, boost):
-        """
-        Render the font variables for all HUD information and blit them to the screen.
-
-        :arg energy: integer from ship.energy. Changed to 'MAX' if at or above 100
-        :arg shield: integer from ship.shield_level. Changed to 'MAX' if at or above 5
-        :arg boost: integer from ship.boost. A value of 1 means no boost, any other value
-            is assumed to be a boost multiplier. This must be changed if future enemy attacks
-            have the possibility of slowing the player's ship.
-        """
-        if shield >= 5:
-            shield = 'MAX'
-        if energy >= 100:
-            energy = 'MAX'
-        if boost == 1:
-            boost = 'Disabled'
-        else:
-            boost = 'Enabled'
-        shield_level_text = font.render('Shield Level: {0}'.format(shield), True, variables.WHITE)
-        energy_level_text = font.render('Energy: {0}'.format(energy), True, variables.WHITE)
-        overdrive_text = font.render('Overdrive:  {0}'.format(boost), True, variables.WHITE)
-        variables.screen.blit(energy_level_text, [18, 570])
-        variables.screen.blit(shield_level_text, [130, 570])
-        variables.screen.blit(overdrive_text, [315, 570])
-
-    while not done:  # main program loop
-
-        for event in variables.pygame.event.get():
-            if event.type == variables.pygame.QUIT:
-                done = True
-
-            elif event.type == variables.pygame.KEYDOWN:
-                if event.key == variables.pygame.K_LEFT:
-                    x_speed = -4
-                elif event.key == variables.pygame.K_RIGHT:
-                    x_speed = 4
-                elif event.key == variables.pygame.K_UP:
-                    y_speed = -4
-                elif event.key == variables.pygame.K_DOWN:
-                    y_speed = 4
-                elif event.key == variables.pygame.K_d:
-                    ship.increase_shields()
-                elif event.key == variables.pygame.K_a:
-                    ship.decrease_shields()
-                elif event.key == variables.pygame.K_w:
-                    ship.overdrive()
-
-            elif event.type == variables.pygame.KEYUP:
-                if event.key == variables.pygame.K_LEFT:
-                    x_speed = 0
-                elif event.key == variables.pygame.K_RIGHT:
-                    x_speed = 0
-                elif event.key == variables.pygame.K_UP:
-                    y_speed = 0
-                elif event.key == variables.pygame.K_DOWN:
-                    y_speed = 0
-
-        variables.screen.fill(variables.BLACK)
-        background.update()
-        ship.update(x_speed, y_speed, distance_traveled)
-
-        if starting:
-            game_manager(distance_traveled, ship.rect.center)
-
-        for enemy in enemies:
-            enemy.update()
-
-        for attack in attacks:
-            attack.update()
-
-        for hitbox in ship_hitbox:
-            # spritecollide returns a list of all sprites in a group that overlap the tested sprite (here, hitbox)
-            # must iterate through the lists in case more than 1 hit occurred in the last frame
-            collisions = variables.pygame.sprite.spritecollide(hitbox, enemies, True)
-            hits = variables.pygame.sprite.spritecollide(hitbox, shots, True)
-            if hits:
-                for i in hits:
-                    print('Hit, damage is', i.damage)
-                    done = ship.take_damage(i.damage)
-            if collisions:
-                for enemy in collisions:
-                    print('Collision, damage is', enemy.mass)
-                    temp_death = DrawExplosions((enemy.position[0] - enemy.explosion_offset[0],
-                                                enemy.position[1] - enemy.explosion_offset[1]))
-                    deaths.append(temp_death)
-                    done = ship.take_damage(enemy.mass)
-
-        for dying in deaths:
-            dying.draw()
-
-        deaths = [dying for dying in deaths if dying.destruction_timer > 0]  # discards finished animations
-        # ship_hitbox.draw(variables.screen)
-        # shots.draw(variables.screen)
-        enemies.draw(variables.screen)
-        render_hud(ship.energy, ship.shield_level, ship.boost)
-        variables.pygame.display.update()
-        clock.tick(60)  # cap the framerate at 60
-        distance_traveled += 1
-        if distance_traveled > 25:
-            starting = True
-
-    variables.pygame.quit()
+    timestep = None if headless else FixedTimestep()
+    renders = 0
+    ship = simulation.ship
+    if inputs is None:
+        inputs = KeyboardInput()
+    if record:
+        from replay import ReplayRecorder
+        inputs = ReplayRecorder(inputs, pixel_masks)
+
+    start_time = time.perf_counter()
+    while not simulation.done:  # main program loop
+
+        profiler.begin_frame(simulation.frame)
+        for _ in range(1 if timestep is None else timestep.advance()):
+            for event in inputs.get(simulation.frame):
+                if event.type == variables.pygame.KEYDOWN and event.key == variables.pygame.K_F3:
+                    profiler.toggle_overlay()
+                else:
+                    simulation.handle_event(event)
+            profiler.lap('events')
+            simulation.step()
+            if frames is not None and simulation.frame > frames:
+                simulation.done = True
+            if simulation.done:
+                break
+
+        counts = simulation.entity_counts()
+        if render:
+            renderer.clear()
+            profiler.lap('clear')
+            simulation.draw(screen, renderer.rects, 1.0 if timestep is None else timestep.alpha)
+            profiler.lap('draw')
+            renderer.add(hud.draw(screen, ship.energy, ship.shield_level, ship.boost))
+            renderer.add(profiler.draw_overlay(screen))
+            profiler.lap('hud')
+            counts['dirty_px'] = renderer.present(update_display=not headless)
+            profiler.lap('display')
+        profiler.end_frame(counts)
+        game.frame_done()
+        renders += 1
+        if not headless:
+            clock.tick(max_fps)  # cap the framerate, the simulation keeps its own rate
+
+    elapsed = time.perf_counter() - start_time
+    if profile:
+        profiler.dump(profile)
+    if not headless:
+        game.stop()
+    frames_run = simulation.frame - 1
+    report = {'frames': frames_run, 'seconds': elapsed, 'fps': frames_run / elapsed if elapsed else 0.0,
+              'renders': renders, 'skipped': 0 if timestep is None else timestep.skipped,
+              'destroyed': simulation.destroyed, 'seed': simulation.seed, 'state': simulation.state_hash(),
+              'phases': profiler.percentiles(), 'dirty_px': renderer.mean_area(), 'startup': game.startup_report()}
+    if record:
+        inputs.replay(report).save(record)
+    return report
 
 if __name__ == '__main__':
-    main()
+    import sys
+    record = sys.argv[sys.argv.index('--record') + 1] if '--record' in sys.argv[1:-1] else None
+    max_fps = int(sys.argv[sys.argv.index('--max-fps') + 1]) if '--max-fps' in sys.argv[1:-1] else 120
+    report = main(dirty_rects='--dirty-rects' in sys.argv[1:], record=record,
+                  pixel_masks='--pixel-masks' in sys.argv[1:], max_fps=max_fps)
+    if '--startup' in sys.argv[1:]:
+        print(', '.join('{0} {1:.1f} ms'.format(phase, ms) for phase, ms in report['startup'].items()))
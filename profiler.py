@@ -0,0 +1,169 @@
+"""
+Classes and functions exported:
+1. FrameProfiler: Per-phase frame timer with a rolling history, percentiles, on-screen overlay and file export.
+2. percentile: Nearest-rank percentile of a list of values.
+"""
+
+import csv
+import json
+import time
+from collections import deque
+from variables import *
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile.
+
+    :param values: Sorted list of numbers
+    :param float fraction: Percentile as a fraction, e.g. 0.95
+    :return: The value at that percentile, 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+class FrameProfiler(object):
+    """
+    Records how long each phase of every frame takes, plus live entity counts, over a rolling window of frames.
+
+    A frame is timed by calling begin_frame, then lap with the name of each phase as it finishes, then end_frame.
+    lap charges the time since the previous lap (or the start of the frame) to the named phase, so timing costs
+    one clock read per phase. The last history frames are kept in ring buffers, from which p50/p95/p99 per phase
+    are computed on demand. The same history can be drawn as an overlay on screen and dumped to a CSV or NDJSON
+    file. A disabled profiler ignores every call, so it can always be passed around.
+
+    Methods defined:
+    """
+
+    def __init__(self, history=600, enabled=True):
+        """
+        :param int history: Number of most recent frames kept
+        :param bool enabled: Record timings. A disabled profiler does nothing
+        """
+        self.enabled = enabled
+        self.history = history
+        self.phases = {}  # phase name to ring buffer of seconds
+        self.records = deque(maxlen=history)  # (frame, total seconds, phase seconds, entity counts) per frame
+        self.current = {}
+        self.counts = {}
+        self.frame = 0
+        self.start = self.last = 0.0
+        self.overlay_visible = False
+        self.overlay = None
+        self.overlay_frame = None
+        self.font = None
+
+    def begin_frame(self, frame):
+        """Start timing a frame. The first phase is timed from here."""
+        if self.enabled:
+            self.frame = frame
+            self.current = {}
+            self.start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Charge the time since the previous lap of this frame to a phase.
+
+        :param str phase: Name of the phase that just finished. Time is added up if a phase laps twice in a frame
+        """
+        if self.enabled:
+            now = time.perf_counter()
+            self.current[phase] = self.current.get(phase, 0.0) + now - self.last
+            self.last = now
+
+    def end_frame(self, counts=None):
+        """
+        Finish the frame and add its timings to the history.
+
+        :param dict counts: Live entity counts for this frame, e.g. the length of each sprite group
+        """
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self.start
+        for phase, seconds in self.current.items():
+            if phase not in self.phases:
+                self.phases[phase] = deque(maxlen=self.history)
+            self.phases[phase].append(seconds)
+        self.counts = counts or {}
+        self.records.append((self.frame, total, self.current, self.counts))
+
+    def percentiles(self):
+        """
+        :return: dict of phase name (and 'total' for the whole frame) to a dict of p50, p95 and p99 in milliseconds
+        """
+        series = [(phase, sorted(seconds)) for phase, seconds in self.phases.items()]
+        series.append(('total', sorted(record[1] for record in self.records)))
+        return {phase: {'p50': percentile(values, 0.5) * 1000, 'p95': percentile(values, 0.95) * 1000,
+                        'p99': percentile(values, 0.99) * 1000}
+                for phase, values in series}
+
+    def toggle_overlay(self):
+        """Show or hide the on-screen overlay."""
+        self.overlay_visible = not self.overlay_visible
+
+    def draw_overlay(self, surface, refresh=30):
+        """
+        Draw the percentile table and entity counts in the top left corner of the surface, if the overlay is visible.
+
+        The text is only rendered again every refresh frames, so a visible overlay costs one blit on most frames.
+        :param surface: Surface to draw on, normally the main screen
+        :param int refresh: Number of frames between updates of the overlay text
+        :return: pygame.Rect of the area drawn, None if the overlay is hidden
+        """
+        if not (self.enabled and self.overlay_visible):
+            return None
+        if self.overlay is None or self.frame - self.overlay_frame >= refresh:
+            self.overlay = self.render_overlay()
+            self.overlay_frame = self.frame
+        return surface.blit(self.overlay, (4, 4))
+
+    def render_overlay(self):
+        """:return: Surface with one line of p50/p95/p99 per phase followed by the entity counts"""
+        if self.font is None:
+            self.font = pygame.font.Font(None, 16)
+        lines = ['{0:<11} {1:6.2f} {2:6.2f} {3:6.2f} ms'.format(phase, values['p50'], values['p95'], values['p99'])
+                 for phase, values in self.percentiles().items()]
+        lines.append('  '.join('{0}: {1}'.format(name, count) for name, count in self.counts.items()))
+        rendered = [self.font.render(line, True, YELLOW) for line in ['phase        p50    p95    p99'] + lines]
+        overlay = pygame.Surface((max(line.get_width() for line in rendered) + 8, 14 * len(rendered) + 4))
+        overlay.set_alpha(200)
+        for row, line in enumerate(rendered):
+            overlay.blit(line, (4, 2 + 14 * row))
+        return overlay
+
+    def rows(self):
+        """
+        :return: list of dicts, one per frame in the history, with the frame number, total and phase times in
+            milliseconds, and entity counts
+        """
+        rows = []
+        for frame, total, phases, counts in self.records:
+            row = {'frame': frame, 'total_ms': total * 1000}
+            row.update(('{0}_ms'.format(phase), seconds * 1000) for phase, seconds in phases.items())
+            row.update(counts)
+            rows.append(row)
+        return rows
+
+    def dump(self, path):
+        """
+        Write the frame history to a file: NDJSON (one JSON object per line) if the path ends in .ndjson or
+        .jsonl, CSV otherwise.
+
+        :param str path: File to write
+        """
+        rows = self.rows()
+        with open(path, 'w', newline='') as output:
+            if path.endswith(('.ndjson', '.jsonl')):
+                for row in rows:
+                    output.write(json.dumps(row) + '\n')
+                return
+            fields = []
+            for row in rows:
+                for field in row:
+                    if field not in fields:
+                        fields.append(field)
+            writer = csv.DictWriter(output, fields)
+            writer.writeheader()
+            writer.writerows(rows)
@@ -0,0 +1,192 @@
+"""
+Classes exported:
+1. ProjectileArrays: Projectile engine that stores every enemy attack in numpy arrays instead of sprites.
+"""
+
+import numpy
+from variables import *
+from rendering import ATTACKS
+from enemies import attack_spec
+
+# Rows of the ProjectileArrays.state array
+X, Y, HITBOX_X, HITBOX_Y, X_SPEED, Y_SPEED, HITBOX_WIDTH, HITBOX_HEIGHT, DAMAGE, IMAGE = range(10)
+
+
+def round_half_away(values):
+    """Round like pygame.Rect does when a float position is assigned: halves are rounded away from zero."""
+    return numpy.trunc(values + numpy.copysign(0.5, values))
+
+
+class ProjectileArrays(object):
+    """
+    Struct-of-arrays projectile engine.
+
+    Every live attack is one column of a single 2D numpy array holding its position, hitbox center, velocity,
+    hitbox size, damage and image. Moving all attacks, culling the ones that ran off screen (see culling.Culler)
+    and testing them against a ship hitbox are each one vectorized pass over that array, and removed attacks are
+    dropped by compacting the live columns in place. Attacks are fired with the same fire(attack_class, *args)
+    and launch(spec, source) calls as the ProjectilePool of sprites, and keep the same geometry: both take the
+    image, velocity vector and hitbox of a compiled AttackSpec.
+
+    Select it for the enemies with enemies.set_projectile_engine, or with Simulation(projectile_arrays=True).
+
+    Methods defined:
+    """
+
+    def __init__(self, capacity=256):
+        """
+        :param int capacity: Initial number of attacks the arrays can hold. Doubled whenever it is reached
+        """
+        self.state = numpy.zeros((10, capacity))
+        self.count = 0
+        self.images = []  # attack images, indexed by the IMAGE row
+        self.image_sizes = numpy.zeros((0, 2))  # width and height of each attack image, indexed by the IMAGE row
+        self.image_index = {}  # attack shape to index into images
+        self.visible = None  # boolean array over the live attacks, True for those to draw. All are drawn if None
+
+    def fire(self, attack_class, source, offset, angle, velocity, damage, line_length, line_width, color=RED):
+        """
+        Add an attack. Takes the same arguments as BasicAttack, preceded by the attack class.
+
+        :param attack_class: BasicAttack or a subclass, used for its hitbox calibration
+        :return: Index of the new attack in the arrays. Indexes change as attacks are removed
+        """
+        return self.launch(attack_spec(attack_class, offset, angle, velocity, damage, line_length, line_width, color),
+                           source)
+
+    def launch(self, spec, source):
+        """
+        Add a compiled attack.
+
+        :param spec: AttackSpec, e.g. from the definitions tables
+        :param source: Position the attack is fired from
+        :return: Index of the new attack in the arrays. Indexes change as attacks are removed
+        """
+        index = self.image_index.get(spec.shape)
+        if index is None:
+            index = self.image_index[spec.shape] = len(self.images)
+            self.images.append(spec.image)
+            self.image_sizes = numpy.vstack((self.image_sizes, spec.image.get_size()))
+        width, height, x_offset, y_offset = spec.hitbox
+        if self.count == self.state.shape[1]:
+            self.state = numpy.concatenate((self.state, numpy.zeros_like(self.state)), axis=1)
+        x, y = source[0] - 15, source[1] - 7
+        self.state[:, self.count] = (x, y, x + x_offset, y + y_offset, spec.velocity[0], spec.velocity[1],
+                                     width, height, spec.damage, index)
+        self.count += 1
+        self.visible = None
+        return self.count - 1
+
+    def update(self):
+        """
+        Move every attack and its hitbox by its velocity.
+        """
+        count = self.count
+        state = self.state
+        state[X:Y + 1, :count] += state[X_SPEED:Y_SPEED + 1, :count]
+        state[HITBOX_X:HITBOX_Y + 1, :count] += state[X_SPEED:Y_SPEED + 1, :count]
+
+    def cull(self, view, bounds):
+        """
+        Remove the attacks that can never come back on screen and mark the ones to draw, by the rules of the Culler.
+
+        :param view: pygame.Rect outside which attacks are not drawn
+        :param bounds: pygame.Rect outside which attacks moving away from it are removed
+        :return: Number of attacks removed, and number of remaining attacks not drawn
+        """
+        count = self.count
+        state = self.state
+        left = round_half_away(state[X, :count])
+        top = round_half_away(state[Y, :count])
+        sizes = self.image_sizes[state[IMAGE, :count].astype(int)]
+        right = left + sizes[:, 0]
+        bottom = top + sizes[:, 1]
+        x_speed = state[X_SPEED, :count]
+        y_speed = state[Y_SPEED, :count]
+        gone = (((top >= bounds.bottom) & (y_speed >= 0)) | ((bottom <= bounds.top) & (y_speed <= 0)) |
+                ((left >= bounds.right) & (x_speed >= 0)) | ((right <= bounds.left) & (x_speed <= 0)))
+        visible = (left < view.right) & (right > view.left) & (top < view.bottom) & (bottom > view.top)
+        retired = int(numpy.count_nonzero(gone))
+        if retired:
+            self.remove(gone)
+            visible = visible[~gone]
+        self.visible = visible
+        return retired, int(count - retired - numpy.count_nonzero(visible))
+
+    def remove(self, gone):
+        """
+        Drop the attacks selected by a boolean mask, keeping the order of the others.
+
+        :param gone: Boolean numpy array over the live attacks, True for each attack to remove
+        """
+        keep = ~gone
+        remaining = int(numpy.count_nonzero(keep))
+        self.state[:, :remaining] = self.state[:, :self.count][:, keep]
+        self.count = remaining
+        self.visible = None
+
+    def collide(self, rect):
+        """
+        Test every attack hitbox against a rect, remove the attacks that hit and return their damage.
+
+        Hitbox rects are placed with pygame's rounding and tested like pygame.Rect.colliderect.
+        :param rect: pygame.Rect, e.g. of one of the player ship hitboxes
+        :return: list of the damage of every attack that hit, in firing order
+        """
+        count = self.count
+        if not count:
+            return []
+        state = self.state
+        width = state[HITBOX_WIDTH, :count]
+        height = state[HITBOX_HEIGHT, :count]
+        left = round_half_away(state[HITBOX_X, :count]) - numpy.floor(width / 2)
+        top = round_half_away(state[HITBOX_Y, :count]) - numpy.floor(height / 2)
+        hit = (left < rect.right) & (left + width > rect.left) & (top < rect.bottom) & (top + height > rect.top)
+        if not hit.any():
+            return []
+        damage = state[DAMAGE, :count][hit].astype(int).tolist()
+        self.remove(hit)
+        return damage
+
+    def submit(self, queue, alpha=1.0):
+        """
+        Queue every attack the last cull found on screen on the attack layer of a rendering.RenderQueue, the layer
+        that attack sprites are drawn on, so both engines draw a game the same way. Attacks are drawn at their
+        rounded position, as sprites are.
+
+        :param queue: RenderQueue of the frame
+        :param float alpha: Fraction of the last step to draw the attacks at. Attacks move in straight lines, so
+            they are drawn back along their velocity
+        """
+        count = self.count
+        if not count:
+            return
+        state = self.state[:, :count]
+        if self.visible is not None:
+            state = state[:, self.visible]
+        x, y = state[X], state[Y]
+        if alpha < 1:
+            x = x - state[X_SPEED] * (1 - alpha)
+            y = y - state[Y_SPEED] * (1 - alpha)
+        x = round_half_away(x).astype(int).tolist()
+        y = round_half_away(y).astype(int).tolist()
+        images = map(self.images.__getitem__, state[IMAGE].astype(int).tolist())
+        queue.extend(ATTACKS, zip(images, zip(x, y)))
+
+    def clear(self):
+        """Remove every attack."""
+        self.count = 0
+        self.visible = None
+
+    def positions(self):
+        """:return: array of the x and y positions of the live attacks, one row each"""
+        return self.state[X:Y + 1, :self.count]
+
+    def stats(self):
+        """
+        :return: dict with the number of live attacks, array capacity and number of distinct attack images
+        """
+        return {'live': self.count, 'capacity': self.state.shape[1], 'shapes': len(self.images)}
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,192 @@
+"""
+Classes exported:
+1. Renderer: Clears the screen and pushes each frame to the display, either whole or by dirty rectangles.
+2. RenderQueue: Collects the images drawn during a frame by layer and draws each layer with one Surface.blits call.
+"""
+
+from variables import *
+
+# Draw layers of a RenderQueue, bottom to top. The background is drawn directly, under every layer
+SHIP, ATTACKS, EXPLOSIONS, ENEMIES = range(4)
+
+
+class Renderer(object):
+    """
+    Frame clearing and display updates for the main loop.
+
+    In full mode every frame starts by filling the whole surface with the background color and ends with a
+    display update of all of its pixels. In dirty rectangle mode the drawables append the rect of everything
+    they draw to the rects list, and only those areas are touched: a frame starts by filling just the rects
+    drawn on the previous frame, and ends by updating the display for the previous and current rects, which
+    covers both the pixels that were erased and the ones that were drawn.
+
+    When a frame draws too much for that to pay off (more than max_rects rects, or rects adding up to more than
+    full_fraction of the surface), that frame falls back to a full fill or a full update. The number of pixels
+    pushed to the display is kept in dirty_area for every frame.
+
+    Methods defined:
+    """
+
+    def __init__(self, surface=None, dirty_rects=False, color=BLACK, full_fraction=0.5, max_rects=1000):
+        """
+        Attributes defined here:
+        rects: List that drawables append the rects they drew to in dirty rectangle mode, None in full mode
+        dirty_area: Pixels pushed to the display on the last frame. Overlapping rects are counted more than once
+        full_updates: Number of frames that were pushed to the display whole
+        frames, total_area: Number of frames presented and pixels pushed over all of them
+
+        :param surface: Surface that is cleared and drawn on. Defaults to the main screen, opened if needed
+        :param bool dirty_rects: Only clear and update the areas that were drawn on
+        :param color: RGB tuple the surface is cleared to
+        :param float full_fraction: Fraction of the surface area above which a frame is cleared or updated whole
+        :param int max_rects: Number of rects above which a frame is cleared or updated whole
+        """
+        self.surface = surface if surface is not None else get_screen()
+        self.color = color
+        self.area = self.surface.get_width() * self.surface.get_height()
+        self.full_fraction = full_fraction
+        self.max_rects = max_rects
+        self.rects = [] if dirty_rects else None
+        self.previous = None  # rects drawn on the previous frame, None until a first frame was presented
+        self.dirty_area = 0
+        self.full_updates = 0
+        self.frames = 0
+        self.total_area = 0
+
+    @property
+    def dirty_rects(self):
+        """True in dirty rectangle mode."""
+        return self.rects is not None
+
+    def too_large(self, rects):
+        """:return: True if a list of rects is better handled as the whole surface"""
+        if len(rects) > self.max_rects:
+            return True
+        return sum(rect.width * rect.height for rect in rects) > self.area * self.full_fraction
+
+    def clear(self):
+        """
+        Erase the previous frame: the whole surface in full mode, or the rects drawn on it in dirty rectangle mode.
+        """
+        if self.rects is None or self.previous is None or self.too_large(self.previous):
+            self.surface.fill(self.color)
+        else:
+            fill = self.surface.fill
+            color = self.color
+            for rect in self.previous:
+                fill(color, rect)
+        if self.rects is not None:
+            self.rects = []
+
+    def add(self, rect):
+        """
+        Record a rect drawn outside of the drawables' own draw methods, e.g. by a blit in the HUD.
+
+        :param rect: pygame.Rect drawn on this frame, or None if nothing was drawn
+        """
+        if self.rects is not None and rect is not None:
+            self.rects.append(rect)
+
+    def present(self, update_display=True):
+        """
+        Push the frame to the display and measure how much of it was pushed.
+
+        :param bool update_display: Call pygame.display.update. Headless runs only measure the dirty area
+        :return: Number of pixels pushed to the display
+        """
+        if self.rects is None or self.previous is None:
+            changed = None
+        else:
+            changed = self.previous + self.rects
+            if self.too_large(changed):
+                changed = None
+        if changed is None:
+            self.dirty_area = self.area
+            self.full_updates += 1
+            if update_display:
+                pygame.display.update()
+        else:
+            self.dirty_area = sum(rect.width * rect.height for rect in changed)
+            if update_display:
+                pygame.display.update(changed)
+        if self.rects is not None:
+            self.previous = self.rects
+        self.frames += 1
+        self.total_area += self.dirty_area
+        return self.dirty_area
+
+    def mean_area(self):
+        """:return: Average number of pixels pushed to the display per frame, 0.0 before the first frame"""
+        return self.total_area / self.frames if self.frames else 0.0
+
+
+class RenderQueue(object):
+    """
+    Draw list of one frame, flushed with a single Surface.blits call per layer.
+
+    Instead of each entity blitting itself, the entities submit their image and position to a layer of the
+    queue while the frame is drawn, and flush then draws the layers in order, bottom to top. A Surface.blits
+    call draws a whole layer from C, which saves the per-entity method call and blit call overhead when there
+    are hundreds of attacks and enemies on screen. Images within a layer are drawn in the order they were
+    submitted. The layer lists are emptied by flush and reused on the next frame.
+
+    Methods defined:
+    """
+
+    def __init__(self, layers=ENEMIES + 1):
+        """
+        Attributes defined here:
+        layers: One list of (image, position) pairs per layer, bottom layer first
+        submitted: Number of images submitted since the last flush
+
+        :param int layers: Number of layers
+        """
+        self.layers = [[] for _ in range(layers)]
+        self.submitted = 0
+
+    def submit(self, layer, image, position):
+        """
+        Queue one image.
+
+        :param int layer: Index of the layer, e.g. rendering.SHIP
+        :param image: Surface to draw
+        :param position: Position of the image's top left corner, or a pygame.Rect whose top left corner is used
+        """
+        self.layers[layer].append((image, position))
+        self.submitted += 1
+
+    def extend(self, layer, items):
+        """
+        Queue many images at once.
+
+        :param int layer: Index of the layer
+        :param items: Iterable of (image, position) pairs
+        """
+        queued = self.layers[layer]
+        count = len(queued)
+        queued.extend(items)
+        self.submitted += len(queued) - count
+
+    def flush(self, surface=None, dirty=None):
+        """
+        Draw every queued image, layer by layer, and empty the queue.
+
+        :param surface: Surface to draw on. Defaults to the main screen
+        :param dirty: List that the rect of every image drawn is appended to. Ignored if None
+        :return: Number of images drawn
+        """
+        if surface is None:
+            surface = get_screen()
+        for queued in self.layers:
+            if queued:
+                if dirty is None:
+                    surface.blits(queued, doreturn=False)
+                else:
+                    dirty.extend(surface.blits(queued))
+                queued.clear()
+        drawn = self.submitted
+        self.submitted = 0
+        return drawn
+
+    def __len__(self):
+        return self.submitted
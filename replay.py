@@ -0,0 +1,254 @@
+"""
+Record game sessions into compact replay files and play them back headlessly.
+
+Classes and functions exported:
+1. Replay: A recorded session: master seed, handled key events by frame, and the end state to verify.
+2. ReplayRecorder: Input source wrapper that records the key events the game loop handles.
+3. play: Run a replay headlessly at uncapped speed and check that it ends in the recorded state.
+
+A replay file holds, in order: the magic bytes SSRP and a format version byte, the master seed, the number of
+frames played, a flags byte (bit 0 set if the ship was destroyed, bit 1 if the game confirmed collisions with
+pixel masks, which changes the simulation and is replayed the same way), the 20 byte SHA-1 state hash of the final
+frame, the number of frame records, then the records. Each record is the number of frames since the previous
+record, the number of events on that frame, and the events packed two to a byte, first event in the high
+nibble. An event is 4 bits: bit 3 set for a key release, and bits 0-2 the key (arrows, d, a, w) or 7 for
+quit. Numbers are unsigned LEB128 varints, the seed zigzag encoded first so negative seeds fit.
+
+Usage: python replay.py FILE [--render] [--profile FILE]
+Exits with status 1 if the replay does not end in its recorded state.
+"""
+
+import argparse
+import sys
+from variables import pygame
+
+MAGIC = b'SSRP'
+VERSION = 1
+KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_d, pygame.K_a, pygame.K_w)
+QUIT = 7  # event code of a quit event
+RELEASE = 8  # bit set in the event code of a key release
+DESTROYED, PIXEL_MASKS = 1, 2  # bits of the flags byte
+
+
+def encode_event(event):
+    """
+    :param event: pygame event
+    :return: 4 bit event code, None if the event does not change the game and is not recorded
+    """
+    if event.type == pygame.QUIT:
+        return QUIT
+    if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in KEYS:
+        return KEYS.index(event.key) | (RELEASE if event.type == pygame.KEYUP else 0)
+    return None
+
+
+def decode_event(code):
+    """:return: (type, key) tuple for a 4 bit event code, as accepted by ScriptedInput"""
+    if code == QUIT:
+        return pygame.QUIT, None
+    return pygame.KEYUP if code & RELEASE else pygame.KEYDOWN, KEYS[code & 7]
+
+
+def write_varint(output, value):
+    """Append an unsigned integer to a bytearray as a LEB128 varint."""
+    while value > 0x7f:
+        output.append(value & 0x7f | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def read_varint(data, offset):
+    """:return: The unsigned LEB128 varint at an offset of a bytes object, and the offset after it"""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay(object):
+    """
+    A recorded game session.
+
+    Everything that decides a game is its master seed, the options that change the simulation and the key
+    events handled on each frame, so those are all a replay stores, together with the number of frames and the
+    end state used to verify playback.
+
+    Methods defined:
+    """
+
+    def __init__(self, seed, frames, events, state, destroyed=False, pixel_masks=False):
+        """
+        :param int seed: Master seed of the rng streams
+        :param int frames: Number of frames played
+        :param events: list of (frame, event code) pairs, in the order they were handled
+        :param str state: Hex SHA-1 state hash of the final frame, as given by Simulation.state_hash
+        :param bool destroyed: True if the session ended with the ship destroyed
+        :param bool pixel_masks: True if the game confirmed collisions with pixel masks, see Simulation.collide
+        """
+        self.seed = seed
+        self.frames = frames
+        self.events = events
+        self.state = state
+        self.destroyed = destroyed
+        self.pixel_masks = pixel_masks
+
+    def to_bytes(self):
+        """:return: The replay in the packed file format described in the module documentation"""
+        output = bytearray(MAGIC)
+        output.append(VERSION)
+        write_varint(output, self.seed * 2 if self.seed >= 0 else -self.seed * 2 - 1)
+        write_varint(output, self.frames)
+        output.append((DESTROYED if self.destroyed else 0) | (PIXEL_MASKS if self.pixel_masks else 0))
+        output += bytes.fromhex(self.state)
+        records = []
+        for frame, code in self.events:
+            if records and records[-1][0] == frame:
+                records[-1][1].append(code)
+            else:
+                records.append((frame, [code]))
+        write_varint(output, len(records))
+        previous = 0
+        for frame, codes in records:
+            write_varint(output, frame - previous)
+            write_varint(output, len(codes))
+            for index in range(0, len(codes), 2):
+                pair = codes[index:index + 2]
+                output.append(pair[0] << 4 | (pair[1] if len(pair) > 1 else 0))
+            previous = frame
+        return bytes(output)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        :param bytes data: Replay in the packed file format
+        :return: Replay
+        :raises ValueError: If the data is not a replay of a supported version
+        """
+        if data[:4] != MAGIC or data[4] != VERSION:
+            raise ValueError('Not a version {0} replay'.format(VERSION))
+        seed, offset = read_varint(data, 5)
+        seed = seed // 2 if not seed & 1 else -(seed + 1) // 2
+        frames, offset = read_varint(data, offset)
+        destroyed = bool(data[offset] & DESTROYED)
+        pixel_masks = bool(data[offset] & PIXEL_MASKS)
+        state = data[offset + 1:offset + 21].hex()
+        count, offset = read_varint(data, offset + 21)
+        events = []
+        frame = 0
+        for record in range(count):
+            delta, offset = read_varint(data, offset)
+            length, offset = read_varint(data, offset)
+            frame += delta
+            for index in range(length):
+                byte = data[offset + index // 2]
+                events.append((frame, byte >> 4 if not index & 1 else byte & 0xf))
+            offset += (length + 1) // 2
+        return cls(seed, frames, events, state, destroyed, pixel_masks)
+
+    def save(self, path):
+        """Write the replay to a file."""
+        with open(path, 'wb') as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """:return: Replay read from a file"""
+        with open(path, 'rb') as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+    def inputs(self):
+        """:return: ScriptedInput feeding the recorded events to the game loop on their frames"""
+        from inputs import ScriptedInput
+        return ScriptedInput((frame, decode_event(code)) for frame, code in self.events)
+
+    def __len__(self):
+        return len(self.events)
+
+
+class ReplayRecorder(object):
+    """
+    Input source wrapper that records every event of another input source that changes the game.
+
+    Events are passed through unchanged. Quit events and presses and releases of the game keys are kept
+    as (frame, event code) pairs; anything else, such as the F3 profiler overlay key, does not change the
+    game and is not recorded.
+
+    Methods defined:
+    """
+
+    def __init__(self, source, pixel_masks=False):
+        """
+        :param source: Input source with a get(frame) method, e.g. a KeyboardInput
+        :param bool pixel_masks: The recorded game confirms collisions with pixel masks
+        """
+        self.source = source
+        self.pixel_masks = pixel_masks
+        self.events = []
+
+    def get(self, frame):
+        """:return: The source's events for this frame, after recording them"""
+        events = self.source.get(frame)
+        for event in events:
+            code = encode_event(event)
+            if code is not None:
+                self.events.append((frame, code))
+        return events
+
+    def replay(self, report):
+        """
+        :param dict report: Report returned by main.main for the recorded session
+        :return: Replay of the session
+        """
+        return Replay(report['seed'], report['frames'], self.events, report['state'], report['destroyed'],
+                      self.pixel_masks)
+
+
+def play(replay, render=False, profile=None):
+    """
+    Play a replay headlessly at uncapped speed, with the simulation options it was recorded with.
+
+    :param replay: Replay, or the path of a replay file
+    :param bool render: Draw every frame to the offscreen surface, for a benchmark that includes drawing
+    :param str profile: Write the per-phase frame timings to this .csv or .ndjson file
+    :return: dict report from main.main, with 'verified' set to True if the playback ended in the recorded
+        state after the recorded number of frames
+    """
+    import headless
+
+    if isinstance(replay, str):
+        replay = Replay.load(replay)
+    report = headless.run(replay.frames, replay.inputs(), render, replay.seed, profile,
+                          pixel_masks=replay.pixel_masks)
+    report['verified'] = (report['state'] == replay.state and report['frames'] == replay.frames and
+                          report['destroyed'] == replay.destroyed)
+    return report
+
+
+def command_line(argv=None):
+    """Parse command line arguments, play a replay and print the result."""
+    parser = argparse.ArgumentParser(description='Play back an Escape from Starsector replay headlessly.')
+    parser.add_argument('replay', help='replay file recorded with --record')
+    parser.add_argument('--render', action='store_true', help='draw every frame to the offscreen surface')
+    parser.add_argument('--profile', help='write per-phase frame timings to this .csv or .ndjson file')
+    args = parser.parse_args(argv)
+
+    import headless
+    headless.enable()
+    replay = Replay.load(args.replay)
+    report = play(replay, args.render, args.profile)
+    print('{0} events, seed {1}: {frames} frames in {seconds:.3f} s, {fps:.1f} frames per second'.format(
+        len(replay), replay.seed, **report))
+    if report['verified']:
+        print('Verified: final state', report['state'])
+        return 0
+    print('MISMATCH: expected {0} after {1} frames, got {state} after {frames} frames'.format(
+        replay.state, replay.frames, **report))
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(command_line(sys.argv[1:]))
@@ -0,0 +1,45 @@
+"""
+Seeded random number streams, one per game subsystem.
+
+Objects exported:
+1. spawn: Random stream used by the stage manager to decide when enemies appear.
+2. placement: Random stream used to place new enemies.
+3. attack: Random stream used by enemies to decide when to fire.
+4. starfield: Random stream used by the background starfield.
+5. seed: Function that reseeds every stream from a single master seed.
+
+Each subsystem draws from its own stream so that, for example, drawing an extra star does not change when
+enemies fire. Streams are reseeded in place, so modules should look them up as rng.attack at call time.
+"""
+
+import random
+
+streams = {'spawn': random.Random(), 'placement': random.Random(), 'attack': random.Random(),
+           'starfield': random.Random()}
+spawn = streams['spawn']
+placement = streams['placement']
+attack = streams['attack']
+starfield = streams['starfield']
+master_seed = None
+
+
+def seed(master=None):
+    """
+    Reseed every stream from a master seed. The same master seed always gives the same streams.
+
+    Each stream is seeded from the master seed and its own name, so streams are independent of each other
+    and of the order they are seeded in.
+
+    :param int master: Master seed. A new one is chosen at random if None
+    :return: The master seed used, so that a random run can be reproduced later
+    """
+    global master_seed
+    if master is None:
+        master = random.SystemRandom().randrange(2 ** 32)
+    master_seed = master
+    for name, stream in streams.items():
+        stream.seed('{0}/{1}'.format(master, name))
+    return master
+
+
+seed()
@@ -1,14 +1,19 @@
 """
 Classes and objects defined:
 1. Ship: Class representing the player's ship.
-2. ship_hitbox: Sprite group for player ship used in collision detection.
 """
 
 from variables import *
 from enemies import Hitbox
+from assets import images, masks
+from kinematics import Kinematic, Vector2
+from rendering import SHIP
 
+# (arc width, alpha, white arc width) of the shield drawn at each shield level, from 0 to 5
+shield_settings = ((0, 0, 0), (1, 65, 0), (1, 120, 0), (2, 150, 0), (2, 210, 0), (3, 210, 1))
 
-class Ship(pygame.sprite.Sprite):
+
+class Ship(pygame.sprite.Sprite, Kinematic):
     """
     Player-controlled Ship class
 
@@ -19,30 +24,35 @@ class Ship(pygame.sprite.Sprite):
     Methods defined:
     """
 
+    shield_levels = None  # tuple of pre-rendered shield images, shared by all ships
+
     def __init__(self):
         """
         Static init for creation of the player ship.
 
         Arguments:
-            position: Initial position on main screen, in pixels
-            rect.center: Copy of position, this is the value used by pygame to draw the center
-                of the ship image. The position argument can be manipulated as a floating point number to avoid
-                the integer rounding that occurs for rect x and y positions.
+            position: Vector2 of the position on main screen, in pixels. It is a float vector moved in place,
+                to avoid the integer rounding that occurs for rect x and y positions (see the kinematics module)
+            rect.center: Copy of position, this is the value used by pygame to draw the ship image
+            velocity: Vector2 of the movement of the current frame, reused every frame
             vertical/horizontal_hitbox: Instances of the Hitbox class (defined in the enemies module)
-                that define the borders of interaction for collision detection.
+                that define the borders of interaction for collision detection. They are attached to the
+                ship and follow its exact position by a fixed offset.
             energy: Player energy level. 100 is maximum
             shield: Attribute that will hold a pygame.Surface instance for display of the player's shield
             boost: Multiplier used by the update function to modulate ship velocity
             boost_timer: Integer variable that defines the number of frames overdrive is active for
         """
         super().__init__()
-        self.surface = pygame.image.load('images\\ship1.png').convert()
-        self.surface.set_colorkey((0, 0, 0))
+        if Ship.shield_levels is None:
+            self.render_shield_levels()
+        self.surface = images.get('ship1.png')
         self.rect = self.surface.get_rect()
-        self.position = [345, 400]
-        self.rect.center = self.position[:]
+        self.velocity = Vector2()
         self.vertical_hitbox = Hitbox(18, 67, 407, 452, 0)
         self.horizontal_hitbox = Hitbox(50, 11, 407, 474, 0)
+        self.place(345, 400)
+        self.attach(self.vertical_hitbox, self.horizontal_hitbox)
         self.energy = 100
         self.shield = None
         self.shield_level = 0
@@ -52,7 +62,7 @@ class Ship(pygame.sprite.Sprite):
 
     def update(self, x_speed, y_speed, distance_traveled):
         """
-        Calculate ship velocity, draw it on screen, and update various timers.
+        Calculate ship velocity, move it, and update various timers. The ship is drawn by the submit method.
 
         This method calculates ship velocity based on input x and y speeds, as well as active overdrives.
         As only 8 directions of movement are possible, a simple calculation is performed to make diagonal
@@ -72,7 +82,6 @@ class Ship(pygame.sprite.Sprite):
             y_speed = round((y_speed / 1.414) * 1.1, 3)
 
         self.update_position(x_speed, y_speed)
-        screen.blit(self.surface, self.rect.center)
 
         if self.boost_timer > 0:
             self.boost_timer -= 1
@@ -81,35 +90,47 @@ class Ship(pygame.sprite.Sprite):
         if not distance_traveled % 65 and self.energy < 100:
             self.energy += 1
 
+    def submit(self, queue, alpha=1.0):
+        """
+        Queue the ship and its shield on the ship layer of a rendering.RenderQueue, instead of drawing them.
+
+        :param queue: RenderQueue of the frame
+        :param float alpha: Fraction of the last step to draw the ship at, see kinematics.Kinematic.interpolate
+        """
+        queue.submit(SHIP, self.surface, self.rect.center if alpha >= 1 else self.interpolate(alpha).center)
+
+    def placed_mask(self):
+        """
+        :return: Pixel mask of the hull, without the shield, and the screen position it is drawn at, for
+            collisions.masks_overlap
+        """
+        return masks.get(images.get('ship1.png')), self.rect.center
+
     def update_position(self, x_speed, y_speed):
         """
         Update the position of the ship's image and associated hitboxes
 
-        As mentioned in init documentation, pygame.rect values are rounded (down) to integer values
-        at assignment. This results in irregular movement when floating point velocities are employed.
-        Thus, the position attribute is used to store the true position of the ship's image. This
-        attribute is then copied to give a pixel-approximation of the position. The same logic applies
-        for hitbox movements.
+        As mentioned in init documentation, pygame.rect values are rounded to integer values at
+        assignment. This results in irregular movement when floating point velocities are employed.
+        Thus, the position attribute stores the true position of the ship's image, and is copied to
+        rect.center to give a pixel-approximation of the position. The hitboxes are placed at their
+        offset from the true position, so they keep its sub-pixel precision too.
         Positions are not updated if the check_boundary method fails.
 
         :param x_speed: a floating point number calculated in the update method for horizontal movement
         :param y_speed: same as x_speed, but for vertical movement.
         """
         if self.check_boundary(x_speed, y_speed):
-            self.position = [(self.rect.center[0] + x_speed), (self.rect.center[1] + y_speed)]
-            self.rect.center = self.position[:]
-            self.horizontal_hitbox.position = ((self.horizontal_hitbox.rect.center[0] + x_speed),
-                                               (self.horizontal_hitbox.rect.center[1] + y_speed))
-            self.horizontal_hitbox.rect.center = self.horizontal_hitbox.position[:]
-            self.vertical_hitbox.position = ((self.vertical_hitbox.rect.center[0] + x_speed),
-                                             (self.vertical_hitbox.rect.center[1] + y_speed))
-            self.vertical_hitbox.rect.center = self.vertical_hitbox.position[:]
+            self.velocity.update(x_speed, y_speed)
+            self.move(self.velocity)
+        else:
+            self.previous.update(self.position)  # stopped, so it is not drawn moving between steps
 
     def check_boundary(self, x_speed, y_speed):
         """
         Stop the player ship if it will run off the screen
 
-        This method uses the main screen Surface instance and the ship's current velocity to determine
+        This method uses the main screen size and the ship's current velocity to determine
         if the ship's image is within a certain pixel range of the screen boundary.
 
         :param x_speed: floating point horizontal movement speed calculated in the update method
@@ -119,11 +140,11 @@ class Ship(pygame.sprite.Sprite):
         """
         if self.position[0] < 5 and x_speed < 0:
             return False
-        if self.position[0] > (screen.get_width() - 120) and x_speed > 0:
+        if self.position[0] > (size[0] - 120) and x_speed > 0:
             return False
         if self.position[1] < 15 and y_speed < 0:
             return False
-        if self.position[1] > (screen.get_height() - 140) and y_speed > 0:
+        if self.position[1] > (size[1] - 140) and y_speed > 0:
             return False
         return True
 
@@ -140,7 +161,7 @@ class Ship(pygame.sprite.Sprite):
 
     def increase_shields(self):
         """
-        Reduce energy levels to raise shield level by 1. Call the draw_shield method to update the screen.
+        Reduce energy levels to raise shield level by 1. Call the draw_shield method to update the ship image.
         """
         if self.energy >= 20 and self.shield_level < 5:
             self.shield_level += 1
@@ -160,7 +181,19 @@ class Ship(pygame.sprite.Sprite):
 
     def draw_shield(self):
         """
-        Get current shield level and draw the appropriate level over the ship image.
+        Swap in the pre-rendered ship and shield images for the current shield level.
+
+        The composite surfaces are baked once by render_shield_levels, so a shield change during the game
+        loop only replaces two references. Shield level is clamped to the 0-5 range of baked images.
+        """
+        if self.shield_level < 0:
+            self.shield_level = 0
+        self.shield, self.surface = self.shield_levels[min(self.shield_level, len(self.shield_levels) - 1)]
+
+    @classmethod
+    def render_shield_levels(cls):
+        """
+        Draw the shield overlay for every shield level over a copy of the ship image and cache the results.
 
         This gives the player a visual representation of shield presence and shield level. Shield level
         is modulated by the alpha and width parameters. Width represents the thickness of the oval to be
@@ -170,40 +203,23 @@ class Ship(pygame.sprite.Sprite):
         The pygame.draw.arc function is used to draw the shield. THe position variable describes the
         x and y offsets needed to center the oval around the ship, as well as the horizontal and vertical
         sizes of the oval.
+
+        :return: tuple of (shield, ship with shield) surface pairs, indexed by shield level
         """
-        if self.shield_level < 0:
-            self.shield_level = 0
         position = (27, 10, 70, 86)
-        alpha = 0
-        width = 0
-        white_width = 0
-
-        if self.shield_level == 1:
-            width = 1
-            alpha = 65
-        elif self.shield_level == 2:
-            width = 1
-            alpha = 120
-        elif self.shield_level == 3:
-            width = 2
-            alpha = 150
-        elif self.shield_level == 4:
-            width = 2
-            alpha = 210
-        elif self.shield_level == 5:
-            width = 3
-            alpha = 210
-            white_width = 1
-
-        self.shield = pygame.Surface((134, 100))  # same size as ship rectangle
-        self.shield.set_colorkey(BLACK)
-        self.shield.set_alpha(alpha)
-        self.shield.fill(BLACK)
-        pygame.draw.arc(self.shield, (51, 92, 214), position, 0, 360, width)
-        pygame.draw.arc(self.shield, WHITE, position, 0, 360, white_width)
-        self.surface = pygame.image.load('images\\ship1.png').convert() # must redraw ship to erase old shield levels
-        self.surface.set_colorkey(BLACK)
-        self.surface.blit(self.shield, (0, 0))
+        levels = []
+        for width, alpha, white_width in shield_settings:
+            shield = pygame.Surface((134, 100))  # same size as ship rectangle
+            shield.set_colorkey(BLACK)
+            shield.set_alpha(alpha)
+            shield.fill(BLACK)
+            pygame.draw.arc(shield, (51, 92, 214), position, 0, 360, width)
+            pygame.draw.arc(shield, WHITE, position, 0, 360, white_width)
+            surface = images.get('ship1.png').copy()  # the shared image must not be drawn on
+            surface.blit(shield, (0, 0))
+            levels.append((shield, surface))
+        cls.shield_levels = tuple(levels)
+        return cls.shield_levels
 
     def take_damage(self, damage):
         """
@@ -222,8 +238,3 @@ class Ship(pygame.sprite.Sprite):
         self.draw_shield()
         return False
 
-
-ship = Ship()
-ship_hitbox = pygame.sprite.Group()
-ship_hitbox.add(ship.vertical_hitbox)
-ship_hitbox.add(ship.horizontal_hitbox)
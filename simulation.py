@@ -0,0 +1,271 @@
+"""
+Classes exported:
+1. Simulation: Deterministic, fixed-timestep game state that is advanced one frame at a time by step().
+"""
+
+import hashlib
+import rng
+from variables import *
+from background_generator import Background
+from ship import Ship
+from enemies import attacks, enemies, shots, explosions, FireControl, set_projectile_engine, set_shot_index
+from stages import StageScheduler
+from collisions import SpatialHash, masks_overlap
+from culling import Culler
+from rendering import RenderQueue, ATTACKS, ENEMIES
+from projectile_arrays import ProjectileArrays
+from profiler import FrameProfiler
+from timing import TIMESTEP
+
+
+class Simulation(object):
+    """
+    Game state and update pipeline, separated from input polling, frame capping and display flips.
+
+    A Simulation owns the player ship and background, clears the enemy sprite groups when created, and
+    seeds every random stream in the rng module from a single master seed. Each call to step advances the
+    game by exactly one fixed timestep regardless of how much wall-clock time has passed. Two simulations
+    created with the same seed and fed the same events on the same frames go through identical states,
+    which can be compared frame by frame with snapshot or state_hash.
+
+    Methods defined:
+    """
+
+    def __init__(self, seed=None, verbose=False, spatial_hash=False, projectile_arrays=False, profiler=None,
+                 spawning=True, stage='default', pixel_masks=False):
+        """
+        Attributes defined here:
+        seed: Master seed used for the rng streams
+        frame: Number of the next frame to be stepped. The distance_traveled tempo variable of the game
+        x_speed, y_speed: Ship movement requested by the keys currently held down
+        done: True once the player quits or the ship is destroyed
+        destroyed: True once damage taken was more than the ship's shield level
+        hits, damage_taken: Number of hits and collisions the ship has taken, and their total damage
+        grid: SpatialHash of the attack hitboxes used as the collision broad phase, None to test against the
+            whole shots group
+        pixel_masks: True if rectangle hits are confirmed by pixel mask overlap
+        projectile_arrays: ProjectileArrays engine that enemies fire through, None when attacks are sprites
+        profiler: FrameProfiler that each phase of step is timed with
+        stage: StageScheduler spawning the enemies of the stage, None when spawning is off
+        fire_control: FireControl deciding the attacks of every enemy each frame
+        culler: Culler retiring the enemies and attacks that left the screen and choosing the ones to draw
+        render_queue: RenderQueue that everything drawn over the starfield is submitted to by draw
+
+        :param int seed: Master seed for the rng streams. A random seed is chosen if None
+        :param bool verbose: Print hits and collisions as they happen
+        :param bool spatial_hash: Use a uniform grid broad phase for collisions instead of pygame.sprite.spritecollide
+        :param bool projectile_arrays: Keep enemy attacks in a ProjectileArrays engine instead of sprites
+        :param profiler: FrameProfiler to time the phases of step with. Phases are not timed if None
+        :param bool spawning: Let the stage scheduler spawn enemies. Turned off by scenarios that place their own
+        :param stage: Name of the stage in the definitions file, or a StageSpec
+        :param bool pixel_masks: Confirm every rectangle hit on the ship with a pixel mask test of the ship's hull
+            against the enemy or attack image, so blank space around the art never collides
+        """
+        self.seed = rng.seed(seed)
+        enemies.empty()
+        attacks.empty()
+        shots.empty()
+        explosions.clear()
+        self.background = Background()
+        self.ship = Ship()
+        self.ship_hitbox = pygame.sprite.Group(self.ship.vertical_hitbox, self.ship.horizontal_hitbox)
+        self.frame = 1
+        self.x_speed, self.y_speed = 0, 0
+        self.done = False
+        self.destroyed = False
+        self.hits = self.damage_taken = 0
+        self.verbose = verbose
+        self.grid = SpatialHash() if spatial_hash else None
+        set_shot_index(self.grid)
+        self.pixel_masks = pixel_masks
+        self.projectile_arrays = ProjectileArrays() if projectile_arrays else None
+        set_projectile_engine(self.projectile_arrays)
+        self.profiler = profiler if profiler is not None else FrameProfiler(enabled=False)
+        self.stage = StageScheduler(stage) if spawning else None
+        self.fire_control = FireControl(rng.attack.getrandbits(64))
+        self.culler = Culler()
+        self.render_queue = RenderQueue()
+
+    @property
+    def time(self):
+        """Game time in seconds, counted in fixed timesteps."""
+        return (self.frame - 1) * TIMESTEP
+
+    def handle_event(self, event):
+        """
+        Apply a single keyboard or quit event to the game state.
+
+        :param event: pygame event from an input source
+        """
+        if event.type == pygame.QUIT:
+            self.done = True
+
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_LEFT:
+                self.x_speed = -4
+            elif event.key == pygame.K_RIGHT:
+                self.x_speed = 4
+            elif event.key == pygame.K_UP:
+                self.y_speed = -4
+            elif event.key == pygame.K_DOWN:
+                self.y_speed = 4
+            elif event.key == pygame.K_d:
+                self.ship.increase_shields()
+            elif event.key == pygame.K_a:
+                self.ship.decrease_shields()
+            elif event.key == pygame.K_w:
+                self.ship.overdrive()
+
+        elif event.type == pygame.KEYUP:
+            if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                self.x_speed = 0
+            elif event.key in (pygame.K_UP, pygame.K_DOWN):
+                self.y_speed = 0
+
+    def step(self):
+        """
+        Advance the game by one fixed timestep.
+
+        Moves the background and explosion animations, the player ship, the stage scheduler, every enemy and
+        every attack, tests collisions between the player ship hitboxes and enemy attacks/ships, then culls
+        whatever left the screen. Enemies spawn when the stage's timeline says so; the default stage starts after
+        the first 25 frames. Each of those phases is timed by the profiler. Nothing is drawn here; see draw.
+        """
+        lap = self.profiler.lap
+        self.background.advance()
+        explosions.advance()  # before collisions, so explosions started on this step are drawn from frame 0
+        lap('background')
+        self.ship.update(self.x_speed, self.y_speed, self.frame)
+        lap('ship')
+
+        if self.stage is not None:
+            self.stage.update(self.frame)
+        lap('stage')
+
+        for enemy in enemies:
+            enemy.update()
+        self.fire_control.update(enemies)
+        lap('enemies')
+
+        for attack in attacks:
+            attack.update()
+        if self.grid is not None:
+            self.grid.advance()
+        if self.projectile_arrays is not None:
+            self.projectile_arrays.update()
+        lap('attacks')
+
+        self.collide()
+        lap('collisions')
+        self.culler.update(self.projectile_arrays)
+        lap('culling')
+        self.frame += 1
+
+    def collide(self):
+        """
+        Test the player ship hitboxes against enemy ships and attacks and apply the resulting damage.
+
+        spritecollide returns a list of all sprites in a group that overlap the tested sprite (here, hitbox).
+        With the spatial hash broad phase, every attack hitbox is filed in the grid when it is fired and re-filed
+        only when it may have changed cells, so each ship hitbox only looks at the shots in nearby cells. The
+        few enemies are still tested with spritecollide.
+        With pixel_masks, the rectangle tests do not kill what they find. Each candidate is kept only if the
+        ship's hull mask overlaps its image mask (see collisions.masks_overlap), then killed. Attacks in the
+        projectile arrays have no image of their own and keep the rectangle test.
+        Must iterate through the lists in case more than 1 hit occurred in the last frame.
+        """
+        narrow = self.pixel_masks
+        for hitbox in self.ship_hitbox:
+            collisions = pygame.sprite.spritecollide(hitbox, enemies, not narrow)
+            if self.grid is None:
+                hits = pygame.sprite.spritecollide(hitbox, shots, not narrow)
+            else:
+                hits = self.grid.collide(hitbox, not narrow)
+            if narrow and (collisions or hits):
+                collisions = [enemy for enemy in collisions if masks_overlap(self.ship, enemy)]
+                hits = [shot for shot in hits if masks_overlap(self.ship, shot.parent)]
+                for sprite in collisions + hits:
+                    sprite.kill()
+            if self.projectile_arrays is not None:
+                hits.extend(self.projectile_arrays.collide(hitbox.rect))
+            for shot in hits:
+                shot_damage = shot if isinstance(shot, int) else shot.damage
+                if self.verbose:
+                    print('Hit, damage is', shot_damage)
+                self.damage(shot_damage)
+            for enemy in collisions:
+                if self.verbose:
+                    print('Collision, damage is', enemy.mass)
+                explosions.spawn((enemy.position[0] - enemy.explosion_offset[0],
+                                  enemy.position[1] - enemy.explosion_offset[1]))
+                self.damage(enemy.mass)
+
+    def damage(self, amount):
+        """Apply damage to the player ship and end the game if it is destroyed."""
+        self.hits += 1
+        self.damage_taken += amount
+        if self.ship.take_damage(amount):
+            self.destroyed = self.done = True
+
+    def draw(self, surface=None, dirty=None, alpha=1.0):
+        """
+        Draw the starfield, player ship, attacks, explosions and enemies, in that order from back to front.
+
+        Only the enemies and attacks that the culling pass of the last step found on screen are drawn. Everything
+        but the starfield is submitted to the render queue and drawn by its flush, one Surface.blits call per layer.
+        Drawing changes nothing, explosion animations included, so a game loop that renders faster than it steps
+        can draw the same step more than once, between its previous and current positions.
+
+        :param surface: Surface to draw on. Defaults to the main screen
+        :param dirty: List that the rect of everything drawn is appended to, for dirty rectangle rendering.
+            Ignored if None
+        :param float alpha: Fraction of the last step that moving things are drawn at, from 0 (where they were
+            before it) to 1 (where they are now), see timing.FixedTimestep
+        """
+        if surface is None:
+            surface = get_screen()
+        self.background.draw(surface, dirty, alpha)
+        culler = self.culler
+        queue = self.render_queue
+        self.ship.submit(queue, alpha)
+        if alpha >= 1:
+            queue.extend(ATTACKS, [(attack.image, attack.rect.center) for attack in culler.attacks])
+        else:
+            queue.extend(ATTACKS, [(attack.image, attack.interpolate(alpha).center) for attack in culler.attacks])
+        if self.projectile_arrays is not None:
+            self.projectile_arrays.submit(queue, alpha)
+        explosions.submit(queue)
+        if alpha >= 1:
+            queue.extend(ENEMIES, [(enemy.image, enemy.rect) for enemy in culler.enemies])
+        else:
+            queue.extend(ENEMIES, [(enemy.image, enemy.interpolate(alpha)) for enemy in culler.enemies])
+        queue.flush(surface, dirty)
+
+    def entity_counts(self):
+        """
+        :return: dict of the number of live entities in each sprite group and pool, and of the entities culled
+            (not drawn) and retired by the culling pass of the last step
+        """
+        counts = {'enemies': len(enemies), 'attacks': len(attacks), 'shots': len(shots),
+                  'explosions': len(explosions), 'stars': len(self.background),
+                  'culled': self.culler.culled, 'retired': self.culler.retired}
+        if self.projectile_arrays is not None:
+            counts['projectiles'] = len(self.projectile_arrays)
+        return counts
+
+    def snapshot(self):
+        """
+        :return: tuple describing the complete game state, for frame by frame comparison of two runs
+        """
+        ship = self.ship
+        return (self.frame, tuple(ship.position), ship.energy, ship.shield_level, ship.boost, ship.boost_timer,
+                self.done, self.destroyed,
+                tuple((enemy.kind, tuple(enemy.position), enemy.current_cooldown, enemy.lifetime)
+                      for enemy in enemies),
+                tuple((type(attack).__name__, tuple(attack.position)) for attack in attacks),
+                self.projectile_arrays.state[:, :len(self.projectile_arrays)].tobytes() if self.projectile_arrays else b'',
+                self.background.x.tobytes(), self.background.y.tobytes())
+
+    def state_hash(self):
+        """:return: Hex digest of the snapshot, a compact fingerprint of the game state"""
+        return hashlib.sha1(repr(self.snapshot()).encode()).hexdigest()
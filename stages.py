@@ -1,12 +1,113 @@
+"""
+Classes exported:
+1. StageScheduler: Plans the enemy spawns of a stage ahead of time and spawns the ones due each frame.
+"""
 
+import heapq
+import math
+import rng
+import definitions
+from enemies import enemies, BasicEnemy
 
-import random
-from enemies import BasicEnemy, Fighter
 
+class StageScheduler(object):
+    """
+    Spawn timeline of a stage.
 
-def game_manager(distance, player_position):
-    if random.randint(0, 1000) > 990:
-        spawn = BasicEnemy()
+    The waves of a stage definition are planned ahead into a priority queue of (frame, order, kind) spawn
+    events, lookahead frames at a time. Each frame, update pops only the events that are due, so scheduling
+    costs nothing on frames without spawns, and the spawn load of the coming frames can be read from the
+    queue ahead of time with timeline. Random waves draw their gaps from the rng spawn stream while planning,
+    so a seeded game plans the same timeline.
+
+    When the stage caps the number of enemies on screen and the cap is reached, due spawns are put off by the
+    stage's deferral frames instead of being dropped, so every planned enemy eventually appears.
+
+    Methods defined:
+    """
+
+    def __init__(self, stage='default'):
+        """
+        Attributes defined here:
+        queue: Heap of planned (frame, order, kind) spawn events. order keeps events of a frame in planning order
+        planned_until: Every spawn before this frame has been planned
+        spawned, deferred: Number of enemies spawned, and of spawns put off by the enemy cap
+
+        :param stage: StageSpec, or the name of a stage in the default definitions file
+        """
+        self.stage = definitions.stage_spec(stage) if isinstance(stage, str) else stage
+        self.queue = []
+        self.order = 0
+        self.planned_until = 0
+        # frame of each wave's next unplanned group. Random waves start with a random gap too
+        self.next_group = [self.next_start(wave, wave.start - 1) if wave.random else wave.start
+                           for wave in self.stage.waves]
+        self.spawned = 0
+        self.deferred = 0
+
+    def plan(self, until):
+        """
+        Add every spawn of every wave due before a frame to the queue.
+
+        :param int until: Frame to plan up to, excluded
+        """
+        for index, wave in enumerate(self.stage.waves):
+            start = self.next_group[index]
+            end = until if wave.end is None else min(until, wave.end)
+            while start is not None and start < end:
+                for member in range(wave.count):
+                    heapq.heappush(self.queue, (start + member * wave.spacing, self.order, wave.kind))
+                    self.order += 1
+                start = self.next_start(wave, start)
+            self.next_group[index] = start
+        self.planned_until = max(self.planned_until, until)
+
+    @staticmethod
+    def next_start(wave, start):
+        """
+        :return: Frame of the group of a wave after the one starting at start, None if the wave does not repeat
+        """
+        if wave.repeat is None:
+            return None
+        if wave.random:  # frames until a 1 in repeat chance per frame first succeeds
+            return start + 1 + int(math.log(1.0 - rng.spawn.random()) / math.log(1.0 - 1.0 / wave.repeat))
+        return start + wave.repeat
+
+    def update(self, frame):
+        """
+        Spawn the enemies due on a frame, planning further ahead first if the plan is running out.
+
+        :param int frame: Current frame number
+        :return: Number of enemies spawned
+        """
+        if frame + self.stage.lookahead > self.planned_until:
+            self.plan(frame + 2 * self.stage.lookahead)
+        queue = self.queue
+        cap = self.stage.max_enemies
+        spawned = 0
+        while queue and queue[0][0] <= frame:
+            event = heapq.heappop(queue)
+            if cap is not None and len(enemies) >= cap:
+                heapq.heappush(queue, (frame + self.stage.deferral, event[1], event[2]))
+                self.deferred += 1
+            else:
+                BasicEnemy(event[2])
+                spawned += 1
+        self.spawned += spawned
+        return spawned
+
+    def timeline(self, start, end):
+        """
+        Planned spawns over a range of frames, planning ahead as needed. Spawns put off later are not known yet.
+
+        :param int start: First frame of the range
+        :param int end: Frame after the last frame of the range
+        :return: Sorted list of (frame, kind) spawn events
+        """
+        if end > self.planned_until:
+            self.plan(end)
+        return [(frame, kind) for frame, order, kind in sorted(self.queue) if start <= frame < end]
+
+    def __len__(self):
+        return len(self.queue)
 
-    if random.randint(0, 1000) > 990:
-        spawn = Fighter()
\ No newline at end of file
@@ -0,0 +1,58 @@
+__author__ = 'erC'
+
+import unittest
+from assets import AssetCache, images, fonts
+from enemies import BasicEnemy, Fighter
+
+
+class TestAssetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.loads = []
+        self.cache = AssetCache(loader=self.loader, max_size=2)
+
+    def loader(self, key):
+        self.loads.append(key)
+        return [key]
+
+    def test_get_loads_once(self):
+        first = self.cache.get('a')
+        self.assertIs(self.cache.get('a'), first)
+        self.assertEqual(self.loads, ['a'])
+        self.assertEqual(self.cache.stats(), {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_lru_eviction(self):
+        self.cache.get('a')
+        self.cache.get('b')
+        self.cache.get('a')  # 'b' is now the least recently used
+        self.cache.get('c')
+        self.assertIn('a', self.cache)
+        self.assertNotIn('b', self.cache)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.evictions, 1)
+
+
+class TestImages(unittest.TestCase):
+
+    def test_shared_surfaces(self):
+        enemy = BasicEnemy()
+        misses = images.misses
+        other = BasicEnemy()
+        fighter = Fighter()
+        self.assertIs(enemy.image, other.image)
+        self.assertIsNot(enemy.image, fighter.image)
+        self.assertEqual(fighter.image.get_height(), 36)
+        self.assertLessEqual(images.misses, misses + 1)  # only second_enemy.png may be decoded here
+        self.assertEqual(enemy.image.get_colorkey()[:3], (0, 0, 0))
+
+
+class TestFonts(unittest.TestCase):
+
+    def test_font_resolved_once(self):
+        font = fonts.get(('Calibri', 18, True, False))
+        self.assertIs(fonts.get(('Calibri', 18, True, False)), font)
+        self.assertGreater(font.get_linesize(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,19 +1,8 @@
 __author__ = 'erC'
 
 import unittest
-from background_generator import Star, Background
-
-
-class TestStar(unittest.TestCase):
-
-    def setUp(self):
-        self.star = Star()
-        self.initial_star = Star(100)
-
-    def test_star(self):
-        self.assertGreater(self.star.rect.center[0], 0)
-        self.assertEqual(self.star.rect.center[1], 0)
-        self.assertEqual(self.initial_star.rect.center[1], 100)
+from background_generator import Background
+from variables import pygame, WHITE
 
 
 class TestBackground(unittest.TestCase):
@@ -24,14 +13,32 @@ class TestBackground(unittest.TestCase):
     def test_initialization(self):
         self.assertEqual(self.background.image.get_height(), 600)
         self.assertEqual(self.background.image.get_width(), 800)
-        self.assertGreater(len(self.background.stars), 10)
+        self.assertGreater(len(self.background), 10)
+        self.assertTrue((self.background.x >= 0).all() and (self.background.x < 800).all())
+        self.assertTrue((self.background.y >= 0).all() and (self.background.y < 600).all())
+
+    def test_density(self):
+        self.assertEqual(len(Background(density=1)), 600)
+        layered = Background(speeds=[0.5, 4])
+        self.assertTrue(set(layered.y_speed) <= {0.5, 4})
 
     def test_udpate_method(self):
-        stars = [star for star in self.background.stars]
-        origin = stars[0].rect.center[1]
-        self.background.update()
-        self.assertNotEqual(stars[0].rect.center[1], origin)
-        self.assertIn(stars[0], self.background.stars)
-        stars[0].rect.center = [100, 2000]
-        self.background.update()
-        self.assertNotIn(stars[0], self.background.stars)
+        origin = self.background.y[0]
+        self.background.y[1] = 2000  # push a star off the bottom of the screen
+        self.background.advance()
+        self.assertNotEqual(self.background.y[0], origin)
+        self.assertEqual(self.background.y[1], 0)  # respawned at the top pixel
+        self.assertEqual(len(self.background), len(self.background.x))
+
+    def test_draw_method(self):
+        surface = pygame.Surface((800, 600), depth=32)
+        self.background.draw(surface)
+        x, y = self.background.x[0], int(self.background.y[0])
+        self.assertEqual(surface.get_at((int(x), y))[:3], WHITE)
+        surface = pygame.Surface((800, 600), depth=24)
+        self.background.draw(surface)
+        self.assertEqual(surface.get_at((int(x), y))[:3], WHITE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+__author__ = 'erC'
+
+import unittest
+from collections import Counter
+import batch
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_pool_plays_the_same_games(self):
+        local = batch.run_batch(games=4, seed=5, frames=300, workers=1)
+        pooled = batch.run_batch(games=4, seed=5, frames=300, workers=2)
+        self.assertEqual(local['results'], pooled['results'])
+        self.assertEqual([game['seed'] for game in local['results']], [5, 6, 7, 8])
+        self.assertEqual(local['frames'], sum(game['frames'] for game in local['results']))
+        self.assertIn('collisions', local['frame_ms'])
+        self.assertLessEqual(local['frame_ms']['total']['p50'], local['frame_ms']['total']['p99'])
+
+    def test_play_game(self):
+        game = batch.play_game((8, 900, 'idle', None, 'default'))
+        self.assertTrue(game['destroyed'])  # seed 8 is destroyed on frame 545 when nobody flies the ship
+        self.assertEqual(game['frames'], 545)
+        self.assertGreater(game['hits'], 0)
+        self.assertGreaterEqual(game['damage'], game['hits'])
+        self.assertGreater(game['peaks']['enemies'], 0)
+        self.assertEqual(sum(game['costs']['total'].values()), 545)
+
+    def test_aggregate(self):
+        games = [{'frames': frames, 'destroyed': frames < 100, 'hits': hits, 'damage': 2 * hits,
+                  'peaks': {'enemies': hits}, 'costs': {'total': Counter({bin_: 1})}}
+                 for frames, hits, bin_ in [(50, 3, 1000), (100, 1, 2000), (80, 2, 3000), (100, 0, 4000)]]
+        report = batch.aggregate(games)
+        self.assertEqual(report['frames'], 330)
+        self.assertEqual(report['survival']['rate'], 0.5)
+        self.assertEqual(report['hits']['max'], 3)
+        self.assertEqual(report['damage']['mean'], 3.0)
+        self.assertEqual(report['peaks']['enemies']['max'], 3)
+        self.assertAlmostEqual(report['frame_ms']['total']['p50'], 3.0005)
+
+    def test_unknown_pilot(self):
+        self.assertRaises(ValueError, batch.make_pilot, 'autopilot', 1)
+        self.assertRaises(ValueError, batch.run_batch, pilot='script')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+__author__ = 'erC'
+
+import unittest
+import benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run_scenario(self):
+        result = benchmarks.run_scenario('enemies_50', frames=10)
+        self.assertEqual(result['frames'], 10)
+        self.assertGreater(result['fps'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+        self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+        self.assertGreater(result['peak_memory_kb'], 0)
+
+    def test_peak_memory_includes_setup(self):
+        small = benchmarks.run_scenario('enemies_50', frames=2)['peak_memory_kb']
+        large = benchmarks.run_scenario('enemies_500', frames=2)['peak_memory_kb']
+        self.assertGreater(large, small * 3)
+
+    def test_barrage_keeps_shots_on_screen(self):
+        from enemies import attacks
+        benchmarks.run_scenario('barrage_5000', frames=2, memory=False)
+        self.assertGreater(len(attacks), 4900)  # less the shots that hit the ship on the last frame
+
+    def test_compare(self):
+        baseline = {'scenarios': {'idle': {'fps': 1000.0, 'p95_ms': 1.0, 'peak_memory_kb': 10.0},
+                                  'removed': {'fps': 1000.0, 'p95_ms': 1.0, 'peak_memory_kb': 10.0}}}
+        same = {'scenarios': {'idle': {'fps': 950.0, 'p95_ms': 1.05, 'peak_memory_kb': 10.5}}}
+        self.assertEqual(benchmarks.compare(same, baseline, 0.10), [])
+        slower = {'scenarios': {'idle': {'fps': 800.0, 'p95_ms': 1.5, 'peak_memory_kb': None}}}
+        regressions = benchmarks.compare(slower, baseline, 0.10)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('idle: fps'))
@@ -0,0 +1,124 @@
+__author__ = 'erC'
+
+import unittest
+from assets import masks
+from collisions import SpatialHash, masks_overlap
+from enemies import Hitbox, BasicAttack, attacks
+from simulation import Simulation
+from variables import pygame
+
+
+class TestSpatialHash(unittest.TestCase):
+
+    def setUp(self):
+        self.group = pygame.sprite.Group()
+        for x in range(0, 800, 23):
+            for y in range(-40, 640, 37):
+                self.group.add(Hitbox(3, 8, x, y, 1))
+        self.group.add(Hitbox(120, 90, 300, 300, 2))  # larger than a grid cell
+        self.grid = SpatialHash(cell_size=64)
+        self.grid.rebuild(self.group)
+
+    def test_rebuild(self):
+        self.assertEqual(len(self.grid), len(self.group))
+        self.assertEqual(self.grid.extent, [60, 45])
+
+    def test_matches_spritecollide(self):
+        for rect in [(407, 452, 18, 67), (0, -10, 50, 11), (250, 250, 5, 5), (900, 900, 5, 5)]:
+            probe = Hitbox(rect[2], rect[3], rect[0], rect[1], 0)
+            expected = pygame.sprite.spritecollide(probe, self.group, False)
+            self.assertEqual(set(self.grid.collide(probe, False)), set(expected))
+
+    def test_dokill(self):
+        probe = Hitbox(18, 67, 407, 452, 0)
+        hits = self.grid.collide(probe, True)
+        self.assertTrue(hits)
+        for hit in hits:
+            self.assertNotIn(hit, self.group)
+        self.assertEqual(self.grid.collide(probe, True), [])  # killed sprites leave the grid
+        self.assertEqual(len(self.grid), len(self.group))
+
+    def test_moving_sprites_are_refiled(self):
+        grid = SpatialHash(cell_size=32)
+        group = pygame.sprite.Group()
+        for index in range(60):
+            attack = BasicAttack([(index * 53) % 800, (index * 97) % 600], [2, 2], 0, 1, 1, 5, 1)
+            attack.velocity.update((index % 7) - 3.5, (index % 5) * 1.7 - 4)
+            attack.hitbox.add(grid, group)
+        probes = [pygame.Rect(x, y, 40, 60) for x in range(-40, 840, 70) for y in range(-40, 640, 90)]
+        checked = 0
+        for step in range(120):
+            for attack in list(attacks):
+                attack.move(attack.velocity)
+            grid.advance()
+            for probe in probes:
+                expected = [hitbox for hitbox in group if probe.colliderect(hitbox.rect)]
+                self.assertEqual(set(grid.query(probe)), set(expected))
+                checked += len(expected)
+        self.assertGreater(checked, 100)
+        self.assertLess(grid.refiled, len(group))  # only the sprites that may have changed cells are looked at
+        for attack in list(attacks):
+            attack.kill()
+
+
+class TestSimulationBroadPhase(unittest.TestCase):
+
+    def test_same_game(self):
+        linear = Simulation(8)
+        linear_states = []
+        for frame in range(900):
+            linear.step()
+            linear_states.append(linear.snapshot())
+        grid = Simulation(8, spatial_hash=True)
+        for frame in range(900):
+            grid.step()
+            self.assertEqual(grid.snapshot(), linear_states[frame])
+        self.assertTrue(grid.destroyed)  # seed 8 is destroyed on frame 545
+
+
+class Placed(object):
+    """Sprite stand-in drawn at a fixed position"""
+
+    def __init__(self, image, position):
+        self.image = image
+        self.position = position
+
+    def placed_mask(self):
+        return masks.get(self.image), self.position
+
+
+class TestPixelMasks(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = pygame.Surface((20, 20))
+        self.ring.set_colorkey((0, 0, 0))
+        pygame.draw.circle(self.ring, (255, 0, 0), (10, 10), 10, 2)
+        self.dot = pygame.Surface((2, 2))
+        self.dot.fill((255, 0, 0))
+
+    def test_overlap(self):
+        self.assertTrue(masks_overlap(Placed(self.ring, (100, 100)), Placed(self.dot, (109, 100))))
+        self.assertFalse(masks_overlap(Placed(self.ring, (100, 100)), Placed(self.dot, (109, 109))))  # inside
+        self.assertFalse(masks_overlap(Placed(self.ring, (100, 100)), Placed(self.dot, (100, 100))))  # corner
+
+    def test_masks_built_once(self):
+        misses = masks.misses
+        for x in range(100):
+            masks_overlap(Placed(self.ring, (100, 100)), Placed(self.dot, (100 + x % 20, 105)))
+        self.assertEqual(masks.misses, misses + 2)
+
+    def test_fewer_hits(self):
+        counts = []
+        for pixel_masks in (False, True, True):
+            simulation = Simulation(1, pixel_masks=pixel_masks)
+            simulation.ship.shield_level = 10 ** 6  # keep playing after hits
+            for frame in range(1500):
+                simulation.step()
+            counts.append((simulation.hits, masks.misses))
+        self.assertGreater(counts[1][0], 0)
+        self.assertLessEqual(counts[1][0], counts[0][0])
+        self.assertEqual(counts[2], counts[1])  # the same game again builds no new masks
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+__author__ = 'erC'
+
+import math
+import unittest
+from culling import Culler
+from enemies import attacks, enemies, AngledAttack, BasicAttack, BasicEnemy
+from simulation import Simulation
+
+
+class TestCuller(unittest.TestCase):
+
+    def setUp(self):
+        attacks.empty()
+        enemies.empty()
+        self.culler = Culler()
+
+    def test_retires_shots_leaving_any_edge(self):
+        below = BasicAttack([100, 610], [2, 2], 0, 1, 1, 5, 1)
+        left = AngledAttack([-20, 300], [2, 2], -math.radians(30), 1, 1, 5, 1)  # drifting left
+        right = AngledAttack([-20, 300], [2, 2], math.radians(30), 1, 1, 5, 1)  # drifting back on screen
+        on_screen = BasicAttack([400, 300], [2, 2], 0, 1, 1, 5, 1)
+        self.assertEqual(self.culler.update(), 2)
+        self.assertNotIn(below, attacks)
+        self.assertNotIn(left, attacks)
+        self.assertIn(right, attacks)
+        self.assertEqual(self.culler.attacks, [on_screen])
+        self.assertEqual((self.culler.retired, self.culler.culled), (2, 1))
+
+    def test_enemy_introduction_is_not_drawn(self):
+        enemy = BasicEnemy()
+        enemy.place(400, -40)
+        self.culler.update()
+        self.assertIn(enemy, enemies)
+        self.assertEqual(self.culler.enemies, [])
+        enemy.place(400, 10)
+        self.culler.update()
+        self.assertEqual(self.culler.enemies, [enemy])
+        enemy.place(400, 700)
+        self.culler.update()
+        self.assertNotIn(enemy, enemies)
+
+    def test_margins(self):
+        shot = BasicAttack([100, 630], [2, 2], 0, 1, 1, 5, 1)  # drawn from y 623
+        Culler(draw_margin=30, retire_margin=50).update()
+        self.assertIn(shot, attacks)
+        culler = Culler(draw_margin=30, retire_margin=50)
+        shot.place(85, 640)
+        culler.update()
+        self.assertEqual((culler.retired, culler.culled), (0, 1))
+
+    def test_counts_reported(self):
+        simulation = Simulation(3)
+        retired = 0
+        for frame in range(1200):
+            simulation.step()
+            retired += simulation.entity_counts()['retired']
+        self.assertGreater(retired, 0)
+        self.assertIn('culled', simulation.entity_counts())
+
+
+if __name__ == '__main__':
+    unittest.main()
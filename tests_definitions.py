@@ -0,0 +1,72 @@
+__author__ = 'erC'
+
+import math
+import unittest
+import definitions
+from enemies import BasicEnemy, Fighter, BasicAttack, AngledAttack, PowerLaser, attack_pool, attacks
+from variables import BLUE
+
+
+class TestDefinitions(unittest.TestCase):
+
+    def setUp(self):
+        self.tables = definitions.tables.get(definitions.DEFINITIONS)
+
+    def test_attack_tables(self):
+        laser = self.tables.attacks['power_laser']
+        self.assertIs(laser.attack_class, PowerLaser)
+        self.assertEqual(laser.shape, (0, BLUE, 23, 3, (15, 14)))
+        self.assertEqual(laser.hitbox, (2, 17, 16, 28))
+        self.assertAlmostEqual(laser.velocity[1], 5.5)
+        right, left = self.tables.attacks['angled_right'], self.tables.attacks['angled_left']
+        self.assertAlmostEqual(right.velocity[0], -left.velocity[0])
+
+    def test_attack_hitbox(self):
+        attacks = self.tables.attacks
+        self.assertEqual(definitions.attack_hitbox(PowerLaser, 0), attacks['power_laser'].hitbox)
+        self.assertEqual(definitions.attack_hitbox(AngledAttack, math.radians(20)), attacks['angled_right'].hitbox)
+        self.assertEqual(definitions.attack_hitbox(AngledAttack, -math.radians(45)), attacks['angled_left'].hitbox)
+        self.assertEqual(BasicAttack([10, 10], [2, 2], 0, 1, 1, 5, 1).hitbox.offset, (15, 30))
+        self.assertRaises(KeyError, definitions.attack_hitbox, type('Undefined', (BasicAttack,), {}), 0)
+
+    def test_launch_matches_arguments(self):
+        spec = self.tables.attacks['angled_right']
+        launched = attack_pool.launch(spec, (100, 100))
+        built = AngledAttack((100, 100), [15, 14], math.radians(30), 6, 1, 15, 1)
+        self.assertIsInstance(launched, AngledAttack)
+        self.assertIn(launched, attacks)
+        self.assertEqual(launched.position, built.position)
+        self.assertEqual(launched.velocity, built.velocity)
+        self.assertIs(launched.image, built.image)
+        self.assertEqual(launched.hitbox.rect, built.hitbox.rect)
+        created = AngledAttack.from_spec(spec, (100, 100))
+        self.assertEqual(created.rect, built.rect)
+        self.assertEqual(created.hitbox.rect, built.hitbox.rect)
+        self.assertEqual(created.hitbox.offset, built.hitbox.offset)
+
+    def test_enemy_kinds(self):
+        fighter = Fighter()
+        self.assertEqual(fighter.kind, 'fighter')
+        self.assertEqual(fighter.mass, 2)
+        self.assertEqual(fighter.rect.size, (27, 31))
+        same = BasicEnemy('fighter')
+        self.assertIs(same.image, fighter.image)
+        self.assertEqual(BasicEnemy().spec.patterns[0].volley[0][0].attack_class, BasicAttack)
+
+    def test_compile_new_kind(self):
+        data = {'attacks': {'slug': {'class': 'BasicAttack', 'offset': [15, 14], 'angle': 0, 'speed': 2, 'damage': 4,
+                                     'line_length': 10, 'line_width': 5, 'color': 'YELLOW', 'hitbox': [5, 10, 15, 30]}},
+                'enemies': {'frigate': {'image': 'first_enemy.png', 'mass': 5, 'attack_cooldown': 80, 'lifetime': 600,
+                                        'explosion_offset': [15, 12], 'roll': [1, 10],
+                                        'patterns': [{'rolls': [10, 10], 'volley': [['slug', [0, 0]], ['slug', [8, 0]]],
+                                                      'cooldown': 120}]}}}
+        frigate = definitions.compile_definitions(data).enemies['frigate']
+        self.assertEqual(frigate.mass, 5)
+        self.assertIsNone(frigate.rect)
+        self.assertEqual(frigate.patterns[0].cooldown, 120)
+        self.assertEqual(len(frigate.patterns[0].volley), 2)
+        self.assertEqual(frigate.patterns[0].volley[0][0].damage, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
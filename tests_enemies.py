@@ -2,6 +2,7 @@ __author__ = 'erC'
 
 import unittest
 from enemies import *
+from culling import Culler
 
 class TestHitbox(unittest.TestCase):
     def setUp(self):
@@ -28,7 +29,17 @@ class TestBasicAttack(unittest.TestCase):
     def test_calc_and_draw_method(self):
         self.assertEqual(self.attack.velocity[0], 0)
         self.assertEqual(self.attack.velocity[1], 1.1)  # Method was already run in init, test if it changed velocity
-        self.assertAlmostEqual(self.attack.line_terminus, [2, 7], places=1)
+        self.assertAlmostEqual(self.attack.line_terminus[0], 2, places=1)
+        self.assertAlmostEqual(self.attack.line_terminus[1], 7, places=1)
+
+    def test_shape_cache(self):
+        same = BasicAttack([50, 50], [2, 2], 0, 3, 1, 5, 1)
+        other = BasicAttack([10, 10], [2, 2], 0, 1, 1, 6, 1)
+        self.assertIs(same.image, self.attack.image)
+        self.assertIsNot(other.image, self.attack.image)
+        self.assertAlmostEqual(same.velocity[1], 3.3)
+        self.assertIn((0, RED, 5, 1, (2, 2)), attack_shapes)
+        self.assertGreaterEqual(attack_shapes.stats()['size'], 2)
 
     def test_update_method(self):
         old_position = self.attack.position[:]
@@ -38,8 +49,10 @@ class TestBasicAttack(unittest.TestCase):
         self.assertNotEqual(self.attack.position, self.attack.rect.center)  # should be different due to int rounding
         self.assertIn(self.attack.hitbox, shots)
         self.assertIn(self.attack, attacks)
-        self.attack.position = [2000, 2000]
-        self.attack.update()  # shove the sprite way off screen, make sure the kill method runs
+        self.attack.position.update(2000, 2000)
+        self.attack.update()  # shove the sprite way off screen, it is left to the culling pass
+        self.assertIn(self.attack, attacks)
+        Culler().update()
         self.assertNotIn(self.attack, attacks)
 
 
@@ -70,6 +83,37 @@ class TestPowerLaser(unittest.TestCase):
         self.assertEqual(self.power.hitbox.image.get_width(), 2)
 
 
+class TestProjectilePool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ProjectilePool()
+
+    def test_reuse(self):
+        first = self.pool.fire(PowerLaser, [10, 10], [2, 2], 0, 1, 1, 5, 1, BLUE)
+        hitbox = first.hitbox
+        first.kill()
+        self.assertNotIn(first, attacks)
+        self.assertNotIn(hitbox, shots)
+        attack_pool.free[PowerLaser].remove(first)  # kill returns attacks to the module attack pool
+        self.pool.release(first)
+        second = self.pool.fire(PowerLaser, [50, 50], [2, 2], 0, 2, 2, 5, 1, BLUE)
+        self.assertIs(second, first)
+        self.assertIs(second.hitbox, hitbox)
+        self.assertIn(second, attacks)
+        self.assertIn(hitbox, shots)
+        self.assertEqual(hitbox.damage, 2)
+        self.assertEqual(hitbox.rect.center, (51, 71))
+        self.assertEqual(self.pool.stats()['created'], 1)
+        self.assertEqual(self.pool.stats()['reused'], 1)
+
+    def test_release_once(self):
+        attack = BasicAttack([10, 10], [2, 2], 0, 1, 1, 5, 1)
+        free = len(attack_pool.free.get(BasicAttack, []))
+        attack.kill()
+        attack.kill()
+        self.assertEqual(len(attack_pool.free[BasicAttack]), free + 1)
+
+
 class TestBasicEnemy(unittest.TestCase):
 
     def setUp(self):
@@ -86,11 +130,11 @@ class TestBasicEnemy(unittest.TestCase):
         self.assertIsInstance(self.enemy.lifetime, int)
 
     def test_intro_method(self):
-        first_position = self.enemy.position
+        first_position = self.enemy.position.copy()
         self.enemy.intro()
         self.assertNotEqual(self.enemy.position, first_position)
         self.assertTrue(self.enemy.introduction)
-        self.enemy.position = [50, 300]  # skip to a position past the introduction point and run into again
+        self.enemy.position.update(50, 300)  # skip to a position past the introduction point and run into again
         self.enemy.intro()
         self.assertFalse(self.enemy.introduction)
 
@@ -113,8 +157,9 @@ class TestBasicEnemy(unittest.TestCase):
         self.enemy.introduction = False
         self.enemy.update()
         self.assertEqual(self.enemy.position[1], -20.5)
-        self.enemy.position = [50, 10000]  # push it far off screen, update should now kill the sprite
+        self.enemy.position.update(50, 10000)  # push it far off screen, culling should now kill the sprite
         self.enemy.update()
+        Culler().update()
         self.assertNotIn(self.enemy, enemies)
 
 
@@ -133,28 +178,122 @@ class TestFighter(unittest.TestCase):
         pass
 
 
+class TestFireControl(unittest.TestCase):
+
+    def setUp(self):
+        enemies.empty()
+        attacks.empty()
+        shots.empty()
+        self.control = FireControl(seed=4)
+        self.basic = BasicEnemy()
+        self.fighter = Fighter()
+        self.waiting = BasicEnemy()
+        for enemy in (self.basic, self.fighter):
+            enemy.introduction = False
+            enemy.current_cooldown = 0
+
+    def tearDown(self):
+        enemies.empty()
+
+    def test_cooldowns(self):
+        self.control.update()
+        self.assertEqual(self.waiting.current_cooldown, 1000)  # enemies in their introduction are left alone
+        self.assertIn(self.basic.current_cooldown, (-1, 50))
+        self.basic.current_cooldown = 5
+        self.fighter.current_cooldown = 5
+        self.assertEqual(self.control.update(), 0)
+        self.assertEqual(self.basic.current_cooldown, 4)
+
+    def test_fire_rates(self):
+        fired = {'basic': 0, 'fighter': 0}
+        lasers = 0
+        for frame in range(20000):
+            for enemy in (self.basic, self.fighter):
+                enemy.current_cooldown = 0
+            fired_before = self.control.fired
+            self.control.update()
+            for enemy in (self.basic, self.fighter):
+                if enemy.current_cooldown > 0:
+                    fired[enemy.kind] += 1
+            if self.fighter.current_cooldown == 30:
+                lasers += 1
+            if self.control.fired > fired_before:
+                attacks.empty()
+                shots.empty()
+        self.assertAlmostEqual(fired['basic'] / 20000, 1 / 101, delta=0.003)  # a roll of 100 in 0-100
+        self.assertAlmostEqual(fired['fighter'] / 20000, 36 / 1000, delta=0.006)  # 965-1000 in 1-1000
+        self.assertAlmostEqual(lasers / 20000, 15 / 1000, delta=0.004)  # 986-1000 fire the power laser
+
+
 class TestDrawExplosions(unittest.TestCase):
 
     def setUp(self):
         self.boom = DrawExplosions([100, 100])
 
     def test_initialization(self):
-        self.assertEqual(self.boom.explosion_array.get_height(), 300)
-        self.assertEqual(self.boom.explosion_array.get_width(), 320)  # Make sure the correct size image is loaded
-        self.assertLess(self.boom.frame_offset[0], 0)
-        self.assertLess(self.boom.frame_offset[1], 0)
-        self.assertGreater(self.boom.destruction_timer, 0)
-
-    def test_draw_method(self):
-        self.assertEqual(self.boom.frame_offset, [-100, -10])
-        self.boom.draw()
-        self.assertEqual(self.boom.frame_offset, [-180, -10])
-
-    def test_calculate_offset(self):
-        self.assertEqual(self.boom.frame_offset, [-100, -10])
-        self.boom.frame_offset = [-400, -70]
-        self.boom.draw()
-        self.assertEqual(self.boom.frame_offset, [-20, -70])
+        self.assertEqual(len(DrawExplosions.frames), 20)
+        self.assertIsInstance(DrawExplosions.frames, tuple)
+        self.assertEqual(DrawExplosions.frames[0].get_size(), (40, 40))  # Make sure the frames are sliced correctly
+        self.assertEqual(self.boom.frame, 0)
+        self.assertIs(DrawExplosions([0, 0]).frames, self.boom.frames)
+
+    def test_submit_and_advance(self):
+        from rendering import RenderQueue, EXPLOSIONS
+        pool = ExplosionPool()
+        pool.active.append(self.boom)
+        queue = RenderQueue()
+        pool.submit(queue)
+        self.assertEqual(queue.layers[EXPLOSIONS], [(DrawExplosions.frames[0], [100, 100])])
+        pool.advance()
+        self.assertEqual(self.boom.frame, 1)
+        self.boom.frame = 19
+        pool.advance()  # last frame drawn
+        self.assertEqual(pool.active, [])
+
+
+class TestExplosionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ExplosionPool()
+
+    def test_spawn_and_recycle(self):
+        first = self.pool.spawn((10, 10))
+        self.pool.spawn((20, 20))
+        self.assertEqual(len(self.pool), 2)
+        for frame in range(19):
+            self.pool.advance()
+        self.assertEqual(len(self.pool), 2)
+        self.pool.advance()
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(len(self.pool.free), 2)
+        reused = self.pool.spawn((30, 30))
+        self.assertIn(reused, [first, self.pool.active[0]])
+        self.assertEqual(reused.frame, 0)
+        self.assertEqual(reused.position, (30, 30))
+        self.assertEqual(len(self.pool.free), 1)
+
+    def test_finished_explosions_are_removed_in_order(self):
+        old = self.pool.spawn((10, 10))
+        old.frame = 19
+        new = self.pool.spawn((20, 20))
+        self.pool.advance()
+        self.assertEqual(self.pool.active, [new])
+        self.assertEqual(self.pool.free, [old])
+
+    def test_submit(self):
+        from rendering import RenderQueue, EXPLOSIONS
+        queue = RenderQueue()
+        old = self.pool.spawn((10, 10))
+        old.frame = 19
+        new = self.pool.spawn((20, 20))
+        self.pool.submit(queue)
+        self.pool.submit(queue)  # drawing twice does not advance the animations
+        self.assertEqual(queue.layers[EXPLOSIONS], [(DrawExplosions.frames[19], (10, 10)),
+                                                    (DrawExplosions.frames[0], (20, 20))] * 2)
+        self.pool.advance()
+        self.assertEqual(self.pool.active, [new])
+        self.assertEqual(new.frame, 1)
+        self.assertEqual(self.pool.free, [old])
 
 if __name__ == '__main__':
     unittest.main()
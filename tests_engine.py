@@ -0,0 +1,36 @@
+__author__ = 'erC'
+
+import os
+import subprocess
+import sys
+import unittest
+from engine import Game
+
+
+class TestImports(unittest.TestCase):
+
+    def test_import_opens_no_window(self):
+        code = ('import pygame, variables, ship, enemies, simulation, main\n'
+                'assert variables.screen is None and pygame.display.get_surface() is None\n'
+                'assert not hasattr(ship, "ship")\n')
+        env = dict(os.environ, SDL_VIDEODRIVER='dummy')
+        subprocess.check_call([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+
+
+class TestGame(unittest.TestCase):
+
+    def test_start(self):
+        game = Game(seed=5).start()
+        self.assertIsNotNone(game.screen)
+        self.assertEqual(game.simulation.seed, 5)
+        self.assertEqual(list(game.startup), ['import', 'display', 'assets', 'state'])
+        game.frame_done()
+        game.frame_done()
+        report = game.startup_report()
+        self.assertIn('first_frame', report)
+        self.assertAlmostEqual(report['init'], report['display'] + report['assets'] + report['state'])
+        self.assertAlmostEqual(report['total'], report['import'] + report['init'] + report['first_frame'])
+
+
+if __name__ == '__main__':
+    unittest.main()
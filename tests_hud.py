@@ -0,0 +1,42 @@
+__author__ = 'erC'
+
+import unittest
+from hud import HUD
+from variables import pygame, BLUE
+
+
+class TestHUD(unittest.TestCase):
+
+    def setUp(self):
+        self.hud = HUD()
+
+    def test_format(self):
+        self.assertEqual(HUD.format(100, 5, 1), ('Energy: MAX', 'Shield Level: MAX', 'Overdrive:  Disabled'))
+        self.assertEqual(HUD.format(42, 3, 2), ('Energy: 42', 'Shield Level: 3', 'Overdrive:  Enabled'))
+
+    def test_rendered_only_on_change(self):
+        surface = pygame.Surface((800, 600))
+        for frame in range(10):
+            self.hud.draw(surface, 100, 0, 1)
+        self.assertEqual(self.hud.renders, 1)
+        self.hud.draw(surface, 99, 0, 1)
+        self.hud.draw(surface, 100, 0, 1)
+        self.assertEqual(self.hud.renders, 3)
+        self.assertEqual(self.hud.texts.stats()['misses'], 4)  # the energy text was rendered once per value
+
+    def test_matches_separate_text_blits(self):
+        font = self.hud.font
+        expected = pygame.Surface((800, 600))
+        expected.fill(BLUE)
+        for text, column in zip(HUD.format(57, 2, 1), HUD.columns):
+            expected.blit(font.render(text, True, self.hud.color), (column, 570))
+        surface = pygame.Surface((800, 600))
+        surface.fill(BLUE)
+        drawn = self.hud.draw(surface, 57, 2, 1)
+        self.assertEqual(pygame.image.tostring(surface, 'RGB'), pygame.image.tostring(expected, 'RGB'))
+        self.assertEqual(drawn.left, HUD.columns[0])
+        self.assertEqual(drawn.top, 570)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+__author__ = 'erC'
+
+import unittest
+from inputs import ScriptedInput, RandomWalkPilot
+from variables import pygame
+
+
+class TestScriptedInput(unittest.TestCase):
+
+    def setUp(self):
+        self.script = ScriptedInput({5: [(pygame.KEYDOWN, pygame.K_LEFT)], 9: [(pygame.QUIT, None)]})
+
+    def test_get(self):
+        self.assertEqual(list(self.script.get(1)), [])
+        events = self.script.get(5)
+        self.assertEqual(events[0].type, pygame.KEYDOWN)
+        self.assertEqual(events[0].key, pygame.K_LEFT)
+        self.assertEqual(self.script.get(9)[0].type, pygame.QUIT)
+
+    def test_add(self):
+        self.script.add(5, (pygame.KEYUP, pygame.K_LEFT))
+        self.assertEqual([event.type for event in self.script.get(5)], [pygame.KEYDOWN, pygame.KEYUP])
+        self.assertEqual(self.script.last_frame(), 9)
+
+
+class TestRandomWalkPilot(unittest.TestCase):
+
+    def test_seeded(self):
+        first, second = RandomWalkPilot(4), RandomWalkPilot(4)
+        for frame in range(1, 300):
+            self.assertEqual([(event.type, event.key) for event in first.get(frame)],
+                             [(event.type, event.key) for event in second.get(frame)])
+
+    def test_releases_held_keys(self):
+        pilot = RandomWalkPilot(9, hold=5)
+        held = set()
+        for frame in range(1, 500):
+            for event in pilot.get(frame):
+                if event.type == pygame.KEYUP:
+                    held.remove(event.key)
+                elif event.key not in RandomWalkPilot.actions:
+                    held.add(event.key)
+            self.assertEqual(held, set(pilot.held))
+            self.assertLessEqual(len(held), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
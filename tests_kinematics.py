@@ -0,0 +1,71 @@
+__author__ = 'erC'
+
+import tracemalloc
+import unittest
+from enemies import BasicAttack, BasicEnemy
+from ship import Ship
+
+
+class TestKinematic(unittest.TestCase):
+
+    def setUp(self):
+        self.ship = Ship()
+
+    def test_hitboxes_follow_by_offset(self):
+        hitbox = self.ship.vertical_hitbox
+        self.assertEqual(hitbox.offset, (62, 52))
+        for frame in range(40):
+            self.ship.update(3, -3, frame + 1)  # diagonal speed of 2.334 pixels per frame
+        self.assertEqual(hitbox.position, self.ship.position + hitbox.offset)
+        self.assertEqual(hitbox.rect.center, (int(self.ship.position[0] + 62.5),
+                                             int(self.ship.position[1] + 52.5)))
+        self.assertAlmostEqual(self.ship.position[0], 345 + 40 * 2.334)  # no sub-pixel motion is lost
+
+    def test_attack_hitbox_offset_reset(self):
+        attack = BasicAttack([10, 10], [2, 2], 0, 1, 1, 5, 1)
+        self.assertEqual(attack.hitbox.offset, (15, 30))
+        attack.update()
+        self.assertEqual(attack.hitbox.position, attack.position + (15, 30))
+
+    def test_moves_in_place(self):
+        attack = BasicAttack([10, 10], [2, 2], 0, 1, 1, 5, 1)
+        enemy = BasicEnemy()
+        enemy.introduction = False
+        vectors = [vector for sprite in (self.ship, self.ship.vertical_hitbox, attack, attack.hitbox, enemy)
+                   for vector in (sprite.position, getattr(sprite, 'velocity', None))]
+        for frame in range(5):  # warm up
+            self.ship.update_position(1.5, -0.5)
+            attack.move(attack.velocity)
+            enemy.move(enemy.velocity)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for frame in range(2000):
+            self.ship.update_position(1.5, -0.5 if frame % 2 else 0.5)
+            attack.move(attack.velocity)
+            enemy.move(enemy.velocity)
+        grown = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        self.assertLess(grown, 1024)  # nothing is kept per frame
+        self.assertEqual(vectors, [vector for sprite in (self.ship, self.ship.vertical_hitbox, attack, attack.hitbox,
+                                                         enemy)
+                                   for vector in (sprite.position, getattr(sprite, 'velocity', None))])
+
+    def test_interpolate(self):
+        attack = BasicAttack([10, 10], [2, 2], 0, 1, 1, 5, 1)
+        start = attack.position.copy()
+        self.assertEqual(attack.interpolate(0.5).center, attack.rect.center)  # just placed, nothing to slide from
+        attack.move((4, -3))
+        self.assertEqual(attack.interpolate(0).center, attack.rect.move(-4, 3).center)
+        self.assertEqual(attack.interpolate(1), attack.rect)
+        self.assertEqual(attack.interpolate(0.5).center, (round(start[0] + 2), round(start[1] - 1.5)))
+
+    def test_stopped_ship_is_not_interpolated(self):
+        self.ship.update_position(2, 0)
+        self.assertEqual(self.ship.previous + (2, 0), self.ship.position)
+        self.ship.update_position(-1000, 0)
+        self.ship.update_position(-1, 0)  # stopped by the screen edge
+        self.assertEqual(self.ship.previous, self.ship.position)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,30 @@ __author__ = 'erC'
 
 import unittest
 import main
+import definitions
+from enemies import DrawExplosions, attack_shapes
+from inputs import ScriptedInput
+from ship import Ship
+from variables import pygame
 
 
+class TestHeadlessMain(unittest.TestCase):
 
+    def test_scripted_quit(self):
+        report = main.main(inputs=ScriptedInput({10: [(pygame.QUIT, None)]}), headless=True, render=False)
+        self.assertEqual(report['frames'], 10)
+        self.assertFalse(report['destroyed'])
+        self.assertGreater(report['fps'], 0)
 
+    def test_restart_in_process(self):
+        for run in range(2):  # the second game must not reuse fonts or images of the closed display
+            report = main.main(inputs=ScriptedInput(), frames=20, seed=5)
+            self.assertEqual(report['frames'], 20)
+            self.assertIsNone(Ship.shield_levels)  # stop dropped the surfaces built for the closed display
+            self.assertIsNone(DrawExplosions.frames)
+            self.assertEqual(len(attack_shapes), 0)
+            self.assertEqual(len(definitions.tables), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
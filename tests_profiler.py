@@ -0,0 +1,68 @@
+__author__ = 'erC'
+
+import json
+import os
+import tempfile
+import unittest
+from profiler import FrameProfiler, percentile
+from variables import pygame
+
+
+class TestPercentile(unittest.TestCase):
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 51)
+        self.assertEqual(percentile(values, 0.99), 100)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = FrameProfiler(history=3)
+        for frame in range(5):
+            self.profiler.begin_frame(frame)
+            self.profiler.lap('update')
+            self.profiler.lap('draw')
+            self.profiler.lap('update')
+            self.profiler.end_frame({'enemies': frame})
+
+    def test_history(self):
+        self.assertEqual(len(self.profiler.records), 3)
+        self.assertEqual(len(self.profiler.phases['update']), 3)
+        self.assertEqual(set(self.profiler.percentiles()), {'update', 'draw', 'total'})
+        self.assertEqual([row['frame'] for row in self.profiler.rows()], [2, 3, 4])
+        self.assertEqual(self.profiler.rows()[-1]['enemies'], 4)
+
+    def test_disabled(self):
+        profiler = FrameProfiler(enabled=False)
+        profiler.begin_frame(1)
+        profiler.lap('update')
+        profiler.end_frame({'enemies': 1})
+        self.assertEqual(len(profiler.records), 0)
+
+    def test_dump(self):
+        directory = tempfile.mkdtemp()
+        csv_path = os.path.join(directory, 'frames.csv')
+        ndjson_path = os.path.join(directory, 'frames.ndjson')
+        self.profiler.dump(csv_path)
+        self.profiler.dump(ndjson_path)
+        with open(csv_path) as csv_file:
+            self.assertEqual(csv_file.readline().strip(), 'frame,total_ms,update_ms,draw_ms,enemies')
+        with open(ndjson_path) as ndjson_file:
+            self.assertEqual(json.loads(ndjson_file.readlines()[-1])['frame'], 4)
+
+    def test_overlay(self):
+        surface = pygame.Surface((800, 600))
+        self.profiler.draw_overlay(surface)
+        self.assertIsNone(self.profiler.overlay)
+        self.profiler.toggle_overlay()
+        self.profiler.draw_overlay(surface)
+        overlay = self.profiler.overlay
+        self.profiler.draw_overlay(surface)
+        self.assertIs(self.profiler.overlay, overlay)  # not rendered again until the refresh interval has passed
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+__author__ = 'erC'
+
+import unittest
+import enemies
+from enemies import BasicAttack, AngledAttack, PowerLaser
+from projectile_arrays import ProjectileArrays
+from rendering import RenderQueue, ATTACKS
+from simulation import Simulation
+from variables import pygame, BLUE
+
+
+class TestProjectileArrays(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ProjectileArrays(capacity=2)
+
+    def test_fire_matches_sprites(self):
+        for attack_class, args in [(BasicAttack, ([10, 10], [2, 2], 0, 1, 1, 5, 1)),
+                                   (AngledAttack, ([10, 10], [2, 2], -0.5, 1, 1, 5, 1, BLUE)),
+                                   (PowerLaser, ([10, 10], [2, 2], 0, 1, 1, 5, 1, BLUE))]:
+            sprite = attack_class(*args)
+            self.engine.fire(attack_class, *args)
+            for frame in range(3):
+                sprite.update()
+            sprite.kill()
+            self.engine.update()
+            self.engine.update()
+            self.engine.update()
+            self.assertAlmostEqual(self.engine.positions()[0, -1], sprite.position[0])
+            self.assertAlmostEqual(self.engine.positions()[1, -1], sprite.position[1])
+            self.assertEqual(self.engine.collide(sprite.hitbox.rect), [1])
+        self.assertEqual(self.engine.stats(), {'live': 0, 'capacity': 2, 'shapes': 3})
+
+    def test_cull(self):
+        screen = pygame.Rect(0, 0, 800, 600)
+        self.engine.fire(BasicAttack, [10, 590], [2, 2], 0, 10, 1, 5, 1)
+        self.engine.fire(BasicAttack, [10, 10], [2, 2], 0, 10, 1, 5, 1)
+        self.engine.fire(BasicAttack, [100, -70], [2, 2], 0, 10, 1, 5, 1)
+        self.engine.update()
+        self.assertEqual(self.engine.cull(screen, screen), (0, 1))  # the last attack is still above the screen
+        self.engine.update()
+        self.assertEqual(self.engine.cull(screen, screen), (1, 0))  # the first attack ran off the screen
+        self.assertEqual(len(self.engine), 2)
+        self.assertEqual(self.engine.positions()[1, 0], 25)
+        self.assertEqual(self.engine.visible.tolist(), [True, True])
+
+    def test_collide_rect(self):
+        self.engine.fire(BasicAttack, [100, 100], [2, 2], 0, 1, 3, 5, 1)
+        self.assertEqual(self.engine.collide(pygame.Rect(0, 0, 50, 50)), [])
+        self.assertEqual(self.engine.collide(pygame.Rect(90, 115, 20, 20)), [3])
+        self.assertEqual(len(self.engine), 0)
+
+    def test_submit(self):
+        self.engine.fire(BasicAttack, [100, 100], [2, 2], 0, 10, 1, 5, 1)
+        queue = RenderQueue()
+        self.engine.submit(queue)
+        self.assertEqual(queue.layers[ATTACKS], [(self.engine.images[0], (85, 93))])  # same layer as sprites
+        queue.layers[ATTACKS].clear()
+        self.engine.update()
+        self.engine.submit(queue, alpha=0.5)
+        self.assertEqual(queue.layers[ATTACKS][0][1], (85, 99))  # 104 less half its speed of 11, rounded
+
+    def test_capacity_grows(self):
+        for shot in range(5):
+            self.engine.fire(BasicAttack, [shot, 10], [2, 2], 0, 1, 1, 5, 1)
+        self.assertEqual(self.engine.stats()['capacity'], 8)
+        self.assertEqual(list(self.engine.positions()[0]), [-15, -14, -13, -12, -11])
+
+
+class TestSimulationArrays(unittest.TestCase):
+
+    def tearDown(self):
+        enemies.set_projectile_engine(None)
+
+    def test_same_game_as_sprites(self):
+        results = []
+        for arrays in (False, True):
+            simulation = Simulation(7, projectile_arrays=arrays)
+            results.append([])
+            for frame in range(900):
+                simulation.step()
+                shots = len(simulation.projectile_arrays) if arrays else len(enemies.shots)
+                results[-1].append((simulation.ship.shield_level, simulation.destroyed, shots))
+        self.assertEqual(results[0], results[1])
+        self.assertIs(enemies.projectiles, simulation.projectile_arrays)
+
+
+if __name__ == '__main__':
+    unittest.main()
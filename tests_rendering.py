@@ -0,0 +1,83 @@
+__author__ = 'erC'
+
+import hashlib
+import unittest
+from rendering import Renderer, RenderQueue, SHIP, ENEMIES
+from simulation import Simulation
+from variables import pygame, BLACK, WHITE
+
+
+class TestRenderer(unittest.TestCase):
+
+    def play(self, dirty_rects, frames=300):
+        """Play a seeded game on an offscreen surface and return a digest of the surface after every frame."""
+        surface = pygame.Surface((800, 600))
+        renderer = Renderer(surface, dirty_rects)
+        simulation = Simulation(seed=7)
+        simulation.ship.shield_level = 10 ** 9
+        digests = []
+        for frame in range(frames):
+            renderer.clear()
+            simulation.step()
+            simulation.draw(surface, renderer.rects)
+            renderer.present(update_display=False)
+            digests.append(hashlib.sha1(pygame.image.tostring(surface, 'RGB')).hexdigest())
+        return digests, renderer
+
+    def test_dirty_rects_match_full_frames(self):
+        full, full_renderer = self.play(False)
+        dirty, dirty_renderer = self.play(True)
+        self.assertEqual(full, dirty)
+        self.assertEqual(full_renderer.mean_area(), 800 * 600)
+        self.assertLess(dirty_renderer.mean_area(), 800 * 600 / 4)
+
+    def test_clear_and_present(self):
+        surface = pygame.Surface((100, 100))
+        renderer = Renderer(surface, dirty_rects=True)
+        renderer.clear()
+        renderer.add(surface.fill(WHITE, (10, 10, 5, 5)))
+        renderer.add(None)
+        self.assertEqual(renderer.present(update_display=False), 100 * 100)  # the first frame is pushed whole
+        renderer.clear()
+        self.assertEqual(surface.get_at((12, 12))[:3], BLACK)
+        renderer.add(surface.fill(WHITE, (50, 50, 2, 2)))
+        self.assertEqual(renderer.present(update_display=False), 25 + 4)
+        renderer.clear()
+        renderer.add(surface.fill(WHITE))
+        self.assertEqual(renderer.present(update_display=False), 100 * 100)  # too large for dirty rects
+        self.assertEqual(renderer.full_updates, 2)
+
+
+class TestRenderQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.surface = pygame.Surface((100, 100))
+        self.red = pygame.Surface((10, 10))
+        self.red.fill((255, 0, 0))
+        self.white = pygame.Surface((10, 10))
+        self.white.fill(WHITE)
+
+    def test_layer_order(self):
+        queue = RenderQueue()
+        queue.submit(ENEMIES, self.white, (5, 5))
+        queue.submit(SHIP, self.red, (0, 0))
+        queue.extend(SHIP, [(self.red, pygame.Rect(20, 20, 10, 10))])
+        self.assertEqual(len(queue), 3)
+        self.assertEqual(queue.flush(self.surface), 3)
+        self.assertEqual(self.surface.get_at((7, 7))[:3], WHITE)  # enemies are drawn over the ship
+        self.assertEqual(self.surface.get_at((2, 2))[:3], (255, 0, 0))
+        self.assertEqual(self.surface.get_at((25, 25))[:3], (255, 0, 0))
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(queue.flush(self.surface), 0)
+
+    def test_dirty_rects(self):
+        queue = RenderQueue()
+        queue.submit(SHIP, self.red, (95, 0))
+        queue.submit(ENEMIES, self.white, (50, 50))
+        dirty = []
+        queue.flush(self.surface, dirty)
+        self.assertEqual(dirty, [pygame.Rect(95, 0, 5, 10), pygame.Rect(50, 50, 10, 10)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+__author__ = 'erC'
+
+import os
+import tempfile
+import unittest
+import headless
+import replay
+from inputs import ScriptedInput, RandomWalkPilot
+from variables import pygame
+
+
+class TestReplayFormat(unittest.TestCase):
+
+    def test_round_trip(self):
+        events = [(0, 5), (0, 13), (0, 1), (200, 9), (70000, 7)]
+        original = replay.Replay(-123456789, 70000, events, '0123456789abcdef0123456789abcdef01234567', True, True)
+        data = original.to_bytes()
+        self.assertEqual(data[:4], replay.MAGIC)
+        self.assertEqual(len(data), 34 + 13)  # header with a 20 byte hash, then 4 bit events and varint frame deltas
+        loaded = replay.Replay.from_bytes(data)
+        self.assertEqual((loaded.seed, loaded.frames, loaded.events, loaded.state, loaded.destroyed,
+                          loaded.pixel_masks),
+                         (original.seed, original.frames, original.events, original.state, original.destroyed, True))
+
+    def test_bad_magic(self):
+        self.assertRaises(ValueError, replay.Replay.from_bytes, b'PNG\x00\x01' + bytes(30))
+
+    def test_events(self):
+        for code in range(15):  # 15 would be a quit event's release
+            self.assertEqual(replay.encode_event(ScriptedInput([(0, replay.decode_event(code))]).get(0)[0]), code)
+        self.assertIsNone(replay.encode_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3)))
+
+    def test_recorder(self):
+        source = ScriptedInput({3: [(pygame.KEYDOWN, pygame.K_F3), (pygame.KEYDOWN, pygame.K_d)],
+                                9: [(pygame.KEYUP, pygame.K_LEFT)]})
+        recorder = replay.ReplayRecorder(source)
+        for frame in range(12):
+            self.assertEqual(recorder.get(frame), source.get(frame))
+        self.assertEqual(recorder.events, [(3, 4), (9, 8)])
+
+
+class TestPlayback(unittest.TestCase):
+
+    script = {40: [(pygame.KEYDOWN, pygame.K_d), (pygame.KEYDOWN, pygame.K_LEFT)],
+              90: [(pygame.KEYDOWN, pygame.K_d), (pygame.KEYUP, pygame.K_LEFT), (pygame.KEYDOWN, pygame.K_UP)],
+              150: [(pygame.KEYDOWN, pygame.K_w), (pygame.KEYUP, pygame.K_UP)],
+              260: [(pygame.KEYDOWN, pygame.K_a), (pygame.KEYDOWN, pygame.K_RIGHT)],
+              330: [(pygame.KEYUP, pygame.K_RIGHT), (pygame.KEYDOWN, pygame.K_DOWN), (pygame.KEYDOWN, pygame.K_w)],
+              400: [(pygame.KEYUP, pygame.K_DOWN)],
+              700: [(pygame.QUIT, None)]}
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.ssrp')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_record_and_verify(self):
+        recorded = headless.run(800, ScriptedInput(self.script), render=False, seed=8, record=self.path)
+        self.assertEqual(recorded['frames'], 700)
+        saved = replay.Replay.load(self.path)
+        self.assertEqual(len(saved), sum(len(events) for events in self.script.values()))
+        report = replay.play(self.path)
+        self.assertTrue(report['verified'])
+        self.assertEqual(report['state'], recorded['state'])
+
+    def test_record_with_pixel_masks(self):
+        recorded = headless.run(800, RandomWalkPilot(51), render=False, seed=51, record=self.path, pixel_masks=True)
+        saved = replay.Replay.load(self.path)
+        self.assertTrue(saved.pixel_masks)
+        report = replay.play(saved)
+        self.assertTrue(report['verified'])
+        self.assertEqual(report['frames'], recorded['frames'])
+        saved.pixel_masks = False  # the rectangle tests end this game on a different frame
+        self.assertFalse(replay.play(saved)['verified'])
+
+    def test_mismatch(self):
+        headless.run(800, ScriptedInput(self.script), render=False, seed=8, record=self.path)
+        saved = replay.Replay.load(self.path)
+        saved.events = [event for event in saved.events if event[1] != 6]  # drop the overdrive presses
+        self.assertFalse(replay.play(saved)['verified'])
+        saved = replay.Replay.load(self.path)
+        saved.seed += 1
+        self.assertFalse(replay.play(saved)['verified'])
+
+
+if __name__ == '__main__':
+    unittest.main()
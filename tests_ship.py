@@ -28,19 +28,19 @@ class TestShip(unittest.TestCase):
         self.assertAlmostEqual(self.ship.position[0], 352.3, places=1)
 
     def test_check_boundary_method(self):
-        self.ship.position = [-5, 100]
+        self.ship.position.update(-5, 100)
         result = self.ship.check_boundary(-5, 0)
         self.assertFalse(result)
-        self.ship.position = [1000, 100]
+        self.ship.position.update(1000, 100)
         result = self.ship.check_boundary(5, 0)
         self.assertFalse(result)
-        self.ship.position = [100, 100]
+        self.ship.position.update(100, 100)
         result = self.ship.check_boundary(3, 3)
         self.assertTrue(result)
-        self.ship.position = [100, -5]
+        self.ship.position.update(100, -5)
         result = self.ship.check_boundary(0, -5)
         self.assertFalse(result)
-        self.ship.position = [100, 1000]
+        self.ship.position.update(100, 1000)
         result = self.ship.check_boundary(0, 5)
         self.assertFalse(result)
 
@@ -89,6 +89,16 @@ class TestShip(unittest.TestCase):
         self.ship.shield_level = 5
         self.ship.draw_shield()
 
+    def test_shield_levels_are_prebaked(self):
+        self.assertEqual(len(Ship.shield_levels), 6)
+        self.ship.shield_level = 3
+        self.ship.draw_shield()
+        surface = self.ship.surface
+        self.ship.increase_shields()
+        self.ship.decrease_shields()
+        self.assertIs(self.ship.surface, surface)  # no new surface is drawn on a shield change
+        self.assertIs(Ship().shield_levels, Ship.shield_levels)
+
     def test_take_damage_method(self):
         self.ship.shield_level = 5
         result = self.ship.take_damage(2)
@@ -0,0 +1,57 @@
+__author__ = 'erC'
+
+import unittest
+import rng
+from simulation import Simulation
+from variables import pygame
+
+
+def run_snapshots(seed, frames=400):
+    simulation = Simulation(seed)
+    snapshots = []
+    for frame in range(frames):
+        if frame == 50:
+            simulation.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LEFT))
+        simulation.step()
+        snapshots.append(simulation.snapshot())
+    return snapshots
+
+
+class TestRng(unittest.TestCase):
+
+    def test_seed(self):
+        self.assertEqual(rng.seed(3), 3)
+        first = [rng.attack.random(), rng.spawn.random()]
+        rng.seed(3)
+        rng.spawn.random()  # streams are independent of the order they are drawn from
+        self.assertEqual(rng.attack.random(), first[0])
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_same_seed_same_states(self):
+        self.assertEqual(run_snapshots(11), run_snapshots(11))
+
+    def test_different_seed(self):
+        self.assertNotEqual(run_snapshots(11, 50), run_snapshots(12, 50))
+
+    def test_step(self):
+        simulation = Simulation(5)
+        self.assertEqual(simulation.frame, 1)
+        simulation.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT))
+        simulation.step()
+        self.assertEqual(simulation.frame, 2)
+        self.assertEqual(simulation.ship.position, [349, 400])
+        self.assertAlmostEqual(simulation.time, 1 / 60)
+        simulation.handle_event(pygame.event.Event(pygame.KEYUP, key=pygame.K_RIGHT))
+        self.assertEqual(simulation.x_speed, 0)
+
+    def test_quit(self):
+        simulation = Simulation(5)
+        simulation.handle_event(pygame.event.Event(pygame.QUIT))
+        self.assertTrue(simulation.done)
+        self.assertFalse(simulation.destroyed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+__author__ = 'erC'
+
+import unittest
+import rng
+from definitions import StageSpec, Wave
+from enemies import enemies
+from stages import StageScheduler
+
+
+class TestStageScheduler(unittest.TestCase):
+
+    def setUp(self):
+        rng.seed(3)
+        enemies.empty()
+
+    def tearDown(self):
+        enemies.empty()
+
+    def test_waves(self):
+        stage = StageSpec('test', None, 30, 100, (Wave('basic', 10, None, 3, 5, 50, False),
+                                                   Wave('fighter', 20, None, 1, 0, None, False)))
+        scheduler = StageScheduler(stage)
+        self.assertEqual(scheduler.timeline(0, 70), [(10, 'basic'), (15, 'basic'), (20, 'basic'), (20, 'fighter'),
+                                                     (60, 'basic'), (65, 'basic')])
+        self.assertEqual(scheduler.update(9), 0)
+        self.assertEqual(scheduler.update(10), 1)
+        self.assertEqual(scheduler.update(20), 3)  # the basic enemy due on frame 15 is spawned late, not dropped
+        self.assertEqual([enemy.kind for enemy in enemies], ['basic', 'basic', 'basic', 'fighter'])
+
+    def test_cap(self):
+        stage = StageSpec('test', 2, 30, 100, (Wave('basic', 1, 2, 5, 0, None, False),))
+        scheduler = StageScheduler(stage)
+        self.assertEqual(scheduler.update(1), 2)
+        self.assertEqual(scheduler.deferred, 3)
+        self.assertEqual(scheduler.timeline(0, 100), [(31, 'basic')] * 3)
+        enemies.empty()
+        self.assertEqual(scheduler.update(31), 2)
+        self.assertEqual(len(scheduler), 1)
+
+    def test_random_waves_are_seeded(self):
+        first = StageScheduler().timeline(0, 3000)
+        rng.seed(3)
+        self.assertEqual(StageScheduler().timeline(0, 3000), first)
+        self.assertTrue(all(frame >= 26 for frame, kind in first))
+        self.assertGreater(len(first), 30)  # about 2 spawns every 100 frames
+        self.assertLess(len(first), 90)
+
+
+if __name__ == '__main__':
+    unittest.main()
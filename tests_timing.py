@@ -0,0 +1,56 @@
+__author__ = 'erC'
+
+import unittest
+from timing import FixedTimestep
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFixedTimestep(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.timestep = FixedTimestep(timestep=0.25, max_steps=4, clock=self.clock)
+
+    def test_first_frame_steps_once(self):
+        self.assertEqual(self.timestep.advance(), 1)
+        self.assertEqual(self.timestep.alpha, 0)
+
+    def test_fast_rendering_interpolates(self):
+        self.timestep.advance()
+        steps = []
+        for frame in range(8):
+            self.clock.now += 0.125  # two frames per step
+            steps.append(self.timestep.advance())
+            self.assertEqual(self.timestep.alpha, 0.5 if frame % 2 == 0 else 0)
+        self.assertEqual(steps, [0, 1] * 4)
+        self.assertEqual(self.timestep.skipped, 0)
+
+    def test_slow_rendering_skips_frames(self):
+        self.timestep.advance()
+        self.clock.now += 0.625
+        self.assertEqual(self.timestep.advance(), 2)
+        self.assertEqual(self.timestep.alpha, 0.5)
+        self.assertEqual(self.timestep.skipped, 1)
+        self.assertEqual(self.timestep.steps, 3)
+
+    def test_falling_behind_drops_time(self):
+        self.timestep.advance()
+        self.clock.now += 10.125
+        self.assertEqual(self.timestep.advance(), 4)
+        self.assertEqual(self.timestep.dropped, 9.0)
+        self.assertEqual(self.timestep.alpha, 0.5)
+        self.timestep.reset()
+        self.clock.now += 60
+        self.assertEqual(self.timestep.advance(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
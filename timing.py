@@ -0,0 +1,83 @@
+"""
+Classes exported:
+1. FixedTimestep: Accumulator deciding how many fixed simulation steps run before each rendered frame, and how far
+    the frame is drawn between the last two steps.
+"""
+
+import time
+
+TIMESTEP = 1 / 60  # seconds of game time advanced by one simulation step
+
+
+class FixedTimestep(object):
+    """
+    Fixed-rate simulation clock for a game loop that renders at its own rate.
+
+    Every rendered frame, advance adds the wall-clock time since the previous frame to an accumulator and
+    returns the number of whole timesteps in it, which the loop then steps the simulation by. Game time thus
+    follows wall-clock time at 60 steps per second whatever the render rate: when drawing is slow, several steps
+    run before a frame is drawn and the frames in between are skipped; when drawing is fast, some frames run no
+    step at all. The time left in the accumulator is kept as alpha, the fraction of a timestep that the frame is
+    drawn past the last step, so the renderer draws moving things between their previous and current position.
+
+    When the simulation itself cannot keep up, at most max_steps steps run per frame and the rest of the time
+    is dropped, so the game slows down instead of falling further and further behind.
+
+    Methods defined:
+    """
+
+    def __init__(self, timestep=TIMESTEP, max_steps=5, clock=time.perf_counter):
+        """
+        Attributes defined here:
+        accumulator: Wall-clock seconds not yet simulated, less than one timestep after advance
+        last: Clock reading of the previous frame, None before the first
+        steps, frames: Number of simulation steps run and frames rendered
+        skipped: Number of steps that were not followed by a frame of their own
+        dropped: Wall-clock seconds thrown away because a frame would have needed more than max_steps steps
+
+        :param float timestep: Seconds of game time advanced by one simulation step
+        :param int max_steps: Most simulation steps run for one frame
+        :param clock: Function returning the current time in seconds, for tests
+        """
+        self.timestep = timestep
+        self.max_steps = max_steps
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last = None
+        self.steps = self.frames = self.skipped = 0
+        self.dropped = 0.0
+
+    @property
+    def alpha(self):
+        """Fraction of a timestep between the last simulation step and the frame being drawn, from 0 up to 1."""
+        return min(self.accumulator / self.timestep, 1.0)
+
+    def advance(self):
+        """
+        Start a frame: add the time since the previous frame and take as many whole timesteps out as fit.
+
+        The first frame runs one step, so there is a state to draw.
+        :return: Number of simulation steps to run before drawing this frame
+        """
+        now = self.clock()
+        if self.last is None:
+            self.last = now - self.timestep
+        self.accumulator += now - self.last
+        self.last = now
+        steps = int(self.accumulator // self.timestep)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.timestep
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.timestep
+        else:
+            self.accumulator -= steps * self.timestep
+        self.steps += steps
+        self.frames += 1
+        if steps > 1:
+            self.skipped += steps - 1
+        return steps
+
+    def reset(self):
+        """Forget the time of the previous frame, e.g. after a pause, so it is not caught up with."""
+        self.last = None
+        self.accumulator = 0.0
@@ -1,7 +1,11 @@
 
 
+import os
 import pygame
 
+if os.environ.get('STARSECTOR_HEADLESS'):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # must be chosen before the display is opened
+
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
@@ -13,4 +17,25 @@ PURPLE = (255, 0, 255)
 
 color_list = [RED, WHITE, YELLOW, TEAL, PURPLE, GREEN, BLUE]
 size = (800, 600)
-screen = pygame.display.set_mode(size)
+screen = None  # the display surface, None until init_display opens it
+
+
+def init_display():
+    """
+    Open the game window, or an offscreen surface under the dummy video driver. Does nothing if it is open.
+
+    Nothing is opened at import time, so modules can be imported (e.g. by tests) without creating a window.
+    Modules that star-import this one hold the screen of import time, so they call get_screen instead.
+
+    :return: The display surface
+    """
+    global screen
+    if screen is None:
+        pygame.display.init()
+        screen = pygame.display.set_mode(size)
+    return screen
+
+
+def get_screen():
+    """:return: The display surface, opened first if needed. Default target of the draw methods"""
+    return screen if screen is not None else init_display()